@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 
 from app.core.auth import get_current_user
-from app.services.artifact_service import ArtifactService
+from app.services.artifact_service import get_artifact_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -47,7 +47,7 @@ async def generate_artifact(
     """
     logger.info(f"📄 Génération artefact: type={request.artifact_type}, topic={request.topic}")
     
-    artifact_service = ArtifactService()
+    artifact_service = get_artifact_service()
     
     artifact_id = "artifact_123"
     
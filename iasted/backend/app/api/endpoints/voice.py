@@ -6,33 +6,78 @@ Pipeline complet : Audio → STT → LLM → TTS → Audio
 import logging
 import uuid
 import json
-from typing import Dict, Any
+from contextlib import aclosing
+from functools import partial
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
 from fastapi.responses import JSONResponse
 import asyncio
 
-from app.services.stt_service import STTService
-from app.services.tts_service import TTSService
-from app.services.llm_router import LLMRouter
+from app.config import settings
+from app.services.stt_service import STTService, STTSession, get_stt_service
+from app.services.tts_service import TTSService, get_tts_service
+from app.services.llm_router import LLMRouter, get_llm_router
+from app.services.semantic_cache import SemanticCache, get_semantic_cache
+from app.services.tts_pipeline import TTSPipeline
+from app.services.audio_frames import (
+    AUDIO_FORMATS,
+    AudioFormat,
+    AudioFrameWriter,
+    negotiate_audio_format
+)
+from app.services.vad import VoiceActivityDetector, parse_sample_rate
+from app.services.interim_transcripts import InterimTranscriptThrottle
 from app.core.redis_client import get_redis_client
 from app.core.auth import get_current_user_ws
+from app.core.metrics import voice_barge_in_total, websocket_connections
+from app.core.ws_sender import SessionSender
+from app.core.ws_protocol import FRAME_AUDIO, FRAME_EVENT, negotiate_protocol, unpack_frame
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Références des tâches d'arrière-plan (évite leur collecte avant la fin)
+_background_tasks: set = set()
+
+
+def _run_in_background(coro):
+    """Lance une coroutine hors du chemin critique de la réponse"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 
 class ConnectionManager:
-    """Gestionnaire de connexions WebSocket"""
+    """
+    Gestionnaire de connexions WebSocket
+    
+    Les envois passent par la file bornée de chaque session (SessionSender) :
+    send_json/send_bytes attendent qu'il y ait de la place, pas que le
+    client ait reçu le message.
+    """
     
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
+        self.senders: Dict[str, SessionSender] = {}
         self.user_sessions: Dict[str, set] = {}
     
-    async def connect(self, websocket: WebSocket, session_id: str, user_id: str):
+    async def connect(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        user_id: str,
+        protocol: str = "json"
+    ):
         """Accepte une nouvelle connexion WebSocket"""
         await websocket.accept()
         self.active_connections[session_id] = websocket
         
+        sender = SessionSender(websocket, session_id, protocol=protocol)
+        sender.start()
+        self.senders[session_id] = sender
+        websocket_connections.inc()
+        
         if user_id not in self.user_sessions:
             self.user_sessions[user_id] = set()
         self.user_sessions[user_id].add(session_id)
@@ -43,6 +88,11 @@ class ConnectionManager:
         """Déconnecte une session WebSocket"""
         if session_id in self.active_connections:
             del self.active_connections[session_id]
+            websocket_connections.dec()
+        
+        sender = self.senders.pop(session_id, None)
+        if sender is not None:
+            sender.close()
         
         if user_id in self.user_sessions:
             self.user_sessions[user_id].discard(session_id)
@@ -51,20 +101,259 @@ class ConnectionManager:
         
         logger.info(f"🔌 WebSocket déconnecté: session={session_id}")
     
-    async def send_json(self, session_id: str, data: dict):
-        """Envoie des données JSON"""
-        if session_id in self.active_connections:
-            await self.active_connections[session_id].send_json(data)
+    async def send_json(self, session_id: str, data: dict, interim: bool = False):
+        """
+        Envoie des données JSON
+        
+        Args:
+            session_id: ID de session
+            data: Message
+            interim: Transcription intermédiaire (fusionnable ou supprimable, cf. ws_interim_policy)
+        """
+        sender = self.senders.get(session_id)
+        if sender is not None:
+            await sender.send_json(data, interim=interim)
     
     async def send_bytes(self, session_id: str, data: bytes):
         """Envoie des données binaires"""
-        if session_id in self.active_connections:
-            await self.active_connections[session_id].send_bytes(data)
+        sender = self.senders.get(session_id)
+        if sender is not None:
+            await sender.send_bytes(data)
+    
+    def discard_audio(self, session_id: str):
+        """Retire l'audio encore en file d'une réponse interrompue"""
+        sender = self.senders.get(session_id)
+        if sender is not None:
+            sender.discard_audio()
 
 
 manager = ConnectionManager()
 
 
+class VoiceSession:
+    """
+    Entrée audio d'une conversation : VAD → STT persistant → tours de parole
+    
+    Une seule connexion Deepgram par WebSocket, alimentée par la boucle de
+    réception. Si le client envoie du PCM 16 bits, le VAD serveur filtre le
+    silence et signale la fin d'utterance ; sinon l'audio passe tel quel et
+    la fin de tour vient de Deepgram ou du message end_utterance du client.
+    
+    Chaque tour (cache | LLM → TTS) tourne dans sa propre tâche : la
+    réception et le relais des transcriptions continuent pendant ce temps.
+    Barge-in : dès que l'utilisateur reparle (transcription non vide), le
+    tour en cours est annulé, ce qui ferme le stream LLM et annule les
+    synthèses en attente, et le client reçoit un message "interrupted".
+    """
+    
+    def __init__(
+        self,
+        session_id: str,
+        context: Dict[str, Any],
+        stt_service: STTService,
+        llm_router: LLMRouter,
+        tts_service: TTSService,
+        redis: Any,
+        semantic_cache: Optional[SemanticCache],
+        audio_format: AudioFormat,
+        interim_mode: Optional[str] = None
+    ):
+        self.session_id = session_id
+        self.context = context
+        self.stt_service = stt_service
+        self.llm_router = llm_router
+        self.tts_service = tts_service
+        self.redis = redis
+        self.semantic_cache = semantic_cache
+        self.audio_format = audio_format
+        
+        self.stt: Optional[STTSession] = None
+        self.vad: Optional[VoiceActivityDetector] = None
+        self.input_format: Optional[str] = None
+        self.input_sample_rate: Optional[int] = None
+        self._transcripts_task: Optional[asyncio.Task] = None
+        self._turn: Optional[asyncio.Task] = None
+        self.interims = InterimTranscriptThrottle(self._send_interim, mode=interim_mode)
+    
+    async def open_stt(self, input_format: Optional[str] = None, sample_rate: Optional[int] = None):
+        """
+        (Ré)ouvre la connexion STT pour le format d'entrée déclaré
+        
+        Args:
+            input_format: pcm16 (PCM 16 bits mono, VAD actif) ou None (conteneur
+                détecté par Deepgram)
+            sample_rate: Fréquence du PCM (défaut: settings.stt_input_sample_rate)
+        
+        Raises:
+            ValueError: Fréquence invalide (la connexion courante reste ouverte)
+        """
+        pcm = input_format == "pcm16"
+        sample_rate = parse_sample_rate(sample_rate) if pcm else None
+        
+        if self.stt is not None:
+            await self.stt.close()
+        self.interims.reset()
+        
+        self.input_format = "pcm16" if pcm else None
+        self.input_sample_rate = sample_rate
+        
+        self.stt = await self.stt_service.open_session(
+            encoding="linear16" if pcm else None,
+            sample_rate=self.input_sample_rate
+        )
+        self.vad = (
+            VoiceActivityDetector(self.input_sample_rate)
+            if pcm and settings.vad_enabled else None
+        )
+        self._transcripts_task = asyncio.create_task(self._consume_transcripts(self.stt))
+    
+    def describe_input(self) -> dict:
+        """Format d'entrée retenu, renvoyé au client"""
+        return {
+            "format": self.input_format or "auto",
+            "sample_rate": self.input_sample_rate,
+            "vad": self.vad is not None
+        }
+    
+    def on_audio(self, chunk: bytes):
+        """Chunk audio reçu du client : filtré par le VAD puis mis en file STT"""
+        if self.vad is None:
+            self.stt.send(chunk)
+            return
+        
+        result = self.vad.feed(chunk)
+        
+        if result.speech_started:
+            logger.debug(f"🗣️ Début de parole (VAD): {self.session_id}")
+        
+        self.stt.send(result.audio)
+        
+        if result.utterance_ended:
+            logger.debug(f"🗣️ Fin d'utterance (VAD): {self.session_id}")
+            self.stt.finalize()
+    
+    async def restart_stt(self):
+        """Le client a relancé son enregistreur : nouveau flux, nouvelle connexion STT"""
+        logger.info(f"🔄 Flux audio relancé par le client: {self.session_id}")
+        await self.open_stt(self.input_format, self.input_sample_rate)
+    
+    def end_utterance(self):
+        """Fin d'utterance signalée par le client"""
+        logger.debug(f"🗣️ Fin d'utterance détectée: {self.session_id}")
+        
+        if self.vad is not None:
+            self.vad.reset()
+        self.stt.finalize()
+    
+    async def _consume_transcripts(self, stt: STTSession):
+        """
+        Relaie les transcriptions et déclenche un tour à chaque fin d'utterance
+        
+        Les segments finaux sont accumulés jusqu'à speech_final (endpointing
+        Deepgram, VAD ou end_utterance) ou UtteranceEnd.
+        """
+        parts, confidences = [], []
+        
+        try:
+            async for result in stt.transcripts():
+                if result["event"] == "stream_lost":
+                    # Flux conteneur coupé : le client relance son enregistreur
+                    # puis renvoie stt_restart (cf. restart_stt)
+                    await manager.send_json(self.session_id, {"type": "stt_restart"})
+                    continue
+                
+                if result["event"] == "transcript":
+                    if result["transcript"]:
+                        await self.barge_in()
+                    
+                    if not result["is_final"]:
+                        await self.interims.push(result["transcript"], result["confidence"])
+                        continue
+                    
+                    self.interims.reset()
+                    
+                    if result["transcript"]:
+                        parts.append(result["transcript"])
+                        confidences.append(result["confidence"])
+                        
+                        logger.info(
+                            f"🎤 Transcription finale: {result['transcript']} "
+                            f"(conf={result['confidence']:.2f})"
+                        )
+                        
+                        await manager.send_json(self.session_id, {
+                            "type": "transcript",
+                            "transcript": result["transcript"],
+                            "is_final": True,
+                            "confidence": result["confidence"]
+                        })
+                    
+                    if not result["speech_final"]:
+                        continue
+                
+                if not parts:
+                    continue
+                
+                transcript = " ".join(parts)
+                parts, confidences = [], []
+                
+                # Un seul tour à la fois par session
+                await self._cancel_turn()
+                self._turn = asyncio.create_task(handle_transcript(
+                    transcript,
+                    self.session_id,
+                    self.context,
+                    self.llm_router,
+                    self.tts_service,
+                    self.redis,
+                    self.semantic_cache,
+                    self.audio_format
+                ))
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur relais transcriptions: {e}", exc_info=True)
+    
+    async def _send_interim(self, message: dict):
+        """Envoie une transcription intermédiaire (déjà limitée en débit)"""
+        # Les diffs s'appliquent à la suite : ni fusion ni suppression dans la file d'envoi
+        await manager.send_json(self.session_id, message, interim=not self.interims.diff)
+    
+    async def _cancel_turn(self) -> bool:
+        """Annule le tour en cours ; True s'il était encore actif"""
+        turn, self._turn = self._turn, None
+        if turn is None or turn.done():
+            return False
+        
+        turn.cancel()
+        await asyncio.gather(turn, return_exceptions=True)
+        return True
+    
+    async def barge_in(self):
+        """L'utilisateur reparle : interrompt la réponse en cours et prévient le client"""
+        if not await self._cancel_turn():
+            return
+        
+        voice_barge_in_total.inc()
+        logger.info(f"✋ Barge-in: réponse interrompue ({self.session_id})")
+        
+        # L'audio déjà en file ne sera plus joué : inutile de l'envoyer
+        manager.discard_audio(self.session_id)
+        await manager.send_json(self.session_id, {"type": "interrupted"})
+    
+    async def close(self):
+        """Ferme la connexion STT et interrompt le tour en cours"""
+        self.interims.reset()
+        
+        if self.stt is not None:
+            await self.stt.close()
+        
+        if self._transcripts_task is not None:
+            self._transcripts_task.cancel()
+            await asyncio.gather(self._transcripts_task, return_exceptions=True)
+        
+        await self._cancel_turn()
+
+
 @router.websocket("/ws/{session_id}")
 async def voice_websocket_endpoint(
     websocket: WebSocket,
@@ -79,6 +368,30 @@ async def voice_websocket_endpoint(
     3. LLM génère réponse
     4. TTS synthétise en audio
     5. Audio renvoyé au client
+    
+    Une connexion STT persistante par WebSocket. Le client peut déclarer du
+    PCM 16 bits (?input_format=pcm16&input_sample_rate=16000, fréquences
+    8000/16000/32000/48000) : le silence est alors filtré par un VAD serveur
+    qui détecte aussi la fin d'utterance.
+    
+    Format audio de sortie négocié à la connexion (?audio_format=mp3|pcm16|opus)
+    ou par un message {"type": "config", "audio_format": ...}. En pcm16/opus
+    l'audio arrive en trames binaires préfixées d'un en-tête de 8 octets :
+    séquence (uint32), segment (uint16), drapeaux (uint8, 1 = fin de segment).
+    
+    Audio conteneur (webm, ogg) : si la connexion Deepgram tombe en cours de
+    flux, le serveur envoie {"type": "stt_restart"} et ignore l'audio reçu ;
+    le client relance son enregistreur (nouvel en-tête) et répond
+    {"type": "stt_restart"} avant le premier chunk du nouveau flux.
+    
+    Transcriptions intermédiaires limitées à une par voice_interim_interval_ms ;
+    ?interim=diff (ou {"type": "config", "interim": "diff"}) les envoie sous
+    forme {"offset": n, "text": ...} au lieu du texte complet.
+    
+    ?protocol=msgpack : tous les messages, dans les deux sens, sont des trames
+    binaires MessagePack [séquence, type, corps] (type 0 = événement, corps
+    identique au JSON ; type 1 = audio). Le message "connected" indique le
+    protocole retenu (json si msgpack n'est pas disponible).
     """
     user = await get_current_user_ws(websocket)
     
@@ -86,12 +399,20 @@ async def voice_websocket_endpoint(
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
     
-    await manager.connect(websocket, session_id, user["id"])
+    protocol = negotiate_protocol(websocket.query_params.get("protocol"))
+    await manager.connect(websocket, session_id, user["id"], protocol)
     
-    stt_service = STTService()
-    tts_service = TTSService()
-    llm_router = LLMRouter()
-    redis = get_redis_client()
+    # Instances du processus (créées au démarrage) : aucun client construit par connexion
+    stt_service = get_stt_service()
+    tts_service = get_tts_service()
+    llm_router = get_llm_router()
+    semantic_cache = get_semantic_cache()
+    redis = await get_redis_client()
+    audio_format = negotiate_audio_format(
+        websocket.query_params.get("audio_format"),
+        tts_service.supported_formats
+    )
+    voice = None
     
     try:
         context_key = f"session:{session_id}"
@@ -103,39 +424,110 @@ async def voice_websocket_endpoint(
             context = {
                 "user_id": user["id"],
                 "user_role": user.get("role", "user"),
+                "organization": user.get("organization"),
                 "session_id": session_id,
                 "last_turns": [],
                 "created_at": str(uuid.uuid4())
             }
         
+        voice = VoiceSession(
+            session_id,
+            context,
+            stt_service,
+            llm_router,
+            tts_service,
+            redis,
+            semantic_cache,
+            audio_format,
+            websocket.query_params.get("interim")
+        )
+        try:
+            await voice.open_stt(
+                websocket.query_params.get("input_format"),
+                websocket.query_params.get("input_sample_rate")
+            )
+        except ValueError as e:
+            # Entrée mal déclarée : signalée au client, la session démarre en détection auto
+            await _reject_message(session_id, e)
+            await voice.open_stt()
+        
         await manager.send_json(session_id, {
             "type": "connected",
             "session_id": session_id,
-            "message": "Connexion établie. Commencez à parler."
+            "message": "Connexion établie. Commencez à parler.",
+            "protocol": protocol,
+            "audio_format": audio_format.describe(),
+            "input": voice.describe_input(),
+            "interim": voice.interims.describe()
         })
         
         while True:
             data = await websocket.receive()
             
+            if data["type"] == "websocket.disconnect":
+                break
+            
             if "bytes" in data:
-                await handle_audio_chunk(
-                    data["bytes"],
-                    session_id,
-                    context,
-                    stt_service,
-                    llm_router,
-                    tts_service,
-                    redis
-                )
+                if protocol != "msgpack":
+                    voice.on_audio(data["bytes"])
+                    continue
+                
+                try:
+                    _, kind, body = unpack_frame(data["bytes"])
+                except ValueError as e:
+                    await _reject_message(session_id, e)
+                    continue
+                
+                if kind == FRAME_AUDIO:
+                    voice.on_audio(body)
+                    continue
+                if kind != FRAME_EVENT:
+                    continue
+                message = body
             
             elif "text" in data:
-                message = json.loads(data["text"])
-                
-                if message.get("type") == "ping":
-                    await manager.send_json(session_id, {"type": "pong"})
+                try:
+                    message = json.loads(data["text"])
+                    if not isinstance(message, dict):
+                        raise ValueError("objet JSON attendu")
+                except ValueError as e:
+                    await _reject_message(session_id, e)
+                    continue
+            
+            else:
+                continue
+            
+            if message.get("type") == "ping":
+                await manager.send_json(session_id, {"type": "pong"})
+            
+            elif message.get("type") == "config":
+                try:
+                    _validate_config(message)
+                except ValueError as e:
+                    await _reject_message(session_id, e)
+                    continue
                 
-                elif message.get("type") == "end_utterance":
-                    logger.debug(f"🗣️ Fin d'utterance détectée: {session_id}")
+                if "audio_format" in message:
+                    voice.audio_format = negotiate_audio_format(
+                        message["audio_format"],
+                        tts_service.supported_formats
+                    )
+                if "input_format" in message:
+                    await voice.open_stt(message["input_format"], message.get("input_sample_rate"))
+                if "interim" in message:
+                    voice.interims.set_mode(message["interim"])
+                await manager.send_json(session_id, {
+                    "type": "config",
+                    "audio_format": voice.audio_format.describe(),
+                    "input": voice.describe_input(),
+                    "interim": voice.interims.describe()
+                })
+            
+            elif message.get("type") == "end_utterance":
+                voice.end_utterance()
+            
+            elif message.get("type") == "stt_restart":
+                await voice.restart_stt()
             
     except WebSocketDisconnect:
         logger.info(f"Client déconnecté: {session_id}")
@@ -146,94 +538,205 @@ async def voice_websocket_endpoint(
             "error": "Une erreur est survenue"
         })
     finally:
+        if voice is not None:
+            await voice.close()
         manager.disconnect(session_id, user["id"])
 
 
-async def handle_audio_chunk(
-    audio_data: bytes,
+def _validate_config(message: Dict[str, Any]):
+    """
+    Vérifie un message config avant d'en appliquer le moindre champ
+    
+    Args:
+        message: Message {"type": "config", ...} du client
+    
+    Raises:
+        ValueError: Champ d'un type inattendu ou fréquence non supportée
+    """
+    for field in ("audio_format", "input_format", "interim"):
+        value = message.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"config.{field}: chaîne attendue, reçu {type(value).__name__}")
+    
+    if message.get("input_format") == "pcm16":
+        parse_sample_rate(message.get("input_sample_rate"))
+
+
+async def _reject_message(session_id: str, error: Exception):
+    """Signale au client un message illisible ou invalide sans fermer la session"""
+    logger.warning(f"⚠️ Message client invalide ignoré ({session_id}): {error}")
+    await manager.send_json(session_id, {
+        "type": "error",
+        "error": "Message invalide"
+    })
+
+
+async def handle_transcript(
+    transcript: str,
     session_id: str,
     context: Dict[str, Any],
-    stt_service: STTService,
     llm_router: LLMRouter,
     tts_service: TTSService,
-    redis: Any
+    redis: Any,
+    semantic_cache: Optional[SemanticCache] = None,
+    audio_format: Optional[AudioFormat] = None
 ):
     """
-    Traite un chunk audio : STT → LLM → TTS
+    Traite un tour de parole : transcription finale → (cache | LLM → TTS)
+    
+    Une question déjà posée dans la même partition (rôle, organisation) est
+    servie depuis le cache sémantique, avec son audio pré-synthétisé : ni LLM
+    ni TTS. Sinon la réponse est streamée par le LLM et synthétisée phrase
+    par phrase (le premier audio part avant la fin de la génération), puis
+    cachée en arrière-plan si elle est complète. Dès que la session a un
+    historique, le cache n'est plus consulté ni alimenté : la réponse peut
+    dépendre des tours précédents.
+    
+    En format tramé (pcm16, opus), chaque segment part en trames numérotées
+    et la réponse se termine par un message audio_end.
     
     Args:
-        audio_data: Données audio brutes
+        transcript: Transcription finale de l'utterance
         session_id: ID de session
         context: Contexte de conversation
-        stt_service: Service STT
         llm_router: Router LLM
         tts_service: Service TTS
         redis: Client Redis
+        semantic_cache: Cache sémantique (None = désactivé)
+        audio_format: Format audio de sortie (défaut: mp3, un fichier par segment)
     """
+    audio_format = audio_format or AUDIO_FORMATS["mp3"]
+    frames = AudioFrameWriter(audio_format, partial(manager.send_bytes, session_id))
+    
+    async def send_audio(index: int, audio: bytes):
+        if audio_format.framed:
+            await frames.write_segment(index, audio)
+        else:
+            await manager.send_bytes(session_id, audio)
+    
     try:
-        async def audio_stream():
-            yield audio_data
+        # Seuls les champs de partition sont stockés avec l'entrée (pas l'historique)
+        cache_context = {
+            key: context.get(key)
+            for key in ("user_id", "user_role", "organization")
+        }
         
-        transcript = ""
+        # Avec un historique, la question peut dépendre des tours précédents
+        # ("et le mois dernier ?") : ni lecture ni écriture dans le cache partagé
+        had_history = bool(context.get("last_turns"))
         
-        async for result in stt_service.transcribe_stream(audio_stream()):
-            if result["is_final"]:
-                transcript = result["transcript"]
-                confidence = result["confidence"]
-                
-                logger.info(f"🎤 Transcription finale: {transcript} (conf={confidence:.2f})")
-                
-                await manager.send_json(session_id, {
-                    "type": "transcript",
-                    "transcript": transcript,
-                    "is_final": True,
-                    "confidence": confidence
-                })
-                
-                response, provider, metadata = await llm_router.route_and_generate(
-                    transcript,
-                    context
+        cached = None
+        if semantic_cache is not None and not had_history:
+            cached = await semantic_cache.lookup(
+                transcript,
+                cache_context,
+                with_audio=True,
+                audio_format=audio_format.name
+            )
+        
+        if cached is not None:
+            response = cached.response
+            provider_name = "cache"
+            
+            logger.info(f"♻️ Réponse cachée ({cached.tier}, score={cached.score:.3f})")
+            
+            await manager.send_json(session_id, {
+                "type": "llm_response",
+                "text": response,
+                "provider": provider_name,
+                "tokens": 0,
+                "cached": True
+            })
+            
+            audio_response = cached.audio
+            if not audio_response:
+                audio_response = await tts_service.synthesize(
+                    response,
+                    audio_format=audio_format.name
                 )
-                
-                logger.info(f"🤖 Réponse LLM ({provider.value}): {response[:100]}...")
-                
-                await manager.send_json(session_id, {
-                    "type": "llm_response",
-                    "text": response,
-                    "provider": provider.value,
-                    "tokens": metadata.get("tokens", 0)
-                })
-                
-                audio_response = await tts_service.synthesize(response)
-                
-                logger.info(f"🔊 Audio synthétisé: {len(audio_response)} bytes")
-                
-                await manager.send_bytes(session_id, audio_response)
-                
-                context["last_turns"].append({
-                    "user": transcript,
-                    "assistant": response,
-                    "provider": provider.value,
-                    "timestamp": str(uuid.uuid4())
-                })
-                
-                if len(context["last_turns"]) > 10:
-                    context["last_turns"] = context["last_turns"][-10:]
-                
-                await redis.setex(
-                    f"session:{session_id}",
-                    1800,
-                    json.dumps(context)
+                _run_in_background(
+                    semantic_cache.set_audio(cached.key, audio_response, audio_format.name)
                 )
-                
-                break
-            else:
+            
+            await send_audio(0, audio_response)
+        else:
+            stream_metadata: Dict[str, Any] = {}
+            
+            async def text_deltas():
+                async with aclosing(llm_router.route_and_stream(transcript, context)) as chunks:
+                    async for chunk in chunks:
+                        stream_metadata["provider"] = chunk.provider
+                        if chunk.done:
+                            stream_metadata.update(chunk.metadata, done=True)
+                        else:
+                            yield chunk.text
+            
+            async def send_segment(index: int, segment: str, audio: bytes):
                 await manager.send_json(session_id, {
-                    "type": "transcript",
-                    "transcript": result["transcript"],
-                    "is_final": False,
-                    "confidence": result["confidence"]
+                    "type": "audio_segment",
+                    "index": index,
+                    "text": segment
                 })
+                await send_audio(index, audio)
+            
+            response, audio_segments = await TTSPipeline(
+                tts_service,
+                audio_format=audio_format.name
+            ).run(
+                text_deltas(),
+                send_segment
+            )
+            provider_name = stream_metadata["provider"].value
+            
+            logger.info(f"🤖 Réponse LLM ({provider_name}): {response[:100]}...")
+            
+            await manager.send_json(session_id, {
+                "type": "llm_response",
+                "text": response,
+                "provider": provider_name,
+                "tokens": stream_metadata.get("tokens", 0),
+                "segments": len(audio_segments)
+            })
+            
+            # Segments concaténés : flux valide (MP3, PCM brut, Ogg chaîné),
+            # rejoué tel quel depuis le cache
+            audio_response = b"".join(audio_segments)
+            
+            # Seule une réponse complète et non vide est réutilisable
+            complete = stream_metadata.get("done") and response.strip()
+            
+            if semantic_cache is not None and complete and not had_history:
+                _run_in_background(semantic_cache.set(
+                    transcript,
+                    response,
+                    cache_context,
+                    audio=audio_response,
+                    audio_format=audio_format.name
+                ))
+        
+        if audio_format.framed:
+            await manager.send_json(session_id, {
+                "type": "audio_end",
+                "frames": frames.sequence
+            })
+        
+        logger.info(f"🔊 Audio envoyé: {len(audio_response)} bytes")
+        
+        context["last_turns"].append({
+            "user": transcript,
+            "assistant": response,
+            "provider": provider_name,
+            "timestamp": str(uuid.uuid4())
+        })
+        
+        if len(context["last_turns"]) > 10:
+            context["last_turns"] = context["last_turns"][-10:]
+        
+        await redis.setex(
+            f"session:{session_id}",
+            1800,
+            json.dumps(context)
+        )
         
     except Exception as e:
         logger.error(f"❌ Erreur traitement audio: {e}", exc_info=True)
@@ -253,10 +756,11 @@ async def create_voice_session(user = Depends(get_current_user_ws)):
     """
     session_id = str(uuid.uuid4())
     
-    redis = get_redis_client()
+    redis = await get_redis_client()
     context = {
         "user_id": user["id"],
         "user_role": user.get("role", "user"),
+        "organization": user.get("organization"),
         "session_id": session_id,
         "last_turns": [],
         "created_at": str(uuid.uuid4())
@@ -281,7 +785,7 @@ async def end_voice_session(
     user = Depends(get_current_user_ws)
 ):
     """Termine une session vocale"""
-    redis = get_redis_client()
+    redis = await get_redis_client()
     
     await redis.delete(f"session:{session_id}")
     
@@ -43,6 +43,20 @@ class Settings(BaseSettings):
     deepgram_api_key: str
     deepgram_model: str = "nova-3"
     deepgram_language: str = "fr"
+    stt_keepalive_interval: float = 5.0
+    stt_reconnect_attempts: int = 5
+    stt_audio_queue_max_chunks: int = 500
+    stt_input_sample_rate: int = 16000
+    
+    vad_enabled: bool = True
+    vad_frame_ms: int = 20
+    vad_aggressiveness: int = 2
+    vad_energy_threshold_db: float = -45.0
+    vad_min_speech_ms: int = 60
+    vad_pre_roll_ms: int = 200
+    vad_hangover_ms: int = 700
+    voice_interim_interval_ms: int = 100
+    voice_interim_mode: str = "full"
     
     openai_api_key: str
     openai_model: str = "gpt-4o-mini"
@@ -60,6 +74,21 @@ class Settings(BaseSettings):
     elevenlabs_api_key: Optional[str] = None
     elevenlabs_voice_id: Optional[str] = None
     
+    tts_max_concurrency: int = 32
+    tts_executor_workers: int = 8
+    tts_pipeline_max_concurrency: int = 3
+    tts_first_segment_min_chars: int = 20
+    tts_segment_min_chars: int = 40
+    tts_segment_max_chars: int = 220
+    tts_cache_enabled: bool = True
+    tts_cache_memory_max_entries: int = 10000
+    tts_cache_memory_max_bytes: int = 67108864
+    tts_cache_redis_enabled: bool = True
+    tts_cache_redis_max_bytes: int = 536870912
+    tts_audio_format: str = "mp3"
+    tts_pcm_sample_rate: int = 24000
+    tts_stream_frame_ms: int = 100
+    
     aws_region: str = "af-south-1"
     aws_access_key_id: Optional[str] = None
     aws_secret_access_key: Optional[str] = None
@@ -84,9 +113,31 @@ class Settings(BaseSettings):
     semantic_cache_enabled: bool = True
     semantic_cache_threshold: float = 0.92
     semantic_cache_ttl: int = 86400
+    semantic_cache_index_backend: str = "hnsw"
+    semantic_cache_hnsw_ef_search: int = 128
+    semantic_cache_embedding_dtype: str = "float32"
+    semantic_cache_index_sync_interval: int = 5
+    semantic_cache_partition_max_entries: int = 50000
+    semantic_cache_partition_max_bytes: int = 268435456
+    semantic_cache_eviction_policy: str = "lfu"
+    
+    embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+    embedding_backend: str = "torch"
+    embedding_model_file: Optional[str] = None
+    embedding_batch_max_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+    embedding_executor_workers: int = 1
+    embedding_cache_max_entries: int = 10000
+    embedding_cache_redis_enabled: bool = False
+    embedding_cache_redis_ttl: int = 604800
     
     llm_router_enable_cost_optimization: bool = True
     llm_router_default_provider: str = "gemini-flash"
+    llm_router_classifier_min_confidence: float = 0.6
+    llm_router_remote_classifier_fallback: bool = False
+    llm_router_classifier_weights_path: Optional[str] = None
+    llm_router_decision_cache_size: int = 10000
+    llm_router_decision_cache_ttl: int = 3600
     
     prometheus_enabled: bool = True
     prometheus_port: int = 9090
@@ -107,6 +158,10 @@ class Settings(BaseSettings):
     ws_max_connections_per_user: int = 3
     ws_heartbeat_interval: int = 30
     ws_message_max_size: int = 10485760
+    ws_send_queue_max_messages: int = 256
+    ws_send_queue_max_bytes: int = 4194304
+    ws_send_timeout: float = 10.0
+    ws_interim_policy: str = "coalesce"
     
     artifact_max_size_mb: int = 50
     artifact_generation_timeout_seconds: int = 300
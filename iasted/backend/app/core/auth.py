@@ -188,6 +188,29 @@ async def get_current_user_ws(websocket: WebSocket) -> Optional[Dict[str, Any]]:
         return None
 
 
+ROLE_PERMISSIONS = {
+    "super_admin": {
+        "*": ["*"]
+    },
+    "admin": {
+        "reports": ["read", "create", "update", "delete"],
+        "users": ["read", "create", "update"],
+        "conversations": ["read"],
+        "artifacts": ["read", "create"]
+    },
+    "agent": {
+        "reports": ["read", "create", "update"],
+        "conversations": ["read", "create"],
+        "artifacts": ["read", "create"]
+    },
+    "user": {
+        "reports": ["read:own", "create"],
+        "conversations": ["read:own", "create"],
+        "artifacts": ["read:own", "create"]
+    }
+}
+
+
 def check_permission(user_role: str, resource: str, action: str) -> bool:
     """
     Vérifie les permissions RBAC (simplifié, à améliorer avec Casbin)
@@ -200,29 +223,7 @@ def check_permission(user_role: str, resource: str, action: str) -> bool:
     Returns:
         bool: True si autorisé
     """
-    permissions = {
-        "super_admin": {
-            "*": ["*"]
-        },
-        "admin": {
-            "reports": ["read", "create", "update", "delete"],
-            "users": ["read", "create", "update"],
-            "conversations": ["read"],
-            "artifacts": ["read", "create"]
-        },
-        "agent": {
-            "reports": ["read", "create", "update"],
-            "conversations": ["read", "create"],
-            "artifacts": ["read", "create"]
-        },
-        "user": {
-            "reports": ["read:own", "create"],
-            "conversations": ["read:own", "create"],
-            "artifacts": ["read:own", "create"]
-        }
-    }
-    
-    user_perms = permissions.get(user_role, {})
+    user_perms = ROLE_PERMISSIONS.get(user_role, {})
     
     if "*" in user_perms and "*" in user_perms["*"]:
         return True
@@ -0,0 +1,105 @@
+"""
+Cache LRU en mémoire
+Utilisé pour mémoïser les calculs coûteux (embeddings, décisions de routage, etc.)
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Cache LRU borné en nombre d'entrées (et optionnellement en octets), avec
+    expiration optionnelle
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        size_of: Callable[[Any], int] = len
+    ):
+        """
+        Initialise le cache
+        
+        Args:
+            max_entries: Nombre max d'entrées avant éviction de la moins récente
+            ttl: Durée de vie d'une entrée en secondes (None = sans expiration)
+            max_bytes: Taille totale max des valeurs (None = non bornée)
+            size_of: Taille d'une valeur en octets (utilisée si max_bytes)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and not self._expired(item)
+    
+    @staticmethod
+    def _expired(item: Tuple[Any, Optional[float], int]) -> bool:
+        expires_at = item[1]
+        return expires_at is not None and time.monotonic() >= expires_at
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur (et la marque comme récente) ou None"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        
+        if self._expired(item):
+            self.pop(key)
+            return None
+        
+        self._data.move_to_end(key)
+        return item[0]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Ajoute ou remplace une valeur, en évinçant la moins récente si plein
+        
+        Args:
+            key: Clé
+            value: Valeur
+            ttl: Durée de vie spécifique (défaut: celle du cache)
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self.size_of(value) if self.max_bytes is not None else 0
+        
+        self.pop(key)
+        
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Valeur plus grosse que le budget entier : non cachée
+            return
+        
+        self._data[key] = (value, expires_at, size)
+        self.bytes += size
+        
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.bytes -= evicted_size
+    
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Retire une entrée"""
+        item = self._data.pop(key, None)
+        if item is None:
+            return None
+        
+        self.bytes -= item[2]
+        return item[0]
+    
+    def clear(self):
+        """Vide le cache"""
+        self._data.clear()
+        self.bytes = 0
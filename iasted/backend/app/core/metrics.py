@@ -16,6 +16,22 @@ stt_latency_seconds = Histogram(
     buckets=[0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0]
 )
 
+stt_reconnects_total = Counter(
+    'stt_reconnects_total',
+    'Streaming STT connections re-opened after a drop'
+)
+
+stt_stream_restarts_total = Counter(
+    'stt_stream_restarts_total',
+    'Container audio streams the client was asked to restart after an STT drop'
+)
+
+vad_frames_total = Counter(
+    'vad_frames_total',
+    'Audio frames classified by the server-side VAD',
+    ['speech']
+)
+
 llm_requests_total = Counter(
     'llm_requests_total',
     'Total LLM requests',
@@ -29,6 +45,13 @@ llm_latency_seconds = Histogram(
     buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
 )
 
+llm_first_token_seconds = Histogram(
+    'llm_first_token_seconds',
+    'Time to first streamed token in seconds',
+    ['provider'],
+    buckets=[0.1, 0.25, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0]
+)
+
 llm_tokens_total = Counter(
     'llm_tokens_total',
     'Total tokens used',
@@ -41,6 +64,22 @@ llm_cost_dollars = Counter(
     ['provider']
 )
 
+complexity_classifications_total = Counter(
+    'complexity_classifications_total',
+    'Query complexity classifications',
+    ['source', 'level']
+)
+
+routing_cache_hits_total = Counter(
+    'routing_cache_hits_total',
+    'LLM routing decisions served from cache'
+)
+
+routing_cache_misses_total = Counter(
+    'routing_cache_misses_total',
+    'LLM routing decisions computed (cache miss)'
+)
+
 tts_requests_total = Counter(
     'tts_requests_total',
     'Total TTS requests',
@@ -53,14 +92,67 @@ tts_latency_seconds = Histogram(
     buckets=[0.1, 0.25, 0.5, 1.0, 2.0, 5.0]
 )
 
+tts_first_audio_seconds = Histogram(
+    'tts_first_audio_seconds',
+    'Time from LLM stream start to first audio segment sent',
+    buckets=[0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0]
+)
+
+tts_cache_hits_total = Counter(
+    'tts_cache_hits_total',
+    'TTS audio cache hits',
+    ['tier']
+)
+
+tts_cache_misses_total = Counter(
+    'tts_cache_misses_total',
+    'TTS audio cache misses (provider invoked)'
+)
+
 cache_hits_total = Counter(
     'cache_hits_total',
-    'Semantic cache hits'
+    'Semantic cache hits',
+    ['tier']
 )
 
 cache_misses_total = Counter(
     'cache_misses_total',
-    'Semantic cache misses'
+    'Semantic cache misses',
+    ['tier']
+)
+
+embedding_batch_size = Histogram(
+    'embedding_batch_size',
+    'Number of texts encoded per embedding batch',
+    buckets=[1, 2, 4, 8, 16, 32, 64]
+)
+
+embedding_latency_seconds = Histogram(
+    'embedding_latency_seconds',
+    'Embedding batch encode latency in seconds',
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+)
+
+embedding_cache_hits_total = Counter(
+    'embedding_cache_hits_total',
+    'Embedding memoization hits',
+    ['tier']
+)
+
+embedding_cache_misses_total = Counter(
+    'embedding_cache_misses_total',
+    'Embedding memoization misses (model invoked)'
+)
+
+voice_barge_in_total = Counter(
+    'voice_barge_in_total',
+    'Voice turns cancelled because the user spoke again'
+)
+
+voice_interim_transcripts_total = Counter(
+    'voice_interim_transcripts_total',
+    'Interim transcripts by outcome (sent, coalesced, duplicate)',
+    ['outcome']
 )
 
 websocket_connections = Gauge(
@@ -68,6 +160,35 @@ websocket_connections = Gauge(
     'Active WebSocket connections'
 )
 
+ws_send_queue_depth = Histogram(
+    'ws_send_queue_depth',
+    'Outbound WebSocket queue depth when a message is enqueued',
+    buckets=[0, 1, 2, 5, 10, 25, 50, 100, 250, 500]
+)
+
+ws_send_latency_seconds = Histogram(
+    'ws_send_latency_seconds',
+    'Time from enqueue to WebSocket send completion',
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+ws_sent_bytes_total = Counter(
+    'ws_sent_bytes_total',
+    'Bytes sent on WebSocket connections',
+    ['protocol']
+)
+
+ws_messages_dropped_total = Counter(
+    'ws_messages_dropped_total',
+    'Outbound WebSocket messages not sent',
+    ['reason']
+)
+
+ws_slow_client_disconnects_total = Counter(
+    'ws_slow_client_disconnects_total',
+    'WebSocket connections closed because the client did not keep up'
+)
+
 api_requests_total = Counter(
     'api_requests_total',
     'Total API requests',
@@ -16,6 +16,7 @@ class RedisClient:
     """Client Redis singleton"""
     
     _instance: Optional[Redis] = None
+    _binary_instance: Optional[Redis] = None
     
     @classmethod
     async def get_instance(cls) -> Redis:
@@ -31,16 +32,37 @@ class RedisClient:
         
         return cls._instance
     
+    @classmethod
+    async def get_binary_instance(cls) -> Redis:
+        """Retourne l'instance Redis sans décodage (valeurs bytes, ex: vecteurs)"""
+        if cls._binary_instance is None:
+            cls._binary_instance = await aioredis.from_url(
+                settings.redis_url,
+                decode_responses=False,
+                max_connections=settings.redis_max_connections
+            )
+            logger.info("✅ Client Redis binaire initialisé")
+        
+        return cls._binary_instance
+    
     @classmethod
     async def close(cls):
-        """Ferme la connexion Redis"""
+        """Ferme les connexions Redis"""
         if cls._instance:
             await cls._instance.close()
             cls._instance = None
             logger.info("🔌 Client Redis fermé")
+        
+        if cls._binary_instance:
+            await cls._binary_instance.close()
+            cls._binary_instance = None
 
 
 def get_redis_client() -> Redis:
     """Dependency pour obtenir le client Redis"""
     return RedisClient.get_instance()
 
+
+def get_redis_binary_client() -> Redis:
+    """Dependency pour obtenir le client Redis binaire (sans décodage)"""
+    return RedisClient.get_binary_instance()
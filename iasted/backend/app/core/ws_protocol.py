@@ -0,0 +1,88 @@
+"""
+Protocoles WebSocket négociables
+- json : événements en messages texte JSON, audio en messages binaires bruts
+- msgpack : tout passe en messages binaires MessagePack [séquence, type, corps],
+  événements et audio multiplexés dans un seul flux numéroté
+"""
+
+import logging
+from typing import Any, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # Dépendance optionnelle : seul le protocole json est proposé
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+PROTOCOLS = ("json", "msgpack")
+
+# Types de trame MessagePack
+FRAME_EVENT = 0
+FRAME_AUDIO = 1
+
+
+def negotiate_protocol(requested: Optional[str]) -> str:
+    """
+    Choisit le protocole d'une session
+    
+    Args:
+        requested: Protocole demandé par le client (?protocol=...)
+    
+    Returns:
+        str: msgpack si demandé et disponible, sinon json
+    """
+    if requested == "msgpack":
+        if msgpack is not None:
+            return "msgpack"
+        logger.warning(
+            "⚠️ Protocole msgpack demandé mais msgpack n'est pas installé, utilisation de json"
+        )
+    
+    return "json"
+
+
+def pack_frame(sequence: int, kind: int, body: Any) -> bytes:
+    """
+    Encode une trame MessagePack
+    
+    Args:
+        sequence: Numéro de séquence sortant de la session
+        kind: FRAME_EVENT (corps = dict) ou FRAME_AUDIO (corps = bytes)
+        body: Corps de la trame
+    
+    Returns:
+        bytes: Trame encodée
+    """
+    return msgpack.packb([sequence, kind, body], use_bin_type=True)
+
+
+def unpack_frame(data: bytes) -> Tuple[int, int, Any]:
+    """
+    Décode une trame MessagePack reçue du client
+    
+    Args:
+        data: Message binaire
+    
+    Returns:
+        Tuple[int, int, Any]: (séquence, type, corps)
+    
+    Raises:
+        ValueError: Trame illisible ou mal formée
+    """
+    try:
+        frame = msgpack.unpackb(data, raw=False)
+    except Exception as e:
+        # Erreurs de décodage de types variés selon l'octet fautif
+        raise ValueError(f"Trame MessagePack illisible: {e}") from e
+    
+    if not isinstance(frame, list) or len(frame) != 3:
+        raise ValueError("Trame MessagePack invalide: [séquence, type, corps] attendu")
+    
+    sequence, kind, body = frame
+    if kind == FRAME_AUDIO and not isinstance(body, bytes):
+        raise ValueError("Trame audio MessagePack invalide: corps binaire attendu")
+    if kind == FRAME_EVENT and not isinstance(body, dict):
+        raise ValueError("Trame événement MessagePack invalide: objet attendu")
+    
+    return sequence, kind, body
@@ -0,0 +1,287 @@
+"""
+File d'envoi WebSocket par session
+Le pipeline dépose ses messages dans une file bornée, une tâche dédiée les
+écrit sur le socket : un client lent ralentit sa propre session (contre-
+pression) sans bloquer indéfiniment ni accumuler l'audio en mémoire
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from fastapi import WebSocket
+
+from app.config import settings
+from app.core.metrics import (
+    ws_messages_dropped_total,
+    ws_send_latency_seconds,
+    ws_send_queue_depth,
+    ws_sent_bytes_total,
+    ws_slow_client_disconnects_total
+)
+from app.core.ws_protocol import FRAME_AUDIO, FRAME_EVENT, pack_frame
+
+logger = logging.getLogger(__name__)
+
+INTERIM_POLICIES = ("coalesce", "drop", "queue")
+
+# Code de fermeture "Try Again Later"
+_SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+@dataclass
+class _Outbound:
+    """Message en attente d'envoi"""
+    kind: str
+    payload: Any
+    size: int = 0
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class SessionSender:
+    """
+    File d'envoi bornée d'une session, vidée par une seule tâche d'écriture
+    
+    - Les producteurs attendent quand la file dépasse ws_send_queue_max_messages
+      ou ws_send_queue_max_bytes (octets des messages binaires, donc l'audio).
+    - Les transcriptions intermédiaires ne font jamais attendre : selon
+      ws_interim_policy, la plus récente remplace celle qui attend encore
+      (coalesce), elles sont ignorées dès que la file n'est pas vide (drop) ou
+      elles sont mises en file comme les autres messages (queue). File pleine,
+      elles sont ignorées.
+    - Un envoi qui dépasse ws_send_timeout ferme la connexion : le client ne
+      suit plus, inutile de continuer à produire pour lui.
+    
+    Protocole msgpack : chaque message part en trame binaire numérotée
+    (cf. app.core.ws_protocol), la séquence est attribuée à l'écriture.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        max_messages: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        interim_policy: Optional[str] = None,
+        protocol: str = "json"
+    ):
+        """
+        Initialise la file
+        
+        Args:
+            websocket: Socket de la session
+            session_id: ID de session (logs)
+            max_messages: Messages en attente max (défaut: settings)
+            max_bytes: Octets binaires en attente max, 0 = illimité (défaut: settings)
+            send_timeout: Délai max d'un envoi en secondes (défaut: settings)
+            interim_policy: coalesce, drop ou queue (défaut: settings)
+            protocol: json ou msgpack (négocié par negotiate_protocol)
+        """
+        self.websocket = websocket
+        self.session_id = session_id
+        self.max_messages = max(1, max_messages or settings.ws_send_queue_max_messages)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.ws_send_queue_max_bytes
+        self.send_timeout = send_timeout or settings.ws_send_timeout
+        self.interim_policy = interim_policy or settings.ws_interim_policy
+        
+        if self.interim_policy not in INTERIM_POLICIES:
+            logger.warning(
+                f"⚠️ ws_interim_policy inconnue '{self.interim_policy}', utilisation de coalesce"
+            )
+            self.interim_policy = "coalesce"
+        
+        self.protocol = protocol
+        self.sequence = 0
+        self._sent_bytes = ws_sent_bytes_total.labels(protocol=protocol)
+        
+        self.closed = False
+        self._queue: deque = deque()
+        self._bytes = 0
+        self._interim: Optional[_Outbound] = None
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+    
+    def start(self):
+        """Démarre la tâche d'écriture"""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+    
+    async def send_json(self, data: dict, interim: bool = False):
+        """
+        Met un message JSON en file
+        
+        Args:
+            data: Message
+            interim: Transcription intermédiaire (soumise à ws_interim_policy)
+        """
+        interim = interim and self.interim_policy != "queue"
+        
+        if interim:
+            if self._interim is not None:
+                # Pas encore parti : la version la plus récente prend sa place
+                self._interim.payload = data
+                ws_messages_dropped_total.labels(reason="coalesced").inc()
+                return
+            
+            if self.interim_policy == "drop" and self._queue:
+                ws_messages_dropped_total.labels(reason="interim").inc()
+                return
+        
+        await self._put(_Outbound("json", data), interim=interim)
+    
+    async def send_bytes(self, data: bytes):
+        """Met un message binaire en file (attend s'il n'y a plus de place)"""
+        await self._put(_Outbound("bytes", data, size=len(data)))
+    
+    def discard_audio(self) -> int:
+        """
+        Retire l'audio pas encore envoyé (réponse interrompue)
+        
+        Returns:
+            int: Nombre de messages retirés
+        """
+        kept = deque(item for item in self._queue if item.kind != "bytes")
+        discarded = len(self._queue) - len(kept)
+        
+        if discarded:
+            self._queue = kept
+            self._bytes = 0
+            self._space.set()
+            ws_messages_dropped_total.labels(reason="discarded").inc(discarded)
+        
+        return discarded
+    
+    def close(self):
+        """
+        Refuse les nouveaux messages et laisse la tâche d'écriture vider la file
+        (dans la limite de ws_send_timeout)
+        """
+        if self.closed:
+            return
+        
+        self.closed = True
+        self._ready.set()
+        self._space.set()
+        
+        if self._writer is not None and not self._writer.done():
+            asyncio.get_running_loop().call_later(self.send_timeout, self._writer.cancel)
+    
+    def _full(self, size: int) -> bool:
+        if not self._queue:
+            # Un message plus gros que le budget passe seul
+            return False
+        return len(self._queue) >= self.max_messages or (
+            bool(self.max_bytes) and self._bytes + size > self.max_bytes
+        )
+    
+    async def _put(self, item: _Outbound, interim: bool = False):
+        """Ajoute un message, en attendant de la place si la file est pleine"""
+        while not self.closed and self._full(item.size):
+            if interim:
+                ws_messages_dropped_total.labels(reason="interim").inc()
+                return
+            self._space.clear()
+            await self._space.wait()
+        
+        if self.closed:
+            ws_messages_dropped_total.labels(reason="closed").inc()
+            return
+        
+        self._queue.append(item)
+        self._bytes += item.size
+        
+        if interim:
+            self._interim = item
+        elif item.kind == "json":
+            # Un message ordonné est passé derrière : la prochaine transcription
+            # intermédiaire ne doit pas remonter avant lui
+            self._interim = None
+        
+        ws_send_queue_depth.observe(len(self._queue))
+        self._ready.set()
+    
+    async def _write_loop(self):
+        """Écrit les messages dans l'ordre, un à la fois"""
+        try:
+            while True:
+                while not self._queue:
+                    if self.closed:
+                        return
+                    self._ready.clear()
+                    await self._ready.wait()
+                
+                item = self._queue.popleft()
+                self._bytes -= item.size
+                if item is self._interim:
+                    self._interim = None
+                self._space.set()
+                
+                try:
+                    await asyncio.wait_for(self._send(item), timeout=self.send_timeout)
+                
+                except asyncio.TimeoutError:
+                    ws_slow_client_disconnects_total.inc()
+                    logger.warning(
+                        f"⚠️ Client trop lent, fermeture: session={self.session_id} "
+                        f"({len(self._queue)} messages en attente)"
+                    )
+                    self._abort()
+                    await self._close_socket()
+                    return
+                
+                except Exception as e:
+                    logger.info(f"🔌 Envoi WebSocket impossible ({self.session_id}): {e}")
+                    self._abort()
+                    return
+                
+                ws_send_latency_seconds.observe(time.perf_counter() - item.enqueued_at)
+        
+        except asyncio.CancelledError:
+            self._abort()
+            raise
+    
+    async def _send(self, item: _Outbound):
+        if self.protocol == "msgpack":
+            kind = FRAME_AUDIO if item.kind == "bytes" else FRAME_EVENT
+            frame = pack_frame(self.sequence, kind, item.payload)
+            self.sequence += 1
+            self._sent_bytes.inc(len(frame))
+            await self.websocket.send_bytes(frame)
+        
+        elif item.kind == "bytes":
+            self._sent_bytes.inc(len(item.payload))
+            await self.websocket.send_bytes(item.payload)
+        
+        else:
+            # Même encodage que WebSocket.send_json, pour compter les octets émis
+            text = json.dumps(item.payload, separators=(",", ":"), ensure_ascii=False)
+            self._sent_bytes.inc(len(text.encode("utf-8")))
+            await self.websocket.send_text(text)
+    
+    def _abort(self):
+        """Abandonne les messages restants et libère les producteurs"""
+        self.closed = True
+        
+        if self._queue:
+            ws_messages_dropped_total.labels(reason="closed").inc(len(self._queue))
+            self._queue.clear()
+        
+        self._bytes = 0
+        self._interim = None
+        self._ready.set()
+        self._space.set()
+    
+    async def _close_socket(self):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=_SLOW_CLIENT_CLOSE_CODE), timeout=1.0)
+        except Exception:
+            pass
@@ -15,6 +15,11 @@ import logging
 from app.config import settings
 from app.core.logging import setup_logging
 from app.api.routes import api_router
+from app.core.redis_client import RedisClient
+from app.services.embedding_service import get_embedding_service
+from app.services.llm_router import get_llm_router
+from app.services.stt_service import get_stt_service
+from app.services.tts_service import get_tts_service
 
 
 setup_logging()
@@ -27,9 +32,22 @@ async def lifespan(app: FastAPI):
     logger.info(f"🚀 Démarrage de {settings.app_name} v{settings.api_version}")
     logger.info(f"📍 Environnement: {settings.app_env}")
     
+    # Services partagés par toutes les connexions : clients HTTP/gRPC et pools créés une fois
+    get_stt_service()
+    tts_service = get_tts_service()
+    llm_router = get_llm_router()
+    # Le modèle d'embeddings n'est chargé qu'au premier encodage
+    embedding_service = get_embedding_service()
+    logger.info("✅ Services STT/TTS/LLM/embeddings partagés initialisés")
+    
     yield
     
     logger.info(f"🛑 Arrêt de {settings.app_name}")
+    
+    await llm_router.aclose()
+    await tts_service.aclose()
+    await embedding_service.close()
+    await RedisClient.close()
 
 
 app = FastAPI(
@@ -6,17 +6,19 @@ Utilise WeasyPrint pour les PDFs et LLM pour le contenu
 import logging
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from weasyprint import HTML
 from jinja2 import Template
 import boto3
 from botocore.exceptions import ClientError
 
 from app.config import settings
-from app.services.llm_router import LLMRouter
+from app.services.llm_router import get_llm_router
 
 logger = logging.getLogger(__name__)
 
+_artifact_service: Optional["ArtifactService"] = None
+
 
 class ArtifactService:
     """Service de génération d'artefacts documentaires"""
@@ -30,7 +32,7 @@ class ArtifactService:
             aws_secret_access_key=settings.aws_secret_access_key
         )
         self.bucket = settings.s3_artifacts_bucket
-        self.llm_router = LLMRouter()
+        self.llm_router = get_llm_router()
         
         logger.info("✅ Service Artifact initialisé")
     
@@ -231,3 +233,12 @@ Style : Professionnel, factuel, données chiffrées quand possible."""
         
         return html
 
+
+def get_artifact_service() -> ArtifactService:
+    """Retourne le service d'artefacts partagé par le processus (client S3 unique)"""
+    global _artifact_service
+    
+    if _artifact_service is None:
+        _artifact_service = ArtifactService()
+    
+    return _artifact_service
@@ -0,0 +1,191 @@
+"""
+Formats audio de sortie et découpage en trames numérotées
+Le client reçoit l'audio en petites trames binaires qu'il peut jouer au fil
+de l'eau (PCM 16 bits ou pages Ogg Opus) au lieu d'un fichier MP3 complet
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from app.config import settings
+
+# En-tête de trame : numéro de séquence (uint32), segment (uint16), drapeaux (uint8), réservé
+FRAME_HEADER = struct.Struct(">IHBx")
+FLAG_SEGMENT_END = 0x01
+
+_OGG_CAPTURE = b"OggS"
+_OGG_HEADER_SIZE = 27
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Format audio négociable avec le client"""
+    name: str
+    mime_type: str
+    framed: bool
+    sample_rate: Optional[int] = None
+    
+    def describe(self) -> dict:
+        """Description envoyée au client à la négociation"""
+        return {
+            "format": self.name,
+            "mime_type": self.mime_type,
+            "framed": self.framed,
+            "sample_rate": self.sample_rate,
+            "channels": 1,
+            "frame_ms": settings.tts_stream_frame_ms if self.name == "pcm16" else None
+        }
+
+
+AUDIO_FORMATS = {
+    # Historique : un fichier MP3 par segment, sans en-tête de trame
+    "mp3": AudioFormat("mp3", "audio/mpeg", framed=False),
+    "pcm16": AudioFormat(
+        "pcm16",
+        "audio/L16",
+        framed=True,
+        sample_rate=settings.tts_pcm_sample_rate
+    ),
+    "opus": AudioFormat("opus", "audio/ogg; codecs=opus", framed=True, sample_rate=48000),
+}
+
+
+def negotiate_audio_format(requested: Optional[str], supported: Iterable[str]) -> AudioFormat:
+    """
+    Choisit le format de sortie d'une session
+    
+    Args:
+        requested: Format demandé par le client (None = défaut serveur)
+        supported: Formats produits par le provider TTS actif
+    
+    Returns:
+        AudioFormat: Format demandé s'il est disponible, sinon le défaut (ou mp3)
+    """
+    supported = set(supported)
+    
+    for name in (requested, settings.tts_audio_format, "mp3"):
+        if name in AUDIO_FORMATS and name in supported:
+            return AUDIO_FORMATS[name]
+    
+    return AUDIO_FORMATS["mp3"]
+
+
+def strip_wav_header(audio: bytes) -> bytes:
+    """Retourne les échantillons d'un fichier WAV (inchangé si pas de conteneur RIFF)"""
+    if audio[:4] != b"RIFF" or audio[8:12] != b"WAVE":
+        return audio
+    
+    position = 12
+    while position + 8 <= len(audio):
+        chunk_id = audio[position:position + 4]
+        chunk_size = struct.unpack_from("<I", audio, position + 4)[0]
+        if chunk_id == b"data":
+            return audio[position + 8:position + 8 + chunk_size]
+        position += 8 + chunk_size + (chunk_size & 1)
+    
+    return audio
+
+
+def _ogg_pages(audio: bytes) -> Optional[List[bytes]]:
+    """Découpe un flux Ogg en pages (None si le flux est mal formé)"""
+    pages = []
+    position = 0
+    
+    while position < len(audio):
+        if audio[position:position + 4] != _OGG_CAPTURE or position + _OGG_HEADER_SIZE > len(audio):
+            return None
+        
+        segments = audio[position + 26]
+        lacing_end = position + _OGG_HEADER_SIZE + segments
+        end = lacing_end + sum(audio[position + _OGG_HEADER_SIZE:lacing_end])
+        if end > len(audio):
+            return None
+        
+        pages.append(audio[position:end])
+        position = end
+    
+    return pages
+
+
+def split_frames(audio: bytes, audio_format: AudioFormat) -> List[bytes]:
+    """
+    Découpe l'audio d'un segment en trames jouables séparément
+    
+    - pcm16 : blocs de tts_stream_frame_ms (alignés sur un échantillon)
+    - opus : pages Ogg ; les pages d'en-tête partent avec la première page audio
+    - mp3 : une seule trame (fichier complet)
+    
+    Args:
+        audio: Audio du segment
+        audio_format: Format de la session
+    
+    Returns:
+        List[bytes]: Trames dans l'ordre de lecture
+    """
+    if not audio:
+        return []
+    
+    if audio_format.name == "pcm16":
+        frame_bytes = audio_format.sample_rate * 2 * settings.tts_stream_frame_ms // 1000
+        frame_bytes = max(2, frame_bytes - frame_bytes % 2)
+        return [audio[i:i + frame_bytes] for i in range(0, len(audio), frame_bytes)]
+    
+    if audio_format.name == "opus":
+        pages = _ogg_pages(audio)
+        if pages is None:
+            return [audio]
+        
+        frames, pending = [], b""
+        for page in pages:
+            pending += page
+            # Position de granule nulle : page d'en-tête (OpusHead, OpusTags)
+            if struct.unpack_from("<q", page, 6)[0] > 0:
+                frames.append(pending)
+                pending = b""
+        if pending:
+            frames.append(pending)
+        return frames
+    
+    return [audio]
+
+
+class AudioFrameWriter:
+    """
+    Envoi des trames d'une réponse avec numéros de séquence
+    
+    La séquence repart de 0 à chaque réponse ; le dernier bloc de chaque
+    segment porte FLAG_SEGMENT_END.
+    """
+    
+    def __init__(self, audio_format: AudioFormat, send_bytes: Callable[[bytes], Awaitable[None]]):
+        """
+        Initialise l'écrivain
+        
+        Args:
+            audio_format: Format de la session
+            send_bytes: Coroutine d'envoi d'un message binaire
+        """
+        self.audio_format = audio_format
+        self.send_bytes = send_bytes
+        self.sequence = 0
+    
+    async def write_segment(self, index: int, audio: bytes) -> int:
+        """
+        Envoie l'audio d'un segment en trames
+        
+        Args:
+            index: Index du segment dans la réponse
+            audio: Audio du segment
+        
+        Returns:
+            int: Nombre de trames envoyées
+        """
+        frames = split_frames(audio, self.audio_format)
+        
+        for position, payload in enumerate(frames):
+            flags = FLAG_SEGMENT_END if position == len(frames) - 1 else 0
+            await self.send_bytes(FRAME_HEADER.pack(self.sequence, index, flags) + payload)
+            self.sequence += 1
+        
+        return len(frames)
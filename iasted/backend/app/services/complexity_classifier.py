@@ -0,0 +1,211 @@
+"""
+Classifieur local de complexité des requêtes
+Remplace l'appel Gemini de classification : heuristiques + modèle logistique
+sur des statistiques de tokens, en moins d'une milliseconde
+"""
+
+import json
+import logging
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_classifier: Optional["ComplexityClassifier"] = None
+
+LABELS = ("simple", "medium", "complex")
+
+GREETINGS = {
+    "bonjour", "bonsoir", "salut", "merci", "coucou", "hello", "revoir",
+    "ok", "okay", "oui", "non", "bienvenue", "allo", "allô"
+}
+
+FACTUAL_STARTERS = {
+    "quel", "quelle", "quels", "quelles", "qui", "où", "quand", "combien",
+    "est", "es", "as", "a", "y"
+}
+
+EXPLAIN_WORDS = {
+    "explique", "expliquer", "expliquez", "pourquoi", "comment", "compare",
+    "comparer", "comparaison", "différence", "différences", "résume",
+    "résumer", "résumé", "avantages", "inconvénients", "signifie", "définition",
+    "procédure", "démarche", "conseil", "conseils"
+}
+
+COMPLEX_WORDS = {
+    "analyse", "analyser", "analysez", "rédige", "rédiger", "rédigez", "génère",
+    "générer", "rapport", "stratégie", "plan", "détaillé", "détaillée",
+    "tendance", "tendances", "corrélation", "évalue", "évaluer", "synthèse",
+    "recommandations", "argumente", "élabore", "élaborer", "projection",
+    "prévision", "audit", "approfondie", "exhaustive", "tableau"
+}
+
+CODE_WORDS = {
+    "code", "script", "fonction", "class", "sql", "python", "api", "json",
+    "regex", "requête sql", "algorithme", "programme"
+}
+
+CONNECTORS = {
+    "puis", "ensuite", "enfin", "également", "aussi", "ainsi", "étape",
+    "étapes", "premièrement", "deuxièmement", "d abord", "par ailleurs"
+}
+
+FEATURES = (
+    "bias", "log_words", "greeting", "factual", "explain", "complex",
+    "code", "connectors", "questions", "enumeration", "numbers", "long_words"
+)
+
+# Poids (simple, medium, complex) calibrés sur des requêtes vocales types ;
+# remplaçables par un fichier JSON entraîné (settings.llm_router_classifier_weights_path)
+DEFAULT_WEIGHTS: Dict[str, Tuple[float, float, float]] = {
+    "bias": (1.6, 0.6, -1.4),
+    "log_words": (-0.9, 0.1, 0.6),
+    "greeting": (2.5, -0.5, -1.5),
+    "factual": (2.0, -0.1, -1.0),
+    "explain": (-0.9, 1.6, 0.3),
+    "complex": (-1.4, -0.2, 2.0),
+    "code": (-2.0, -0.5, 3.0),
+    "connectors": (-0.6, 0.0, 0.9),
+    "questions": (0.0, 0.2, 0.3),
+    "enumeration": (-0.5, 0.1, 0.6),
+    "numbers": (0.0, 0.2, 0.1),
+    "long_words": (-0.6, 0.3, 1.0),
+}
+
+_SENTENCE_SPLIT = re.compile(r"[,;:]")
+_DIGITS = re.compile(r"\d")
+
+
+def extract_features(query: str) -> Dict[str, float]:
+    """
+    Calcule les caractéristiques d'une requête
+    
+    Args:
+        query: Requête utilisateur brute
+    
+    Returns:
+        Dict[str, float]: Valeur de chaque caractéristique
+    """
+    normalized = normalize_text(query)
+    words = normalized.split()
+    word_set = set(words)
+    padded = f" {normalized} "
+    
+    def count(vocabulary: set, cap: int) -> float:
+        # Expressions de plusieurs mots cherchées dans le texte, mots seuls dans l'ensemble
+        hits = sum(
+            1 for term in vocabulary
+            if (f" {term} " in padded if " " in term else term in word_set)
+        )
+        return float(min(hits, cap))
+    
+    return {
+        "bias": 1.0,
+        "log_words": math.log1p(len(words)),
+        "greeting": 1.0 if len(words) <= 6 and word_set & GREETINGS else 0.0,
+        "factual": 1.0 if words and words[0] in FACTUAL_STARTERS else 0.0,
+        "explain": count(EXPLAIN_WORDS, 2),
+        "complex": count(COMPLEX_WORDS, 3),
+        "code": 1.0 if count(CODE_WORDS, 1) else 0.0,
+        "connectors": count(CONNECTORS, 3),
+        "questions": float(min(query.count("?"), 3)),
+        "enumeration": min(len(_SENTENCE_SPLIT.findall(query)) / 3, 2.0),
+        "numbers": 1.0 if _DIGITS.search(query) else 0.0,
+        "long_words": sum(1 for word in words if len(word) >= 9) / len(words) if words else 0.0,
+    }
+
+
+class ComplexityClassifier:
+    """
+    Modèle logistique multinomial (simple / medium / complex)
+    
+    Pas de dépendance ML : un produit scalaire par classe puis un softmax.
+    La confiance retournée (probabilité de la classe retenue) permet au
+    router de ne consulter le classifieur distant que dans les cas douteux.
+    """
+    
+    def __init__(self, weights: Optional[Dict[str, List[float]]] = None):
+        """
+        Initialise le classifieur
+        
+        Args:
+            weights: Poids par caractéristique (simple, medium, complex)
+        """
+        self.weights = {
+            name: tuple(values)
+            for name, values in (weights or DEFAULT_WEIGHTS).items()
+        }
+        
+        missing = set(FEATURES) - set(self.weights)
+        if missing:
+            raise ValueError(f"Poids manquants pour: {', '.join(sorted(missing))}")
+    
+    @classmethod
+    def from_file(cls, path: str) -> "ComplexityClassifier":
+        """Charge des poids entraînés depuis un fichier JSON {feature: [s, m, c]}"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+    
+    def predict_proba(self, query: str) -> Dict[str, float]:
+        """
+        Probabilités de chaque niveau de complexité
+        
+        Args:
+            query: Requête utilisateur
+        
+        Returns:
+            Dict[str, float]: Probabilité par niveau
+        """
+        features = extract_features(query)
+        
+        scores = [0.0, 0.0, 0.0]
+        for name, value in features.items():
+            if value:
+                for i, weight in enumerate(self.weights[name]):
+                    scores[i] += weight * value
+        
+        top = max(scores)
+        exps = [math.exp(score - top) for score in scores]
+        total = sum(exps)
+        
+        return {label: exp / total for label, exp in zip(LABELS, exps)}
+    
+    def classify(self, query: str) -> Tuple[str, float]:
+        """
+        Classifie une requête
+        
+        Args:
+            query: Requête utilisateur
+        
+        Returns:
+            Tuple[str, float]: (niveau, confiance)
+        """
+        probabilities = self.predict_proba(query)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+
+def get_complexity_classifier() -> ComplexityClassifier:
+    """Retourne le classifieur partagé (poids entraînés si configurés)"""
+    global _classifier
+    
+    if _classifier is None:
+        path = settings.llm_router_classifier_weights_path
+        
+        if path:
+            try:
+                _classifier = ComplexityClassifier.from_file(path)
+                logger.info(f"✅ Classifieur de complexité chargé: {path}")
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Poids du classifieur illisibles ({path}): {e}, poids par défaut"
+                )
+        
+        if _classifier is None:
+            _classifier = ComplexityClassifier()
+    
+    return _classifier
@@ -0,0 +1,353 @@
+"""
+Service d'embeddings asynchrone
+Calcule les embeddings hors de la boucle d'événements avec micro-batching
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import (
+    embedding_batch_size,
+    embedding_latency_seconds,
+    embedding_cache_hits_total,
+    embedding_cache_misses_total,
+)
+from app.core.redis_client import get_redis_binary_client
+from app.services.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+_encoders: Dict[Tuple[str, str, Optional[str]], object] = {}
+_encoders_lock = threading.Lock()
+_embedding_service: Optional["EmbeddingService"] = None
+
+
+def get_encoder(
+    model_name: Optional[str] = None,
+    backend: Optional[str] = None,
+    model_file: Optional[str] = None
+):
+    """
+    Retourne le modèle d'embeddings, chargé à la première utilisation puis
+    partagé par tout le processus
+    
+    Le chargement (plusieurs secondes) est fait au premier encodage, dans le
+    pool de threads du service, et non à l'import : le démarrage du pod n'en
+    dépend pas.
+    
+    Args:
+        model_name: Modèle SentenceTransformer (défaut: settings.embedding_model)
+        backend: "torch", "onnx" ou "openvino" (défaut: settings.embedding_backend)
+        model_file: Fichier de poids ONNX/OpenVINO, ex. version quantifiée int8
+    
+    Returns:
+        SentenceTransformer: Modèle chargé
+    """
+    model_name = model_name or settings.embedding_model
+    backend = backend or settings.embedding_backend
+    model_file = model_file or settings.embedding_model_file
+    key = (model_name, backend, model_file)
+    
+    encoder = _encoders.get(key)
+    if encoder is not None:
+        return encoder
+    
+    with _encoders_lock:
+        encoder = _encoders.get(key)
+        if encoder is None:
+            from sentence_transformers import SentenceTransformer
+            
+            start = time.perf_counter()
+            
+            kwargs = {"backend": backend}
+            if model_file and backend != "torch":
+                kwargs["model_kwargs"] = {"file_name": model_file}
+            
+            encoder = SentenceTransformer(model_name, **kwargs)
+            _encoders[key] = encoder
+            
+            logger.info(
+                f"✅ Modèle d'embeddings chargé: {model_name} "
+                f"(backend={backend}, {time.perf_counter() - start:.1f}s)"
+            )
+    
+    return encoder
+
+
+class EmbeddingService:
+    """
+    Encodeur asynchrone à micro-batching et mémoïsation
+    
+    Les requêtes concurrentes arrivant dans la même fenêtre (max_wait_ms) sont
+    encodées ensemble en un seul appel encode(), exécuté dans un pool de threads
+    dédié (PyTorch libère le GIL pendant le calcul) : la boucle d'événements
+    n'est jamais bloquée par le modèle.
+    
+    Les embeddings sont mémoïsés par texte normalisé (LRU en mémoire, Redis en
+    second niveau optionnel) : le modèle tourne au plus une fois par énoncé.
+    """
+    
+    L2_PREFIX = "embedding:"
+    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        workers: Optional[int] = None,
+        encoder=None
+    ):
+        """
+        Initialise le service (le modèle n'est pas chargé ici)
+        
+        Args:
+            model_name: Modèle SentenceTransformer (défaut: settings.embedding_model)
+            max_batch_size: Taille max d'un batch
+            max_wait_ms: Attente max pour compléter un batch (ms)
+            workers: Nombre de batches encodés en parallèle
+            encoder: Modèle déjà chargé (sinon chargé paresseusement via get_encoder)
+        """
+        self.model_name = model_name or settings.embedding_model
+        self._encoder = encoder
+        self.max_batch_size = max_batch_size or settings.embedding_batch_max_size
+        self.max_wait = (max_wait_ms or settings.embedding_batch_max_wait_ms) / 1000
+        self.workers = workers or settings.embedding_executor_workers
+        
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="embedding"
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batches: set = set()
+        
+        self._memo = LRUCache(settings.embedding_cache_max_entries)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._l2_enabled = settings.embedding_cache_redis_enabled
+        self._l2_ttl = settings.embedding_cache_redis_ttl
+        self._l2_namespace = f"{self.L2_PREFIX}{self.model_fingerprint}:"
+        self._redis: Optional[Redis] = None
+    
+    @property
+    def model_fingerprint(self) -> str:
+        """Empreinte courte du modèle (les vecteurs de modèles différents ne se comparent pas)"""
+        return hashlib.sha1(self.model_name.encode()).hexdigest()[:8]
+    
+    @property
+    def encoder(self):
+        """Modèle d'embeddings (chargé à la première utilisation)"""
+        if self._encoder is None:
+            self._encoder = get_encoder(self.model_name)
+        return self._encoder
+    
+    async def get_dimension(self) -> int:
+        """Dimension des embeddings (charge le modèle hors de la boucle si besoin)"""
+        loop = asyncio.get_running_loop()
+        encoder = await loop.run_in_executor(self._executor, lambda: self.encoder)
+        return encoder.get_sentence_embedding_dimension()
+    
+    def _ensure_started(self):
+        """Démarre le dispatcher dans la boucle courante"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._dispatcher = asyncio.create_task(self._dispatch())
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Calcule l'embedding normalisé d'un texte
+        
+        Args:
+            text: Texte à encoder
+        
+        Returns:
+            np.ndarray: Vecteur float32 unitaire
+        """
+        key = normalize_text(text)
+        
+        embedding = self._memo.get(key)
+        if embedding is not None:
+            embedding_cache_hits_total.labels(tier="memory").inc()
+            return embedding
+        
+        # Même énoncé déjà en cours d'encodage : on partage le résultat
+        pending = self._inflight.get(key)
+        if pending is not None:
+            embedding_cache_hits_total.labels(tier="inflight").inc()
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # Appelant d'origine annulé avant la fin de l'encodage : on le reprend
+                return await self.embed(text)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        
+        try:
+            embedding = await self._l2_get(key)
+            
+            if embedding is not None:
+                embedding_cache_hits_total.labels(tier="redis").inc()
+            else:
+                embedding_cache_misses_total.inc()
+                embedding = await self._encode_batched(key)
+                await self._l2_set(key, embedding)
+            
+            self._memo.set(key, embedding)
+            future.set_result(embedding)
+            return embedding
+        
+        except Exception as e:
+            future.set_exception(e)
+            # Évite l'avertissement "exception never retrieved" sans attente concurrente
+            future.exception()
+            raise
+        
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+    
+    async def _encode_batched(self, text: str) -> np.ndarray:
+        """Soumet un texte au dispatcher de micro-batching"""
+        self._ensure_started()
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    def _l2_key(self, key: str) -> str:
+        return f"{self._l2_namespace}{hashlib.sha1(key.encode('utf-8')).hexdigest()}"
+    
+    async def _l2_get(self, key: str) -> Optional[np.ndarray]:
+        """Lit un embedding float32 dans le cache Redis (second niveau)"""
+        if not self._l2_enabled:
+            return None
+        
+        try:
+            if self._redis is None:
+                self._redis = await get_redis_binary_client()
+            
+            packed = await self._redis.get(self._l2_key(key))
+            if packed:
+                return np.frombuffer(packed, dtype=np.float32)
+        
+        except Exception as e:
+            logger.warning(f"⚠️ Cache embeddings Redis indisponible: {e}")
+        
+        return None
+    
+    async def _l2_set(self, key: str, embedding: np.ndarray):
+        """Écrit un embedding float32 dans le cache Redis (second niveau)"""
+        if not self._l2_enabled or self._redis is None:
+            return
+        
+        try:
+            await self._redis.setex(
+                self._l2_key(key),
+                self._l2_ttl,
+                np.asarray(embedding, dtype=np.float32).tobytes()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Écriture cache embeddings Redis échouée: {e}")
+    
+    async def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        """Calcule les embeddings de plusieurs textes (batchés ensemble)"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+    
+    async def _dispatch(self):
+        """Regroupe les requêtes en batches et les envoie au pool"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Encode un batch dans le pool de threads et résout les futures"""
+        loop = asyncio.get_running_loop()
+        
+        try:
+            batch = [(text, future) for text, future in batch if not future.cancelled()]
+            if not batch:
+                return
+            
+            embedding_batch_size.observe(len(batch))
+            
+            with embedding_latency_seconds.time():
+                embeddings = await loop.run_in_executor(
+                    self._executor,
+                    self._encode,
+                    [text for text, _ in batch]
+                )
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur encodage batch ({len(batch)} textes): {e}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        
+        finally:
+            self._slots.release()
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encodage synchrone (exécuté dans le pool)"""
+        embeddings = self.encoder.encode(
+            texts,
+            batch_size=len(texts),
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return embeddings.astype(np.float32, copy=False)
+    
+    async def close(self):
+        """Arrête le dispatcher et le pool de threads"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        
+        self._executor.shutdown(wait=False)
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Retourne le service d'embeddings partagé par le processus"""
+    global _embedding_service
+    
+    if _embedding_service is None:
+        _embedding_service = EmbeddingService()
+    
+    return _embedding_service
@@ -0,0 +1,142 @@
+"""
+Transcriptions intermédiaires limitées en débit
+Deepgram renvoie plusieurs résultats non finaux par seconde : le client en
+reçoit au plus un par intervalle (le plus récent), éventuellement sous forme
+de diff par rapport au précédent
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Optional, Tuple
+
+from app.config import settings
+from app.core.metrics import voice_interim_transcripts_total
+
+logger = logging.getLogger(__name__)
+
+INTERIM_MODES = ("full", "diff")
+
+_sent = voice_interim_transcripts_total.labels(outcome="sent")
+_coalesced = voice_interim_transcripts_total.labels(outcome="coalesced")
+_duplicate = voice_interim_transcripts_total.labels(outcome="duplicate")
+
+
+def interim_mode(requested: Optional[str]) -> str:
+    """Mode demandé par le client s'il est connu, sinon le défaut serveur"""
+    if requested in INTERIM_MODES:
+        return requested
+    return settings.voice_interim_mode if settings.voice_interim_mode in INTERIM_MODES else "full"
+
+
+class InterimTranscriptThrottle:
+    """
+    Envoi des transcriptions intermédiaires d'une session
+    
+    Au plus un message toutes les voice_interim_interval_ms : une
+    transcription arrivée trop tôt attend la fin de l'intervalle et est
+    remplacée par les suivantes (la plus récente gagne). Une transcription
+    identique à la dernière envoyée n'est pas renvoyée.
+    
+    Mode diff : {"offset": n, "text": suffixe} remplace le texte courant à
+    partir du caractère n (transcript = courant[:offset] + text). Le texte
+    courant repart de "" après chaque résultat final (reset).
+    """
+    
+    def __init__(
+        self,
+        send: Callable[[dict], Awaitable[None]],
+        interval_ms: Optional[int] = None,
+        mode: Optional[str] = None
+    ):
+        """
+        Initialise le limiteur
+        
+        Args:
+            send: Coroutine d'envoi d'un message au client
+            interval_ms: Intervalle minimal entre deux envois, 0 = sans limite (défaut: settings)
+            mode: full ou diff (défaut: settings)
+        """
+        self.send = send
+        if interval_ms is None:
+            interval_ms = settings.voice_interim_interval_ms
+        self.interval = interval_ms / 1000
+        self.mode = interim_mode(mode)
+        
+        self._sent_text = ""
+        self._last_sent_at = float("-inf")
+        self._pending: Optional[Tuple[str, float]] = None
+        self._timer: Optional[asyncio.Task] = None
+    
+    @property
+    def diff(self) -> bool:
+        return self.mode == "diff"
+    
+    def describe(self) -> dict:
+        """Paramètres renvoyés au client"""
+        return {"mode": self.mode, "interval_ms": round(self.interval * 1000)}
+    
+    def set_mode(self, mode: Optional[str]):
+        """Change le mode (message config du client)"""
+        self.mode = interim_mode(mode)
+        self.reset()
+    
+    async def push(self, transcript: str, confidence: float):
+        """
+        Nouvelle transcription intermédiaire
+        
+        Args:
+            transcript: Texte courant de l'utterance
+            confidence: Confiance Deepgram
+        """
+        if self._pending is not None:
+            _coalesced.inc()
+        self._pending = (transcript, confidence)
+        
+        if self._timer is not None:
+            # Envoi déjà prévu en fin d'intervalle : il partira avec ce texte
+            return
+        
+        delay = self._last_sent_at + self.interval - asyncio.get_running_loop().time()
+        if delay > 0:
+            self._timer = asyncio.create_task(self._flush_later(delay))
+            return
+        
+        await self._flush()
+    
+    def reset(self):
+        """Résultat final reçu : l'intermédiaire en attente est périmé"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        self._pending = None
+        self._sent_text = ""
+    
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._flush()
+    
+    async def _flush(self):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        
+        transcript, confidence = pending
+        if transcript == self._sent_text:
+            _duplicate.inc()
+            return
+        
+        message = {"type": "transcript", "is_final": False, "confidence": confidence}
+        if self.diff:
+            offset = len(os.path.commonprefix([self._sent_text, transcript]))
+            message.update(offset=offset, text=transcript[offset:])
+        else:
+            message["transcript"] = transcript
+        
+        self._sent_text = transcript
+        self._last_sent_at = asyncio.get_running_loop().time()
+        _sent.inc()
+        
+        await self.send(message)
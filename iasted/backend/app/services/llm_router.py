@@ -4,16 +4,43 @@ Route les requêtes vers le LLM optimal selon la complexité et le coût
 """
 
 import logging
-from typing import Literal, Tuple, Optional, Dict, Any
+import time
+from dataclasses import dataclass, field
+from typing import Literal, Tuple, Optional, Dict, Any, AsyncIterator
 from enum import Enum
 import openai
 import anthropic
 import google.generativeai as genai
 
 from app.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import (
+    complexity_classifications_total,
+    llm_first_token_seconds,
+    routing_cache_hits_total,
+    routing_cache_misses_total,
+)
+from app.services.complexity_classifier import get_complexity_classifier
+from app.services.text_normalizer import normalize_text
 
 logger = logging.getLogger(__name__)
 
+_routing_cache: Optional[LRUCache] = None
+_llm_router: Optional["LLMRouter"] = None
+
+
+def get_routing_cache() -> LRUCache:
+    """Retourne le cache des décisions de routage, partagé par les routers du processus"""
+    global _routing_cache
+    
+    if _routing_cache is None:
+        _routing_cache = LRUCache(
+            settings.llm_router_decision_cache_size,
+            ttl=settings.llm_router_decision_cache_ttl
+        )
+    
+    return _routing_cache
+
 
 class LLMProvider(str, Enum):
     """Providers LLM disponibles"""
@@ -29,6 +56,20 @@ class ComplexityLevel(str, Enum):
     COMPLEX = "complex"
 
 
+@dataclass
+class LLMChunk:
+    """
+    Fragment de réponse streamée, identique pour tous les providers
+    
+    Le dernier fragment d'un stream a done=True, un texte vide et les
+    métadonnées (tokens, modèle) dans metadata.
+    """
+    text: str
+    provider: LLMProvider
+    done: bool = False
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
 class LLMRouter:
     """Router intelligent pour dispatcher les requêtes LLM"""
     
@@ -43,6 +84,9 @@ class LLMRouter:
             api_key=settings.anthropic_api_key
         )
         
+        self.classifier = get_complexity_classifier()
+        self.routing_cache = get_routing_cache()
+        
         self.cost_tracker = {
             LLMProvider.GEMINI_FLASH: 0.0,
             LLMProvider.GPT_4O_MINI: 0.0,
@@ -55,6 +99,35 @@ class LLMRouter:
         """
         Classifie la complexité d'une requête
         
+        Le classifieur local répond en quelques microsecondes ; Gemini n'est
+        consulté que si sa confiance est insuffisante et que le repli distant
+        est activé.
+        
+        Args:
+            query: Requête utilisateur
+        
+        Returns:
+            ComplexityLevel: Niveau de complexité détecté
+        """
+        label, confidence = self.classifier.classify(query)
+        complexity = ComplexityLevel(label)
+        
+        if (
+            confidence < settings.llm_router_classifier_min_confidence
+            and settings.llm_router_remote_classifier_fallback
+        ):
+            logger.debug(f"🔄 Confiance locale faible ({confidence:.2f}), classification distante")
+            complexity = await self._classify_remote(query)
+            complexity_classifications_total.labels(source="remote", level=complexity.value).inc()
+            return complexity
+        
+        complexity_classifications_total.labels(source="local", level=complexity.value).inc()
+        return complexity
+    
+    async def _classify_remote(self, query: str) -> ComplexityLevel:
+        """
+        Classifie la complexité d'une requête via Gemini (repli)
+        
         Args:
             query: Requête utilisateur
             
@@ -122,6 +195,72 @@ Réponds UNIQUEMENT avec un mot : simple, medium ou complex"""
             logger.error(f"❌ Erreur route_and_generate: {e}", exc_info=True)
             raise
     
+    async def route_and_stream(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        force_provider: Optional[LLMProvider] = None
+    ) -> AsyncIterator[LLMChunk]:
+        """
+        Route vers le LLM optimal et streame la réponse au fil de la génération
+        
+        Les étapes suivantes (segmentation, TTS) peuvent démarrer dès la
+        première phrase au lieu d'attendre le dernier token.
+        
+        Args:
+            query: Requête utilisateur
+            context: Contexte de conversation (historique, profil, etc.)
+            force_provider: Forcer un provider spécifique (optionnel)
+        
+        Yields:
+            LLMChunk: Deltas de texte, puis un fragment final done=True
+        """
+        if force_provider:
+            provider = force_provider
+        else:
+            provider = await self._select_provider(query, context)
+        
+        logger.info(f"🤖 Streaming via {provider.value} pour: {query[:50]}...")
+        
+        system_prompt = self._build_system_prompt(context)
+        
+        if provider == LLMProvider.GEMINI_FLASH:
+            stream = self._stream_gemini(system_prompt, query)
+        elif provider == LLMProvider.GPT_4O_MINI:
+            stream = self._stream_openai(system_prompt, query)
+        elif provider == LLMProvider.CLAUDE_HAIKU:
+            stream = self._stream_claude(system_prompt, query)
+        else:
+            raise ValueError(f"Provider inconnu: {provider}")
+        
+        start = time.perf_counter()
+        first = True
+        
+        try:
+            async for text, metadata in stream:
+                if metadata is not None:
+                    self._track_cost(provider, metadata.get("tokens", 0))
+                    yield LLMChunk("", provider, done=True, metadata=metadata)
+                    continue
+                
+                if not text:
+                    continue
+                
+                if first:
+                    llm_first_token_seconds.labels(provider=provider.value).observe(
+                        time.perf_counter() - start
+                    )
+                    first = False
+                
+                yield LLMChunk(text, provider)
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur route_and_stream ({provider.value}): {e}", exc_info=True)
+            raise
+        
+        finally:
+            await stream.aclose()
+    
     async def _select_provider(
         self,
         query: str,
@@ -130,9 +269,36 @@ Réponds UNIQUEMENT avec un mot : simple, medium ou complex"""
         """
         Sélectionne le provider optimal selon complexité et coût
         
+        Les décisions sont mémoïsées par requête normalisée : une question
+        récurrente n'est pas reclassifiée.
+        
         Args:
             query: Requête utilisateur
             context: Contexte
+        
+        Returns:
+            LLMProvider: Provider sélectionné
+        """
+        key = normalize_text(query)
+        
+        provider = self.routing_cache.get(key)
+        if provider is not None:
+            routing_cache_hits_total.inc()
+            return provider
+        
+        routing_cache_misses_total.inc()
+        
+        provider = await self._decide_provider(query)
+        self.routing_cache.set(key, provider)
+        
+        return provider
+    
+    async def _decide_provider(self, query: str) -> LLMProvider:
+        """
+        Calcule la décision de routage (mots-clés, longueur, complexité)
+        
+        Args:
+            query: Requête utilisateur
             
         Returns:
             LLMProvider: Provider sélectionné
@@ -188,7 +354,11 @@ Réponds UNIQUEMENT avec un mot : simple, medium ou complex"""
         user_role = context.get("user_role", "user")
         last_turns = context.get("last_turns", [])
         
-        prompt = f"""Tu es iAsted, assistant vocal intelligent de la plateforme anti-corruption Ndjobi au Gabon.
+        intro = (
+            "Tu es iAsted, assistant vocal intelligent de la plateforme "
+            "anti-corruption Ndjobi au Gabon."
+        )
+        prompt = f"""{intro}
 
 Contexte utilisateur :
 - Rôle : {user_role}
@@ -305,6 +475,88 @@ Directives :
             logger.error(f"❌ Erreur Claude: {e}")
             raise
     
+    async def _stream_gemini(
+        self,
+        system_prompt: str,
+        query: str
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Streaming Gemini : (delta, None)... puis ("", métadonnées)"""
+        full_prompt = f"{system_prompt}\n\nRequête: {query}"
+        
+        response = await self.gemini.generate_content_async(full_prompt, stream=True)
+        
+        words = 0
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunk sans partie texte (fin de génération, filtre de sécurité)
+                continue
+            words += len(text.split())
+            yield text, None
+        
+        usage = getattr(response, "usage_metadata", None)
+        tokens = getattr(usage, "total_token_count", 0) or words * 1.3
+        
+        yield "", {"tokens": tokens, "model": settings.gemini_model}
+    
+    async def _stream_openai(
+        self,
+        system_prompt: str,
+        query: str
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Streaming OpenAI : (delta, None)... puis ("", métadonnées)"""
+        stream = await self.openai_client.chat.completions.create(
+            model=settings.openai_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": query}
+            ],
+            temperature=0.7,
+            max_tokens=1024,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        tokens = 0
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content, None
+                
+                # Dernier chunk (include_usage) : pas de choices, usage renseigné
+                if chunk.usage:
+                    tokens = chunk.usage.total_tokens
+        finally:
+            # Stream interrompu (barge-in) : la connexion HTTP est libérée tout de suite
+            await stream.close()
+        
+        yield "", {"tokens": tokens, "model": settings.openai_model}
+    
+    async def _stream_claude(
+        self,
+        system_prompt: str,
+        query: str
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Streaming Claude : (delta, None)... puis ("", métadonnées)"""
+        async with self.anthropic_client.messages.stream(
+            model=settings.anthropic_model,
+            max_tokens=1024,
+            system=system_prompt,
+            messages=[
+                {"role": "user", "content": query}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text, None
+            
+            message = await stream.get_final_message()
+        
+        yield "", {
+            "tokens": message.usage.input_tokens + message.usage.output_tokens,
+            "model": settings.anthropic_model
+        }
+    
     def _track_cost(self, provider: LLMProvider, tokens: int):
         """Track les coûts par provider"""
         cost_per_1m = {
@@ -319,4 +571,20 @@ Directives :
     def get_cost_stats(self) -> Dict[str, float]:
         """Retourne les statistiques de coûts"""
         return dict(self.cost_tracker)
+    
+    async def aclose(self):
+        """Ferme les pools de connexions HTTP des clients OpenAI et Anthropic"""
+        await self.openai_client.close()
+        await self.anthropic_client.close()
+        logger.info("🔌 Clients LLM fermés")
+
+
+def get_llm_router() -> LLMRouter:
+    """Retourne le router LLM partagé par le processus (clients et pools HTTP uniques)"""
+    global _llm_router
+    
+    if _llm_router is None:
+        _llm_router = LLMRouter()
+    
+    return _llm_router
 
@@ -3,76 +3,538 @@ Service de cache sémantique avec Redis
 Utilise des embeddings pour trouver des réponses similaires et éviter les appels LLM redondants
 """
 
+import asyncio
 import logging
-import hashlib
 import json
-from typing import Optional, List, Tuple
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from redis.asyncio import Redis
 
 from app.config import settings
-from app.core.redis_client import get_redis_client
+from app.core.auth import ROLE_PERMISSIONS
+from app.core.metrics import cache_hits_total, cache_misses_total
+from app.core.redis_client import get_redis_client, get_redis_binary_client
+from app.services.embedding_service import get_embedding_service
+from app.services.text_normalizer import text_hash
+from app.services.vector_index import (
+    EMBEDDING_DTYPES,
+    create_vector_index,
+    pack_embedding,
+    unpack_embedding,
+)
 
 logger = logging.getLogger(__name__)
 
+_semantic_cache: Optional["SemanticCache"] = None
+
+
+@dataclass
+class CacheHit:
+    """Résultat d'un lookup réussi"""
+    
+    key: str
+    response: str
+    score: float
+    tier: str
+    audio: Optional[bytes] = None
+
 
 class SemanticCache:
-    """Cache sémantique avec similarité vectorielle"""
+    """
+    Cache sémantique avec similarité vectorielle
+    
+    Les entrées sont partitionnées par rôle et organisation : une requête ne
+    cherche que dans sa propre partition, ce qui évite de servir une réponse
+    admin à un simple utilisateur et borne la taille de chaque recherche.
+    
+    Une question identique (après normalisation) est servie directement par
+    sa clé, sans passer par l'encodeur.
+    
+    Chaque partition a un budget (entrées et octets) : au-delà, les entrées
+    les moins utiles selon la politique d'éviction (LFU, LRU ou TTL) sont
+    supprimées.
+    """
+    
+    INDEX_PREFIX = "semantic_cache:index:"
+    PARTITIONS_KEY = "semantic_cache:partitions"
+    USER_PREFIX = "semantic_cache:user:"
+    VECTOR_PREFIX = "semantic_cache:vec:"
+    RANK_PREFIX = "semantic_cache:rank:"
+    SIZES_PREFIX = "semantic_cache:sizes:"
+    STATS_KEY = "semantic_cache:stats"
+    EVICTION_POLICIES = ("lfu", "lru", "ttl")
+    EVICTION_BATCH = 64
+    PRUNE_BATCH = 1000
+    SEARCH_K = 3
+    DEFAULT_ROLE = "user"
+    DEFAULT_ORGANIZATION = "default"
     
     def __init__(self):
         """Initialise le cache sémantique"""
         self.redis: Redis = None
-        self.encoder = SentenceTransformer(
-            'sentence-transformers/paraphrase-multilingual-mpnet-base-v2'
-        )
+        self.redis_binary: Redis = None
+        self.embeddings = get_embedding_service()
         self.similarity_threshold = settings.semantic_cache_threshold
         self.cache_ttl = settings.semantic_cache_ttl
         self.enabled = settings.semantic_cache_enabled
+        self.sync_interval = settings.semantic_cache_index_sync_interval
+        self.partition_max_entries = settings.semantic_cache_partition_max_entries
+        self.partition_max_bytes = settings.semantic_cache_partition_max_bytes
+        self.eviction_policy = settings.semantic_cache_eviction_policy
+        self.embedding_dtype = settings.semantic_cache_embedding_dtype
+        
+        if self.embedding_dtype not in EMBEDDING_DTYPES:
+            logger.warning(
+                f"⚠️ Format d'embedding inconnu '{self.embedding_dtype}', défaut=float32"
+            )
+            self.embedding_dtype = "float32"
+        
+        if self.eviction_policy not in self.EVICTION_POLICIES:
+            logger.warning(f"⚠️ Politique d'éviction inconnue '{self.eviction_policy}', défaut=lfu")
+            self.eviction_policy = "lfu"
+        
+        if settings.semantic_cache_index_backend == "redisearch":
+            # RediSearch indexe directement les hashes vecteurs : FLOAT32 obligatoire
+            self.embedding_dtype = "float32"
+        
+        self.indexes: Dict[str, object] = {}
+        self._last_sync = 0.0
+        self._sync_task: Optional[asyncio.Task] = None
         
         logger.info(f"✅ Cache sémantique initialisé (seuil={self.similarity_threshold})")
     
     async def initialize(self):
-        """Initialise la connexion Redis"""
+        """Initialise les connexions Redis"""
         if not self.redis:
             self.redis = await get_redis_client()
+            self.redis_binary = await get_redis_binary_client()
     
-    def _get_embedding(self, text: str) -> List[float]:
+    async def _get_embedding(self, text: str) -> np.ndarray:
         """
-        Génère l'embedding vectoriel d'un texte
+        Génère l'embedding vectoriel normalisé d'un texte
+        
+        L'encodage est délégué au service d'embeddings (mémoïsation, pool de
+        threads, micro-batching) pour ne pas bloquer la boucle d'événements :
+        get() puis set() sur la même requête n'encodent qu'une fois.
         
         Args:
             text: Texte à encoder
-            
+        
         Returns:
-            List[float]: Vecteur d'embedding
+            np.ndarray: Vecteur float32 unitaire
+        """
+        return await self.embeddings.embed(text)
+    
+    def _partition(self, user_context: Optional[dict]) -> str:
+        """
+        Détermine la partition (rôle:organisation) d'une requête
+        
+        Les rôles inconnus sont ramenés au rôle le moins privilégié.
+        L'organisation est réduite à un slug Unicode : les lettres accentuées
+        sont conservées ("Société" et "Societe" restent distinctes).
+        
+        Args:
+            user_context: Contexte utilisateur (role/user_role, organization)
+        
+        Returns:
+            str: Identifiant de partition
+        """
+        user_context = user_context or {}
+        
+        role = user_context.get("role") or user_context.get("user_role")
+        if role not in ROLE_PERMISSIONS:
+            role = self.DEFAULT_ROLE
+        
+        organization = str(user_context.get("organization") or self.DEFAULT_ORGANIZATION)
+        organization = unicodedata.normalize("NFKC", organization).casefold()
+        organization = re.sub(r"[^\w-]+", "_", organization).strip("_")
+        
+        return f"{role}:{organization or self.DEFAULT_ORGANIZATION}"
+    
+    def _partition_of(self, cache_key: str) -> str:
+        """Retrouve la partition d'une clé cache:{rôle}:{organisation}:{hash}"""
+        return cache_key.split(":", 1)[1].rsplit(":", 1)[0]
+    
+    def _index_key(self, partition: str) -> str:
+        """Sorted set des entrées d'une partition (score = expiration)"""
+        return f"{self.INDEX_PREFIX}{partition}"
+    
+    def _cache_key(self, partition: str, query: str) -> str:
+        """Clé d'entrée : hash du texte normalisé (sert aussi au tier exact)"""
+        return f"cache:{partition}:{text_hash(query)}"
+    
+    def _vector_key(self, cache_key: str) -> str:
+        """
+        Clé du hash contenant l'embedding binaire d'une entrée
+        
+        L'empreinte du modèle fait partie de la clé : après un changement de
+        modèle, les anciens vecteurs (incomparables, voire d'une autre
+        dimension) restent hors du préfixe indexé jusqu'à leur expiration.
+        """
+        return f"{self.VECTOR_PREFIX}{self.embeddings.model_fingerprint}:{cache_key}"
+    
+    def _user_key(self, user_id: str) -> str:
+        """Sorted set des entrées d'un utilisateur (score = expiration)"""
+        return f"{self.USER_PREFIX}{user_id}"
+    
+    def _rank_key(self, partition: str) -> str:
+        """
+        Sorted set d'éviction d'une partition (plus petit score = évincé en premier)
+        
+        LFU: nombre d'accès, LRU: date du dernier accès, TTL: expiration
+        (l'index de la partition sert alors directement).
+        """
+        if self.eviction_policy == "ttl":
+            return self._index_key(partition)
+        return f"{self.RANK_PREFIX}{partition}"
+    
+    def _sizes_key(self, partition: str) -> str:
+        """Hash clé → taille (octets) des entrées d'une partition"""
+        return f"{self.SIZES_PREFIX}{partition}"
+    
+    @staticmethod
+    def _audio_field(audio_format: str) -> str:
+        """Champ de l'audio pré-synthétisé d'une entrée (un par format de sortie)"""
+        return "audio" if audio_format == "mp3" else f"audio:{audio_format}"
+    
+    def _stat_field(self, partition: str, counter: str) -> str:
+        """
+        Champ d'un compteur dans le hash de statistiques
+        
+        Tous les compteurs (toutes partitions) vivent dans un seul hash : les
+        statistiques complètes se lisent en un HGETALL, quelle que soit la
+        taille du cache.
+        """
+        return f"{partition}|{counter}"
+    
+    async def _get_index(self, partition: str):
+        """
+        Retourne l'index vectoriel d'une partition (chargé à la première utilisation)
+        
+        Args:
+            partition: Identifiant de partition
+        
+        Returns:
+            Index vectoriel de la partition
+        """
+        index = self.indexes.get(partition)
+        
+        if index is None:
+            fingerprint = self.embeddings.model_fingerprint
+            index = create_vector_index(
+                settings.semantic_cache_index_backend,
+                self.redis,
+                await self.embeddings.get_dimension(),
+                ef_search=settings.semantic_cache_hnsw_ef_search,
+                name=f"semantic_cache:{fingerprint}:{partition}",
+                prefix=self._vector_key(f"cache:{partition}:")
+            )
+            self.indexes[partition] = index
+            
+            if index.in_process:
+                await self._sync_partition(partition, index)
+        
+        return index
+    
+    def _schedule_sync(self):
+        """Planifie une resynchronisation des index en arrière-plan si nécessaire"""
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        
+        if self._sync_task and not self._sync_task.done():
+            return
+        
+        self._last_sync = time.monotonic()
+        self._sync_task = asyncio.create_task(self._sync_index())
+    
+    async def _sync_index(self):
+        """
+        Élague les entrées expirées de toutes les partitions connues, puis
+        synchronise les index en mémoire de ce pod
+        
+        L'élagage parcourt PARTITIONS_KEY : une partition que ce pod n'a jamais
+        chargée est élaguée aussi (sinon ses compteurs ne redescendent jamais).
         """
-        embedding = self.encoder.encode(text)
-        return embedding.tolist()
+        try:
+            partitions = set(await self.redis.smembers(self.PARTITIONS_KEY))
+        except Exception as e:
+            logger.error(f"❌ Erreur lecture des partitions du cache: {e}", exc_info=True)
+            partitions = set()
+        
+        for partition in sorted(partitions | set(self.indexes)):
+            await self._prune_expired(partition)
+        
+        for partition, index in list(self.indexes.items()):
+            if index.in_process:
+                await self._sync_partition(partition, index)
     
-    def _compute_similarity(self, emb1: List[float], emb2: List[float]) -> float:
+    async def _prune_expired(self, partition: str):
         """
-        Calcule la similarité cosine entre deux embeddings
+        Retire des structures de la partition les entrées expirées par TTL
+        
+        Les hashes ont déjà disparu ; seuls l'index, le classement d'éviction et
+        la comptabilité des tailles doivent être mis à jour.
         
         Args:
-            emb1: Premier embedding
-            emb2: Deuxième embedding
+            partition: Identifiant de partition
+        """
+        try:
+            now = time.time()
+            expired = await self.redis.zrangebyscore(
+                self._index_key(partition),
+                "-inf",
+                now,
+                start=0,
+                num=self.PRUNE_BATCH
+            )
+            await self._delete_entries(expired, expired_before=now)
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur élagage partition {partition}: {e}", exc_info=True)
+    
+    async def _sync_partition(self, partition: str, index):
+        """
+        Synchronise l'index en mémoire d'une partition avec Redis
+        
+        Le sorted set de la partition référence toutes ses entrées (score =
+        expiration), ce qui permet d'élaguer les entrées expirées et de récupérer
+        celles ajoutées par les autres pods sans SCAN du keyspace.
+        
+        Args:
+            partition: Identifiant de partition
+            index: Index en mémoire de la partition
+        """
+        index_key = self._index_key(partition)
+        
+        try:
+            members = set(await self.redis.zrangebyscore(index_key, time.time(), "+inf"))
+            
+            indexed = index.keys()
             
+            stale = indexed - members
+            if stale:
+                await index.remove(*stale)
+            
+            missing = list(members - indexed)
+            for start in range(0, len(missing), 500):
+                batch = missing[start:start + 500]
+                
+                async with self.redis_binary.pipeline(transaction=False) as pipe:
+                    for key in batch:
+                        pipe.hmget(self._vector_key(key), "embedding", "dtype", "model")
+                    values = await pipe.execute()
+                
+                for key, (packed, dtype, model) in zip(batch, values):
+                    # Vecteurs d'un autre modèle : incomparables, ignorés jusqu'à expiration
+                    if packed and (model or b"").decode() == self.embeddings.model_fingerprint:
+                        embedding = unpack_embedding(packed, (dtype or b"float32").decode())
+                        await index.add(key, embedding)
+            
+            logger.debug(
+                f"🔄 Index sémantique {partition} synchronisé: {len(index)} entrées "
+                f"(+{len(missing)}, -{len(stale)})"
+            )
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur synchronisation index {partition}: {e}", exc_info=True)
+    
+    async def _delete_entries(
+        self,
+        cache_keys: List[str],
+        expired_before: Optional[float] = None
+    ) -> int:
+        """
+        Supprime des entrées (hash réponse, vecteur, références, comptabilité)
+        
+        Les tailles sont lues sous WATCH et les compteurs décrémentés dans la
+        même transaction que les suppressions : une écriture ou suppression
+        concurrente dans la partition fait rejouer la transaction, les
+        compteurs ne dérivent pas.
+        
+        Args:
+            cache_keys: Clés cache:{partition}:{hash}
+            expired_before: Ne supprime que les entrées dont l'expiration
+                indexée est antérieure (élagage : une entrée réécrite entre-temps
+                est conservée)
+        
         Returns:
-            float: Score de similarité (0-1)
+            int: Nombre d'entrées effectivement retirées
+        """
+        if not cache_keys:
+            return 0
+        
+        by_partition: Dict[str, List[str]] = {}
+        for key in cache_keys:
+            by_partition.setdefault(self._partition_of(key), []).append(key)
+        
+        # Propriétaires hors transaction : l'index utilisateur ne sert qu'à l'effacement
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in cache_keys:
+                pipe.hmget(key, "user_ids", "user_id")
+            owners = {
+                key: self._owners(*fields)
+                for key, fields in zip(cache_keys, await pipe.execute())
+            }
+        
+        async def delete(pipe) -> Dict[str, int]:
+            selected: Dict[str, List[str]] = {}
+            sizes: Dict[str, List[Optional[str]]] = {}
+            
+            for partition, keys in by_partition.items():
+                if expired_before is not None:
+                    scores = await pipe.zmscore(self._index_key(partition), keys)
+                    keys = [
+                        key for key, score in zip(keys, scores)
+                        if score is None or score <= expired_before
+                    ]
+                if keys:
+                    selected[partition] = keys
+                    sizes[partition] = await pipe.hmget(self._sizes_key(partition), keys)
+            
+            pipe.multi()
+            removed: Dict[str, int] = {}
+            
+            for partition, keys in selected.items():
+                pipe.delete(*keys, *(self._vector_key(key) for key in keys))
+                pipe.zrem(self._index_key(partition), *keys)
+                pipe.zrem(self._rank_key(partition), *keys)
+                pipe.hdel(self._sizes_key(partition), *keys)
+                
+                # Seules les entrées encore comptabilisées sont décomptées
+                counted = [int(size) for size in sizes[partition] if size is not None]
+                if counted:
+                    removed[partition] = len(counted)
+                    pipe.hincrby(
+                        self.STATS_KEY,
+                        self._stat_field(partition, "entries"),
+                        -len(counted)
+                    )
+                    pipe.hincrby(
+                        self.STATS_KEY,
+                        self._stat_field(partition, "bytes"),
+                        -sum(counted)
+                    )
+                
+                for key in keys:
+                    for user_id in owners.get(key, ()):
+                        pipe.zrem(self._user_key(user_id), key)
+            
+            return removed
+        
+        removed = await self.redis.transaction(
+            delete,
+            *(self._sizes_key(partition) for partition in by_partition),
+            value_from_callable=True
+        )
+        
+        for partition, keys in by_partition.items():
+            index = self.indexes.get(partition)
+            if index is not None:
+                await index.remove(*keys)
+        
+        return sum(removed.values())
+    
+    async def _enforce_partition_limit(self, partition: str, protect: Optional[str] = None):
         """
-        vec1 = np.array(emb1)
-        vec2 = np.array(emb2)
+        Applique le budget d'une partition (entrées et octets) en évinçant les
+        entrées les moins bien classées selon la politique d'éviction
+        
+        Au-delà du budget d'octets, seules les entrées nécessaires pour repasser
+        sous la limite sont évincées.
+        
+        Args:
+            partition: Identifiant de partition
+            protect: Entrée qui vient d'être écrite (jamais évincée par cet appel)
+        """
+        sizes_key = self._sizes_key(partition)
+        rank_key = self._rank_key(partition)
+        evicted_total = 0
+        
+        while True:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hlen(sizes_key)
+                pipe.hget(self.STATS_KEY, self._stat_field(partition, "bytes"))
+                entries, used_bytes = await pipe.execute()
+            
+            # Budget à 0 : illimité (cf. env.template)
+            overflow = 0
+            if self.partition_max_entries > 0:
+                overflow = max(entries - self.partition_max_entries, 0)
+            excess_bytes = 0
+            if self.partition_max_bytes:
+                excess_bytes = int(used_bytes or 0) - self.partition_max_bytes
+            
+            if not overflow and excess_bytes <= 0:
+                break
+            
+            count = overflow if excess_bytes <= 0 else max(overflow, self.EVICTION_BATCH)
+            # Un candidat de plus : l'entrée protégée peut figurer parmi eux. Sans
+            # cette protection, une entrée LFU neuve (score 1) serait évincée par
+            # sa propre écriture
+            candidates = [
+                key for key in await self.redis.zrange(rank_key, 0, count)
+                if key != protect
+            ][:count]
+            
+            if excess_bytes > 0 and candidates:
+                freed = 0
+                for position, size in enumerate(await self.redis.hmget(sizes_key, candidates)):
+                    freed += int(size or 0)
+                    if position + 1 >= overflow and freed >= excess_bytes:
+                        candidates = candidates[:position + 1]
+                        break
+            
+            if not candidates:
+                break
+            
+            removed = await self._delete_entries(candidates)
+            if removed:
+                await self.redis.hincrby(
+                    self.STATS_KEY,
+                    self._stat_field(partition, "evictions"),
+                    removed
+                )
+            evicted_total += removed
         
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+        if evicted_total:
+            logger.debug(
+                f"♻️ Partition {partition} pleine: {evicted_total} entrées évincées "
+                f"({self.eviction_policy})"
+            )
+    
+    async def _record_lookup(
+        self,
+        partition: str,
+        tier: Optional[str],
+        cache_key: Optional[str] = None
+    ):
+        """
+        Comptabilise un lookup (hit par tier ou miss) et met à jour le
+        classement d'éviction de l'entrée servie, en un seul aller-retour
         
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        Args:
+            partition: Identifiant de partition
+            tier: "exact", "semantic" ou None (miss)
+            cache_key: Clé de l'entrée servie (hit)
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                if tier is None:
+                    pipe.hincrby(self.STATS_KEY, self._stat_field(partition, "misses"), 1)
+                else:
+                    pipe.hincrby(self.STATS_KEY, self._stat_field(partition, f"hits_{tier}"), 1)
+                    if self.eviction_policy == "lfu":
+                        pipe.zadd(self._rank_key(partition), {cache_key: 1}, xx=True, incr=True)
+                    elif self.eviction_policy == "lru":
+                        pipe.zadd(self._rank_key(partition), {cache_key: time.time()}, xx=True)
+                await pipe.execute()
         
-        similarity = dot_product / (norm1 * norm2)
-        return float(similarity)
+        except Exception as e:
+            logger.warning(f"⚠️ Mise à jour statistiques du cache échouée: {e}")
     
     async def get(self, query: str, user_context: dict = None) -> Optional[Tuple[str, float]]:
         """
@@ -80,64 +542,125 @@ class SemanticCache:
         
         Args:
             query: Requête utilisateur
-            user_context: Contexte utilisateur (rôle, etc.)
-            
+            user_context: Contexte utilisateur (rôle, organisation)
+        
         Returns:
             Optional[Tuple[str, float]]: (réponse, score_similarité) ou None
         """
+        hit = await self.lookup(query, user_context)
+        
+        if hit is None:
+            return None
+        
+        return hit.response, hit.score
+    
+    async def lookup(
+        self,
+        query: str,
+        user_context: dict = None,
+        with_audio: bool = False,
+        audio_format: str = "mp3"
+    ) -> Optional[CacheHit]:
+        """
+        Cherche une réponse cachée (tier exact puis sémantique)
+        
+        Args:
+            query: Requête utilisateur
+            user_context: Contexte utilisateur (rôle, organisation)
+            with_audio: Lit aussi l'audio pré-synthétisé de l'entrée
+            audio_format: Format de l'audio à lire
+        
+        Returns:
+            Optional[CacheHit]: Entrée trouvée ou None
+        """
         if not self.enabled:
             return None
         
         await self.initialize()
         
         try:
-            query_embedding = self._get_embedding(query)
+            partition = self._partition(user_context)
             
-            cache_keys = []
-            async for key in self.redis.scan_iter(match="cache:*", count=100):
-                cache_keys.append(key)
+            # Tier exact : même question normalisée, un seul aller-retour Redis
+            cache_key = self._cache_key(partition, query)
+            hit = await self._read_entry(cache_key, with_audio, audio_format)
             
-            best_match = None
-            best_score = 0.0
+            if hit is not None:
+                response, audio = hit
+                await self._record_lookup(partition, "exact", cache_key)
+                cache_hits_total.labels(tier="exact").inc()
+                logger.info(f"✅ Cache hit exact [{partition}]")
+                return CacheHit(cache_key, response, 1.0, "exact", audio)
             
-            for key in cache_keys:
-                cached_data = await self.redis.get(key)
-                if not cached_data:
-                    continue
+            cache_misses_total.labels(tier="exact").inc()
+            
+            index = await self._get_index(partition)
+            
+            self._schedule_sync()
+            
+            query_embedding = await self._get_embedding(query)
+            
+            candidates = await index.search(query_embedding, k=self.SEARCH_K)
+            
+            best_score = candidates[0][1] if candidates else 0.0
+            
+            for cache_key, score in candidates:
+                if score < self.similarity_threshold:
+                    break
                 
-                try:
-                    cache_entry = json.loads(cached_data)
-                    cached_embedding = cache_entry.get("embedding")
-                    
-                    if not cached_embedding:
-                        continue
-                    
-                    similarity = self._compute_similarity(query_embedding, cached_embedding)
-                    
-                    if similarity > best_score:
-                        best_score = similarity
-                        best_match = cache_entry.get("response")
+                # Seule la réponse du candidat retenu est lue
+                hit = await self._read_entry(cache_key, with_audio, audio_format)
                 
-                except json.JSONDecodeError:
+                if hit is None:
+                    # Entrée expirée depuis la dernière synchronisation : candidat suivant
+                    await index.remove(cache_key)
                     continue
+                
+                response, audio = hit
+                await self._record_lookup(partition, "semantic", cache_key)
+                cache_hits_total.labels(tier="semantic").inc()
+                logger.info(f"✅ Cache hit [{partition}]! Similarité: {score:.3f}")
+                return CacheHit(cache_key, response, score, "semantic", audio)
             
-            if best_match and best_score >= self.similarity_threshold:
-                logger.info(f"✅ Cache hit! Similarité: {best_score:.3f}")
-                return best_match, best_score
-            
-            logger.debug(f"❌ Cache miss. Meilleur score: {best_score:.3f}")
+            await self._record_lookup(partition, None)
+            cache_misses_total.labels(tier="semantic").inc()
+            logger.debug(f"❌ Cache miss [{partition}]. Meilleur score: {best_score:.3f}")
             return None
-            
+        
         except Exception as e:
             logger.error(f"❌ Erreur cache sémantique get: {e}", exc_info=True)
             return None
     
+    async def _read_entry(
+        self,
+        cache_key: str,
+        with_audio: bool,
+        audio_format: str = "mp3"
+    ) -> Optional[Tuple[str, Optional[bytes]]]:
+        """Lit la réponse (et éventuellement l'audio) d'une entrée"""
+        if not with_audio:
+            response = await self.redis.hget(cache_key, "response")
+            return (response, None) if response is not None else None
+        
+        response, audio = await self.redis_binary.hmget(
+            cache_key,
+            "response",
+            self._audio_field(audio_format)
+        )
+        
+        if response is None:
+            return None
+        
+        return response.decode("utf-8"), audio
+    
     async def set(
         self,
         query: str,
         response: str,
         user_context: dict = None,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        audio: Optional[bytes] = None,
+        audio_format: str = "mp3"
     ):
         """
         Cache une paire requête/réponse avec embedding
@@ -145,8 +668,10 @@ class SemanticCache:
         Args:
             query: Requête utilisateur
             response: Réponse LLM
-            user_context: Contexte utilisateur
+            user_context: Contexte utilisateur (détermine la partition)
             ttl: Durée de vie (défaut: settings.semantic_cache_ttl)
+            audio: Audio TTS pré-synthétisé de la réponse (même durée de vie)
+            audio_format: Format de l'audio
         """
         if not self.enabled:
             return
@@ -154,34 +679,174 @@ class SemanticCache:
         await self.initialize()
         
         try:
-            query_embedding = self._get_embedding(query)
+            partition = self._partition(user_context)
+            index = await self._get_index(partition)
+            
+            query_embedding = await self._get_embedding(query)
             
-            cache_key = f"cache:{hashlib.md5(query.encode()).hexdigest()}"
+            cache_key = self._cache_key(partition, query)
+            
+            user_id = (user_context or {}).get("user_id")
             
             cache_entry = {
                 "query": query,
                 "response": response,
-                "embedding": query_embedding,
-                "user_context": user_context or {},
+                "user_context": json.dumps(user_context or {}),
                 "timestamp": str(np.datetime64('now'))
             }
+            if audio:
+                cache_entry[self._audio_field(audio_format)] = audio
             
             ttl = ttl or self.cache_ttl
+            expires_at = time.time() + ttl
+            vector_key = self._vector_key(cache_key)
+            vector_entry = {
+                "key": cache_key,
+                "embedding": pack_embedding(query_embedding, self.embedding_dtype),
+                "dtype": self.embedding_dtype,
+                "model": self.embeddings.model_fingerprint
+            }
+            vector_size = self._entry_size(vector_entry)
             
-            await self.redis.setex(
-                cache_key,
-                ttl,
-                json.dumps(cache_entry)
-            )
+            sizes_key = self._sizes_key(partition)
             
-            logger.debug(f"✅ Réponse cachée: {query[:50]}... (TTL={ttl}s)")
+            async def write(pipe):
+                # Taille précédente lue sous WATCH : comptabilité exacte même si
+                # la même question est cachée au même moment par un autre pod
+                previous_size = await pipe.hget(sizes_key, cache_key)
+                # Même question posée par plusieurs utilisateurs : tous restent
+                # propriétaires (l'effacement de l'un retire l'entrée de tous les index)
+                owners = self._owners(*await pipe.hmget(cache_key, "user_ids", "user_id"))
+                if user_id:
+                    owners.add(user_id)
+                
+                entry = dict(cache_entry)
+                if owners:
+                    entry["user_ids"] = json.dumps(sorted(owners))
+                size = self._entry_size(entry) + vector_size
+                
+                pipe.multi()
+                # Réécriture : l'audio de l'ancienne réponse ne lui correspond plus
+                pipe.delete(cache_key)
+                pipe.hset(cache_key, mapping=entry)
+                pipe.expire(cache_key, ttl)
+                pipe.hset(vector_key, mapping=vector_entry)
+                pipe.expire(vector_key, ttl)
+                pipe.zadd(self._index_key(partition), {cache_key: expires_at})
+                pipe.sadd(self.PARTITIONS_KEY, partition)
+                pipe.hset(sizes_key, cache_key, size)
+                pipe.hincrby(
+                    self.STATS_KEY,
+                    self._stat_field(partition, "bytes"),
+                    size - int(previous_size or 0)
+                )
+                if previous_size is None:
+                    pipe.hincrby(self.STATS_KEY, self._stat_field(partition, "entries"), 1)
+                if self.eviction_policy == "lfu":
+                    # Réécriture d'une entrée existante : son compteur d'accès est conservé
+                    pipe.zadd(self._rank_key(partition), {cache_key: 1}, nx=True)
+                elif self.eviction_policy == "lru":
+                    pipe.zadd(self._rank_key(partition), {cache_key: time.time()})
+                if user_id:
+                    # Index secondaire : vit aussi longtemps que sa dernière entrée
+                    user_key = self._user_key(user_id)
+                    pipe.zadd(user_key, {cache_key: expires_at})
+                    pipe.expire(user_key, ttl, nx=True)
+                    pipe.expire(user_key, ttl, gt=True)
+            
+            await self.redis_binary.transaction(write, sizes_key)
+            
+            await index.add(cache_key, query_embedding, ttl)
+            await self._enforce_partition_limit(partition, protect=cache_key)
             
+            logger.debug(f"✅ Réponse cachée [{partition}]: {query[:50]}... (TTL={ttl}s)")
+        
         except Exception as e:
             logger.error(f"❌ Erreur cache sémantique set: {e}", exc_info=True)
     
+    @staticmethod
+    def _owners(user_ids, legacy_user_id=None) -> set:
+        """
+        Utilisateurs propriétaires d'une entrée
+        
+        Args:
+            user_ids: Champ user_ids (liste JSON)
+            legacy_user_id: Champ user_id des entrées écrites avant user_ids
+        
+        Returns:
+            set: IDs utilisateur (str)
+        """
+        owners = set(json.loads(user_ids)) if user_ids else set()
+        if isinstance(legacy_user_id, bytes):
+            legacy_user_id = legacy_user_id.decode()
+        if legacy_user_id:
+            owners.add(legacy_user_id)
+        return owners
+    
+    @staticmethod
+    def _entry_size(mapping: dict) -> int:
+        """Taille approximative (octets) des champs d'un hash"""
+        size = 0
+        for field, value in mapping.items():
+            size += len(field)
+            size += len(value) if isinstance(value, bytes) else len(str(value).encode("utf-8"))
+        return size
+    
+    async def set_audio(self, cache_key: str, audio: bytes, audio_format: str = "mp3"):
+        """
+        Attache l'audio pré-synthétisé à une entrée existante
+        
+        L'audio vit dans le hash de l'entrée : il expire et est supprimé avec elle.
+        
+        Args:
+            cache_key: Clé de l'entrée (CacheHit.key)
+            audio: Audio TTS de la réponse
+            audio_format: Format de l'audio
+        """
+        if not self.enabled or not audio:
+            return
+        
+        await self.initialize()
+        
+        try:
+            partition = self._partition_of(cache_key)
+            sizes_key = self._sizes_key(partition)
+            field = self._audio_field(audio_format)
+            size = self._entry_size({field: audio})
+            
+            async def attach(pipe) -> bool:
+                # Entrée expirée ou audio déjà présent : rien à écrire ni à compter
+                missing = not await pipe.exists(cache_key)
+                present = not missing and await pipe.hexists(cache_key, field)
+                
+                pipe.multi()
+                if missing or present:
+                    return False
+                
+                pipe.hset(cache_key, field, audio)
+                pipe.hincrby(sizes_key, cache_key, size)
+                pipe.hincrby(self.STATS_KEY, self._stat_field(partition, "bytes"), size)
+                return True
+            
+            if await self.redis_binary.transaction(
+                attach,
+                cache_key,
+                sizes_key,
+                value_from_callable=True
+            ):
+                await self._enforce_partition_limit(partition, protect=cache_key)
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur cache sémantique set_audio: {e}", exc_info=True)
+    
     async def clear_user_cache(self, user_id: str):
         """
-        Efface le cache d'un utilisateur spécifique
+        Efface le cache d'un utilisateur spécifique (droit à l'effacement CNPDCP)
+        
+        Une entrée partagée (même question normalisée posée par plusieurs
+        utilisateurs de la partition) est supprimée pour tous : elle peut
+        contenir la formulation de l'utilisateur effacé. Elle disparaît aussi
+        de l'index des autres propriétaires, sans référence orpheline.
         
         Args:
             user_id: ID utilisateur
@@ -189,53 +854,125 @@ class SemanticCache:
         await self.initialize()
         
         try:
-            cache_keys = []
-            async for key in self.redis.scan_iter(match="cache:*", count=100):
-                cached_data = await self.redis.get(key)
-                if cached_data:
-                    try:
-                        cache_entry = json.loads(cached_data)
-                        if cache_entry.get("user_context", {}).get("user_id") == user_id:
-                            cache_keys.append(key)
-                    except json.JSONDecodeError:
-                        pass
+            user_key = self._user_key(user_id)
+            cache_keys = await self.redis.zrange(user_key, 0, -1)
+            
+            await self._delete_entries(cache_keys)
+            await self.redis.delete(user_key)
             
             if cache_keys:
-                await self.redis.delete(*cache_keys)
                 logger.info(f"🗑️ Cache effacé pour user {user_id}: {len(cache_keys)} entrées")
-                
+        
         except Exception as e:
             logger.error(f"❌ Erreur clear_user_cache: {e}", exc_info=True)
     
-    async def get_stats(self) -> dict:
+    async def get_user_stats(self, user_id: str) -> dict:
         """
-        Retourne les statistiques du cache
+        Retourne les statistiques de cache d'un utilisateur
+        
+        Args:
+            user_id: ID utilisateur
         
         Returns:
-            dict: Statistiques (nb entrées, taille, etc.)
+            dict: Nombre d'entrées actives et répartition par partition
         """
         await self.initialize()
         
         try:
-            cache_keys = []
-            async for key in self.redis.scan_iter(match="cache:*"):
-                cache_keys.append(key)
+            user_key = self._user_key(user_id)
             
-            total_size = 0
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(user_key, "-inf", time.time())
+                pipe.zrange(user_key, 0, -1)
+                _, cache_keys = await pipe.execute()
+            
+            partitions: Dict[str, int] = {}
             for key in cache_keys:
-                cached_data = await self.redis.get(key)
-                if cached_data:
-                    total_size += len(cached_data)
+                partition = self._partition_of(key)
+                partitions[partition] = partitions.get(partition, 0) + 1
             
             return {
+                "user_id": user_id,
                 "total_entries": len(cache_keys),
-                "total_size_bytes": total_size,
-                "total_size_mb": round(total_size / 1024 / 1024, 2),
-                "threshold": self.similarity_threshold,
-                "enabled": self.enabled
+                "partitions": partitions
             }
+        
+        except Exception as e:
+            logger.error(f"❌ Erreur get_user_stats: {e}", exc_info=True)
+            return {"error": str(e)}
+    
+    async def get_stats(self) -> dict:
+        """
+        Retourne les statistiques du cache
+        
+        Les compteurs sont maintenus au fil des écritures, hits, évictions et
+        expirations : un seul HGETALL, quelle que soit la taille du cache.
+        
+        Returns:
+            dict: Statistiques (nb entrées, taille, hits, détail par partition, etc.)
+        """
+        await self.initialize()
+        
+        try:
+            counters = await self.redis.hgetall(self.STATS_KEY)
+            
+            partition_stats: Dict[str, dict] = {}
+            for field, value in counters.items():
+                partition, counter = field.rsplit("|", 1)
+                stats = partition_stats.setdefault(partition, {
+                    "entries": 0,
+                    "max_entries": self.partition_max_entries,
+                    "bytes": 0,
+                    "max_bytes": self.partition_max_bytes,
+                    "hits_exact": 0,
+                    "hits_semantic": 0,
+                    "misses": 0,
+                    "evictions": 0
+                })
+                stats[counter] = max(int(value), 0)
+            
+            totals = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+            for partition, stats in partition_stats.items():
+                stats["hits"] = stats["hits_exact"] + stats["hits_semantic"]
+                lookups = stats["hits"] + stats["misses"]
+                stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+                
+                index = self.indexes.get(partition)
+                stats["index_entries"] = (
+                    len(index) if index is not None and index.in_process else None
+                )
+                
+                for counter in totals:
+                    totals[counter] += stats[counter]
+            
+            lookups = totals["hits"] + totals["misses"]
             
+            return {
+                "total_entries": totals["entries"],
+                "total_size_bytes": totals["bytes"],
+                "total_size_mb": round(totals["bytes"] / 1024 / 1024, 2),
+                "hits": totals["hits"],
+                "misses": totals["misses"],
+                "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0,
+                "total_evictions": totals["evictions"],
+                "threshold": self.similarity_threshold,
+                "enabled": self.enabled,
+                "embedding_dtype": self.embedding_dtype,
+                "index_backend": settings.semantic_cache_index_backend,
+                "eviction_policy": self.eviction_policy,
+                "partitions": dict(sorted(partition_stats.items()))
+            }
+        
         except Exception as e:
             logger.error(f"❌ Erreur get_stats: {e}", exc_info=True)
             return {"error": str(e)}
 
+
+def get_semantic_cache() -> SemanticCache:
+    """Retourne le cache sémantique partagé par le processus"""
+    global _semantic_cache
+    
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache()
+    
+    return _semantic_cache
@@ -0,0 +1,131 @@
+"""
+Segmentation incrémentale du texte streamé par le LLM
+Découpe aux frontières de phrase (ou de proposition pour le premier segment)
+afin de lancer la synthèse vocale avant la fin de la génération
+"""
+
+import re
+from typing import List, Optional
+
+# Fin de phrase : ponctuation forte suivie d'un espace (exclut "3.5", "www.x")
+_SENTENCE_END = re.compile(r"[.!?…]+[\"»)\]]?\s+")
+_CLAUSE_END = re.compile(r"[,;:]\s+")
+_WORD_END = re.compile(r"\s+")
+
+# Abréviations courantes : un point après elles ne termine pas la phrase
+ABBREVIATIONS = {
+    "m", "mm", "mme", "mmes", "mlle", "dr", "pr", "me", "st", "ste",
+    "etc", "cf", "ex", "env", "art", "av", "bd", "no", "n°", "p", "vol"
+}
+
+
+class SentenceSegmenter:
+    """
+    Découpeur de texte incrémental
+    
+    Le premier segment est émis dès une frontière de proposition pour réduire
+    la latence du premier audio ; les suivants suivent les frontières de
+    phrase. Un segment trop long est coupé à la dernière proposition (ou au
+    dernier mot) avant max_chars.
+    """
+    
+    def __init__(
+        self,
+        min_chars: int = 24,
+        max_chars: int = 220,
+        first_min_chars: Optional[int] = None
+    ):
+        """
+        Initialise le découpeur
+        
+        Args:
+            min_chars: Longueur minimale d'un segment (évite les fragments trop courts)
+            max_chars: Longueur au-delà de laquelle un segment est forcé
+            first_min_chars: Longueur minimale du premier segment (défaut: min_chars)
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.first_min_chars = first_min_chars if first_min_chars is not None else min_chars
+        self._buffer = ""
+        self._emitted = 0
+    
+    def feed(self, text: str) -> List[str]:
+        """
+        Ajoute un delta de texte et retourne les segments complets
+        
+        Args:
+            text: Delta de texte streamé
+        
+        Returns:
+            List[str]: Segments prêts à synthétiser (éventuellement vide)
+        """
+        self._buffer += text
+        segments = []
+        
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            
+            segment = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:]
+            
+            if segment:
+                segments.append(segment)
+                self._emitted += 1
+        
+        return segments
+    
+    def flush(self) -> Optional[str]:
+        """
+        Retourne le texte restant en fin de stream
+        
+        Returns:
+            Optional[str]: Dernier segment ou None
+        """
+        segment = self._buffer.strip()
+        self._buffer = ""
+        
+        if not segment:
+            return None
+        
+        self._emitted += 1
+        return segment
+    
+    def _find_cut(self) -> Optional[int]:
+        """Position de coupe dans le buffer, ou None s'il faut attendre la suite"""
+        min_chars = self.first_min_chars if self._emitted == 0 else self.min_chars
+        
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() < min_chars:
+                continue
+            if self._is_abbreviation(match.start()):
+                continue
+            return match.end()
+        
+        if self._emitted == 0:
+            for match in _CLAUSE_END.finditer(self._buffer):
+                if match.end() >= min_chars:
+                    return match.end()
+        
+        if len(self._buffer) >= self.max_chars:
+            window = self._buffer[:self.max_chars]
+            for pattern in (_CLAUSE_END, _WORD_END):
+                cuts = [m.end() for m in pattern.finditer(window) if m.end() >= min_chars]
+                if cuts:
+                    return cuts[-1]
+            return self.max_chars
+        
+        return None
+    
+    def _is_abbreviation(self, position: int) -> bool:
+        """Vrai si le point en position suit une abréviation (ou une initiale)"""
+        if self._buffer[position] != ".":
+            return False
+        
+        words = self._buffer[:position].split()
+        if not words:
+            return False
+        
+        word = words[-1].lower().lstrip("(«\"")
+        return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
@@ -5,7 +5,8 @@ Transcription audio temps réel optimisée pour le français gabonais
 
 import asyncio
 import logging
-from typing import AsyncGenerator, Optional
+import time
+from typing import AsyncGenerator, AsyncIterator, Optional
 from deepgram import (
     DeepgramClient,
     DeepgramClientOptions,
@@ -14,9 +15,314 @@ from deepgram import (
 )
 
 from app.config import settings
+from app.core.metrics import (
+    stt_requests_total,
+    stt_latency_seconds,
+    stt_reconnects_total,
+    stt_stream_restarts_total,
+)
 
 logger = logging.getLogger(__name__)
 
+# Marqueur de file : demande à Deepgram de clore l'utterance en cours
+_FINALIZE = object()
+
+_stt_service: Optional["STTService"] = None
+
+
+class STTSession:
+    """
+    Connexion Deepgram persistante d'une session vocale
+    
+    La boucle de réception WebSocket dépose l'audio dans une file ; une tâche
+    unique l'envoie sur la connexion ouverte au démarrage. Sans audio (silence
+    filtré par le VAD), un KeepAlive maintient la connexion ; si elle tombe,
+    elle est rouverte (backoff exponentiel) avant l'envoi suivant.
+    
+    La reprise transparente n'est possible qu'en PCM brut (linear16). Un flux
+    conteneur (webm, ogg) n'a d'en-tête qu'en tête d'enregistrement : une
+    nouvelle connexion ne recevrait que des clusters illisibles. S'il a déjà
+    commencé, la session est marquée perdue, l'audio suivant est ignoré et un
+    événement stream_lost demande au client de relancer son enregistreur.
+    """
+    
+    def __init__(
+        self,
+        client: DeepgramClient,
+        language: str,
+        model: str,
+        encoding: Optional[str] = None,
+        sample_rate: Optional[int] = None
+    ):
+        """
+        Prépare la session (connexion ouverte par start)
+        
+        Args:
+            client: Client Deepgram
+            language: Code langue
+            model: Modèle Deepgram
+            encoding: Encodage brut de l'audio (ex: linear16), None = conteneur détecté
+            sample_rate: Fréquence d'échantillonnage (requise avec encoding)
+        """
+        self.client = client
+        self.language = language
+        self.model = model
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        
+        self._audio: asyncio.Queue = asyncio.Queue(maxsize=settings.stt_audio_queue_max_chunks)
+        self._results: asyncio.Queue = asyncio.Queue()
+        self._connection = None
+        self._connect_lock = asyncio.Lock()
+        self._tasks: list = []
+        self._connected_once = False
+        self._last_sent = time.monotonic()
+        self._finalize_at: Optional[float] = None
+        self._stream_started = False
+        self.lost = False
+        self._closed = False
+    
+    def _options(self) -> LiveOptions:
+        options = LiveOptions(
+            language=self.language,
+            model=self.model,
+            punctuate=True,
+            interim_results=True,
+            endpointing=300,
+            smart_format=True,
+            utterance_end_ms="1000",
+            vad_events=True,
+        )
+        if self.encoding:
+            options.encoding = self.encoding
+            options.sample_rate = self.sample_rate
+            options.channels = 1
+        return options
+    
+    async def start(self):
+        """Ouvre la connexion et démarre les tâches d'envoi et de keepalive"""
+        await self._connect()
+        self._tasks = [
+            asyncio.create_task(self._send_loop()),
+            asyncio.create_task(self._keepalive_loop())
+        ]
+    
+    async def _connect(self):
+        """Ouvre la connexion si besoin (plusieurs tentatives avec backoff)"""
+        async with self._connect_lock:
+            if self._connection is not None:
+                return
+            
+            attempts = settings.stt_reconnect_attempts
+            for attempt in range(attempts):
+                connection = self.client.listen.asyncwebsocket.v("1")
+                connection.on(LiveTranscriptionEvents.Transcript, self._on_transcript)
+                connection.on(LiveTranscriptionEvents.UtteranceEnd, self._on_utterance_end)
+                connection.on(LiveTranscriptionEvents.Error, self._on_error)
+                connection.on(LiveTranscriptionEvents.Close, self._on_close)
+                
+                try:
+                    if await connection.start(self._options()):
+                        self._connection = connection
+                        self._last_sent = time.monotonic()
+                        self._stream_started = False
+                        stt_requests_total.labels(provider="deepgram").inc()
+                        if self._connected_once:
+                            stt_reconnects_total.inc()
+                            logger.info("🔄 Connexion Deepgram rétablie")
+                        self._connected_once = True
+                        return
+                except Exception as e:
+                    logger.warning(f"⚠️ Connexion Deepgram échouée ({attempt + 1}/{attempts}): {e}")
+                
+                await asyncio.sleep(min(0.25 * 2 ** attempt, 4.0))
+            
+            raise ConnectionError("Connexion Deepgram impossible")
+    
+    def _can_resume(self) -> bool:
+        """Une nouvelle connexion peut-elle prendre la suite du flux audio ?"""
+        # PCM brut : chaque chunk se décode seul. Conteneur : seulement avant
+        # l'envoi de l'en-tête
+        return self.encoding is not None or not self._stream_started
+    
+    async def _lose_stream(self):
+        """Connexion tombée en cours de flux conteneur : le client doit le relancer"""
+        if self.lost:
+            return
+        
+        self.lost = True
+        stt_stream_restarts_total.inc()
+        logger.warning("⚠️ Connexion Deepgram perdue en cours de flux conteneur, relance demandée")
+        await self._disconnect()
+        
+        # Suite du flux interrompu : inutilisable sur une autre connexion
+        while not self._audio.empty():
+            self._audio.get_nowait()
+        
+        await self._results.put({"event": "stream_lost"})
+    
+    async def _disconnect(self):
+        """Ferme la connexion courante (rouverte au prochain envoi)"""
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                await connection.finish()
+            except Exception:
+                pass
+    
+    def send(self, audio: bytes):
+        """
+        Met un chunk audio en file d'envoi (sans attendre le réseau)
+        
+        Args:
+            audio: Chunk audio brut
+        """
+        if self._closed or self.lost or not audio:
+            return
+        
+        try:
+            self._audio.put_nowait(audio)
+        except asyncio.QueueFull:
+            logger.warning("⚠️ File audio STT pleine : chunk ignoré")
+    
+    def finalize(self):
+        """Demande la transcription finale de l'utterance en cours (après l'audio en file)"""
+        if self._closed:
+            return
+        
+        self._finalize_at = time.monotonic()
+        try:
+            self._audio.put_nowait(_FINALIZE)
+        except asyncio.QueueFull:
+            logger.warning("⚠️ File audio STT pleine : fin d'utterance ignorée")
+    
+    async def _send_loop(self):
+        """Vide la file audio vers Deepgram, en reconnectant si nécessaire"""
+        while True:
+            item = await self._audio.get()
+            if self.lost:
+                continue
+            
+            for attempt in range(2):
+                try:
+                    if self._connection is None and not self._can_resume():
+                        await self._lose_stream()
+                        break
+                    
+                    await self._connect()
+                    if item is _FINALIZE:
+                        sent = await self._connection.finalize()
+                    else:
+                        sent = await self._connection.send(item)
+                    if not sent:
+                        raise ConnectionError("envoi refusé")
+                    
+                    self._last_sent = time.monotonic()
+                    if item is not _FINALIZE:
+                        self._stream_started = True
+                    break
+                
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"⚠️ Envoi Deepgram échoué, reconnexion: {e}")
+                    await self._disconnect()
+            else:
+                logger.error("❌ Chunk audio perdu (Deepgram indisponible)")
+    
+    async def _keepalive_loop(self):
+        """Maintient la connexion pendant les silences et la rouvre si elle est tombée"""
+        interval = settings.stt_keepalive_interval
+        
+        while True:
+            await asyncio.sleep(interval)
+            
+            try:
+                if self.lost:
+                    continue
+                if self._connection is None:
+                    if self._can_resume():
+                        await self._connect()
+                    else:
+                        await self._lose_stream()
+                elif time.monotonic() - self._last_sent >= interval:
+                    await self._connection.keep_alive()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ KeepAlive Deepgram échoué: {e}")
+                await self._disconnect()
+    
+    async def _on_transcript(self, client, result, **kwargs):
+        """Callback des résultats de transcription (intermédiaires et finaux)"""
+        alternative = result.channel.alternatives[0]
+        speech_final = bool(getattr(result, "speech_final", False))
+        from_finalize = bool(getattr(result, "from_finalize", False))
+        
+        # Un résultat vide ne compte que s'il clôt l'utterance
+        if not alternative.transcript and not (speech_final or from_finalize):
+            return
+        
+        if result.is_final and (speech_final or from_finalize) and self._finalize_at is not None:
+            stt_latency_seconds.observe(time.monotonic() - self._finalize_at)
+            self._finalize_at = None
+        
+        await self._results.put({
+            "event": "transcript",
+            "transcript": alternative.transcript,
+            "is_final": result.is_final,
+            "speech_final": speech_final or from_finalize,
+            "confidence": alternative.confidence,
+            "words": [
+                {
+                    "word": word.word,
+                    "start": word.start,
+                    "end": word.end,
+                    "confidence": word.confidence
+                }
+                for word in alternative.words
+            ] if hasattr(alternative, 'words') else []
+        })
+    
+    async def _on_utterance_end(self, client, utterance_end, **kwargs):
+        """Callback de fin d'utterance détectée par Deepgram (silence prolongé)"""
+        await self._results.put({"event": "utterance_end"})
+    
+    async def _on_error(self, client, error, **kwargs):
+        logger.error(f"❌ Erreur STT Deepgram: {error}")
+    
+    async def _on_close(self, client, close, **kwargs):
+        if client is self._connection:
+            self._connection = None
+            if not self._closed:
+                logger.warning("⚠️ Connexion Deepgram fermée, reconnexion au prochain envoi")
+    
+    async def transcripts(self) -> AsyncIterator[dict]:
+        """
+        Résultats de transcription jusqu'à la fermeture de la session
+        
+        Yields:
+            dict: {"event": "transcript", transcript, is_final, speech_final, confidence, words},
+                {"event": "utterance_end"} ou {"event": "stream_lost"}
+        """
+        while True:
+            result = await self._results.get()
+            if result is None:
+                return
+            yield result
+    
+    async def close(self):
+        """Arrête les tâches et ferme la connexion"""
+        if self._closed:
+            return
+        
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._disconnect()
+        self._results.put_nowait(None)
+
 
 class STTService:
     """Service de transcription audio en texte avec Deepgram"""
@@ -30,6 +336,31 @@ class STTService:
         self.client = DeepgramClient(self.api_key, config)
         logger.info("✅ Service STT Deepgram initialisé")
     
+    async def open_session(
+        self,
+        encoding: Optional[str] = None,
+        sample_rate: Optional[int] = None
+    ) -> STTSession:
+        """
+        Ouvre une connexion de transcription persistante pour une session vocale
+        
+        Args:
+            encoding: Encodage brut de l'audio (ex: linear16), None = conteneur détecté
+            sample_rate: Fréquence d'échantillonnage (requise avec encoding)
+        
+        Returns:
+            STTSession: Session démarrée
+        """
+        session = STTSession(
+            self.client,
+            language=settings.deepgram_language,
+            model=settings.deepgram_model,
+            encoding=encoding,
+            sample_rate=sample_rate
+        )
+        await session.start()
+        return session
+    
     async def transcribe_stream(
         self,
         audio_stream: AsyncGenerator[bytes, None],
@@ -189,3 +520,15 @@ class STTService:
                 "error": str(e)
             }
 
+
+def get_stt_service() -> STTService:
+    """
+    Retourne le service STT partagé par le processus (chaque session ouvre sa
+    propre connexion)
+    """
+    global _stt_service
+    
+    if _stt_service is None:
+        _stt_service = STTService()
+    
+    return _stt_service
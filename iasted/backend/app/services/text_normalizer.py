@@ -0,0 +1,42 @@
+"""
+Normalisation de texte pour les clés de cache
+Deux formulations ne différant que par la casse, les espaces ou la
+ponctuation partagent la même clé.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise un texte (Unicode NFKC, minuscules, sans ponctuation ni espaces multiples)
+    
+    Les accents sont conservés : ils portent du sens en français.
+    
+    Args:
+        text: Texte brut
+    
+    Returns:
+        str: Texte normalisé
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def text_hash(text: str) -> str:
+    """
+    Empreinte stable d'un texte normalisé
+    
+    Args:
+        text: Texte brut
+    
+    Returns:
+        str: SHA-1 hexadécimal du texte normalisé
+    """
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
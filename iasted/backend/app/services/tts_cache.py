@@ -0,0 +1,238 @@
+"""
+Cache audio TTS adressé par contenu
+Les phrases récurrentes (messages d'accueil, erreurs, réponses fréquentes)
+ne sont synthétisées qu'une fois : la clé couvre le texte et tous les
+paramètres de voix, l'audio est gardé en mémoire puis dans Redis
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from typing import Awaitable, Callable, Dict, Optional
+
+from redis.asyncio import Redis
+
+from app.config import settings
+from app.core.lru import LRUCache
+from app.core.metrics import tts_cache_hits_total, tts_cache_misses_total
+from app.core.redis_client import get_redis_binary_client
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def tts_cache_key(
+    text: str,
+    provider: str,
+    voice: Optional[str],
+    speaking_rate: float,
+    pitch: float,
+    encoding: str
+) -> str:
+    """
+    Clé de cache d'un audio synthétisé
+    
+    Seuls les espaces et la forme Unicode sont normalisés : casse et
+    ponctuation changent la prosodie, elles font donc partie de la clé.
+    
+    Args:
+        text: Texte synthétisé
+        provider: Provider TTS (google, elevenlabs)
+        voice: Voix utilisée
+        speaking_rate: Vitesse de parole
+        pitch: Tonalité
+        encoding: Format audio (mp3, ...)
+    
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+    parts = [normalized, provider, voice or "", f"{speaking_rate:g}", f"{pitch:g}", encoding]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TTSAudioCache:
+    """
+    Cache audio à deux niveaux
+    
+    - mémoire : LRU borné en octets, propre au worker
+    - Redis : partagé entre workers, borné en octets ; au-delà du budget les
+      audios les moins récemment servis sont évincés (l'audio d'une clé ne
+      change jamais, il n'y a donc pas d'expiration)
+    
+    Les synthèses identiques simultanées sont fusionnées en un seul appel.
+    """
+    
+    AUDIO_PREFIX = "tts_audio:"
+    LRU_KEY = "tts_audio:lru"
+    SIZES_KEY = "tts_audio:sizes"
+    BYTES_KEY = "tts_audio:bytes"
+    EVICTION_BATCH = 32
+    
+    def __init__(self):
+        """Initialise le cache depuis la configuration"""
+        self._memory = LRUCache(
+            max_entries=settings.tts_cache_memory_max_entries,
+            max_bytes=settings.tts_cache_memory_max_bytes
+        )
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._l2_enabled = settings.tts_cache_redis_enabled
+        self._l2_max_bytes = settings.tts_cache_redis_max_bytes
+        self._redis: Optional[Redis] = None
+    
+    async def get_or_synthesize(
+        self,
+        key: str,
+        synthesize: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Retourne l'audio en cache ou le synthétise puis le met en cache
+        
+        Args:
+            key: Clé calculée par tts_cache_key
+            synthesize: Coroutine appelée uniquement en cas d'absence
+        
+        Returns:
+            bytes: Données audio
+        """
+        audio = self._memory.get(key)
+        if audio is not None:
+            tts_cache_hits_total.labels(tier="memory").inc()
+            return audio
+        
+        # Même énoncé déjà en cours de synthèse : on partage le résultat
+        pending = self._inflight.get(key)
+        if pending is not None:
+            tts_cache_hits_total.labels(tier="inflight").inc()
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # Synthèse annulée par sa session d'origine (barge-in) : on la reprend
+                return await self.get_or_synthesize(key, synthesize)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        
+        try:
+            audio = await self._l2_get(key)
+            
+            if audio is not None:
+                tts_cache_hits_total.labels(tier="redis").inc()
+            else:
+                tts_cache_misses_total.inc()
+                audio = await synthesize()
+                await self._l2_set(key, audio)
+            
+            self._memory.set(key, audio)
+            future.set_result(audio)
+            return audio
+        
+        except Exception as e:
+            future.set_exception(e)
+            # Évite l'avertissement "exception never retrieved" sans attente concurrente
+            future.exception()
+            raise
+        
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+    
+    async def _l2_get(self, key: str) -> Optional[bytes]:
+        """Lit un audio dans Redis et le marque comme récemment servi"""
+        if not self._l2_enabled:
+            return None
+        
+        try:
+            if self._redis is None:
+                self._redis = await get_redis_binary_client()
+            
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.get(f"{self.AUDIO_PREFIX}{key}")
+            pipe.zadd(self.LRU_KEY, {key: time.time()}, xx=True)
+            audio, _ = await pipe.execute()
+            
+            if audio:
+                return audio
+        
+        except Exception as e:
+            logger.warning(f"⚠️ Cache audio TTS Redis indisponible: {e}")
+        
+        return None
+    
+    async def _l2_set(self, key: str, audio: bytes):
+        """Écrit un audio dans Redis puis applique le budget en octets"""
+        if not self._l2_enabled or self._redis is None:
+            return
+        
+        if self._l2_max_bytes and len(audio) > self._l2_max_bytes:
+            return
+        
+        try:
+            created = await self._redis.set(f"{self.AUDIO_PREFIX}{key}", audio, nx=True)
+            if not created:
+                return
+            
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hset(self.SIZES_KEY, key, len(audio))
+            pipe.zadd(self.LRU_KEY, {key: time.time()})
+            pipe.incrby(self.BYTES_KEY, len(audio))
+            _, _, total_bytes = await pipe.execute()
+            
+            if self._l2_max_bytes and total_bytes > self._l2_max_bytes:
+                await self._evict(total_bytes)
+        
+        except Exception as e:
+            logger.warning(f"⚠️ Écriture cache audio TTS Redis échouée: {e}")
+    
+    async def _evict(self, total_bytes: int):
+        """Évince les audios les moins récemment servis jusqu'au budget"""
+        evicted = 0
+        
+        while total_bytes > self._l2_max_bytes:
+            keys = await self._redis.zrange(self.LRU_KEY, 0, self.EVICTION_BATCH - 1)
+            if not keys:
+                break
+            
+            sizes = await self._redis.hmget(self.SIZES_KEY, keys)
+            
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.delete(*(self.AUDIO_PREFIX.encode() + key for key in keys))
+            pipe.zrem(self.LRU_KEY, *keys)
+            for key in keys:
+                pipe.hdel(self.SIZES_KEY, key)
+            deleted = (await pipe.execute())[2:]
+            
+            # Seules les tailles effectivement retirées sont décomptées (évictions concurrentes)
+            freed = sum(
+                int(size)
+                for size, removed in zip(sizes, deleted)
+                if removed and size is not None
+            )
+            total_bytes = await self._redis.decrby(self.BYTES_KEY, freed)
+            evicted += sum(deleted)
+        
+        if evicted:
+            logger.info(
+                f"🗑️ Cache audio TTS: {evicted} audios évincés "
+                f"(budget {self._l2_max_bytes} octets)"
+            )
+
+
+_tts_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_cache() -> TTSAudioCache:
+    """Retourne le cache audio TTS partagé par le processus"""
+    global _tts_cache
+    
+    if _tts_cache is None:
+        _tts_cache = TTSAudioCache()
+    
+    return _tts_cache
@@ -0,0 +1,136 @@
+"""
+Pipeline TTS incrémental
+Synthétise le texte streamé par le LLM phrase par phrase, en parallèle
+(borné), et envoie l'audio dans l'ordre dès que chaque segment est prêt
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from app.config import settings
+from app.core.metrics import tts_first_audio_seconds
+from app.services.sentence_segmenter import SentenceSegmenter
+from app.services.tts_service import TTSService
+
+logger = logging.getLogger(__name__)
+
+SendAudio = Callable[[int, str, bytes], Awaitable[None]]
+
+
+class TTSPipeline:
+    """
+    Étape LLM stream → segments → synthèse concurrente → envoi ordonné
+    
+    Au plus max_concurrency segments sont synthétisés simultanément ; le texte
+    continue d'être consommé pendant ce temps. L'envoi attend chaque segment
+    dans l'ordre : le segment n+1 peut être prêt avant le segment n, il est
+    alors envoyé juste après lui.
+    """
+    
+    def __init__(
+        self,
+        tts_service: TTSService,
+        max_concurrency: Optional[int] = None,
+        segmenter: Optional[SentenceSegmenter] = None,
+        audio_format: str = "mp3"
+    ):
+        """
+        Initialise le pipeline
+        
+        Args:
+            tts_service: Service de synthèse vocale
+            max_concurrency: Synthèses simultanées max (défaut: settings)
+            segmenter: Découpeur de texte (défaut: paramètres settings)
+            audio_format: Format audio des segments (mp3, pcm16, opus)
+        """
+        self.tts_service = tts_service
+        self.audio_format = audio_format
+        self.max_concurrency = max_concurrency or settings.tts_pipeline_max_concurrency
+        self.segmenter = segmenter or SentenceSegmenter(
+            min_chars=settings.tts_segment_min_chars,
+            max_chars=settings.tts_segment_max_chars,
+            first_min_chars=settings.tts_first_segment_min_chars
+        )
+    
+    async def run(
+        self,
+        text_stream: AsyncIterator[str],
+        send_audio: SendAudio
+    ) -> Tuple[str, List[bytes]]:
+        """
+        Consomme le texte streamé et envoie l'audio segment par segment
+        
+        Args:
+            text_stream: Deltas de texte du LLM
+            send_audio: Coroutine d'envoi (index, texte du segment, audio)
+        
+        Returns:
+            Tuple[str, List[bytes]]: (texte complet, audio de chaque segment)
+        """
+        slots = asyncio.Semaphore(self.max_concurrency)
+        pending: asyncio.Queue = asyncio.Queue()
+        start = time.perf_counter()
+        
+        async def synthesize(segment: str) -> bytes:
+            async with slots:
+                return await self.tts_service.synthesize(segment, audio_format=self.audio_format)
+        
+        async def sender() -> List[bytes]:
+            audio_segments = []
+            while True:
+                item = await pending.get()
+                if item is None:
+                    return audio_segments
+                
+                index, segment, task = item
+                audio = await task
+                
+                if index == 0:
+                    tts_first_audio_seconds.observe(time.perf_counter() - start)
+                    logger.debug(f"🔊 Premier audio après {time.perf_counter() - start:.2f}s")
+                
+                await send_audio(index, segment, audio)
+                audio_segments.append(audio)
+        
+        sender_task = asyncio.create_task(sender())
+        tasks: List[asyncio.Task] = []
+        text_parts: List[str] = []
+        
+        def dispatch(segment: str):
+            task = asyncio.create_task(synthesize(segment))
+            tasks.append(task)
+            pending.put_nowait((len(tasks) - 1, segment, task))
+        
+        try:
+            async for delta in text_stream:
+                text_parts.append(delta)
+                for segment in self.segmenter.feed(delta):
+                    dispatch(segment)
+                
+                # Arrêt anticipé si l'envoi a échoué (client déconnecté, erreur TTS)
+                if sender_task.done():
+                    break
+            
+            last = self.segmenter.flush()
+            if last:
+                dispatch(last)
+            
+            pending.put_nowait(None)
+            audio_segments = await sender_task
+            
+            return "".join(text_parts), audio_segments
+        
+        finally:
+            if not sender_task.done():
+                sender_task.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(sender_task, *tasks, return_exceptions=True)
+            
+            # Arrêt anticipé ou annulation : le stream LLM amont est fermé immédiatement
+            aclose = getattr(text_stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
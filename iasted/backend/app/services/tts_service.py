@@ -3,26 +3,84 @@ Service TTS (Text-to-Speech) avec Google Cloud TTS
 Synthèse vocale française naturelle optimisée
 """
 
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Optional
 from google.cloud import texttospeech
 from elevenlabs import ElevenLabs
 
 from app.config import settings
+from app.core.metrics import tts_requests_total, tts_latency_seconds
+from app.services.audio_frames import strip_wav_header
+from app.services.tts_cache import get_tts_cache, tts_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Partagés par toutes les sessions du worker : la limite de concurrence vaut
+# pour le processus, pas pour une connexion
+_executor: Optional[ThreadPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+_tts_service: Optional["TTSService"] = None
+
+# Encodage demandé à chaque provider selon le format de sortie de la session
+_GOOGLE_ENCODINGS = {
+    "mp3": texttospeech.AudioEncoding.MP3,
+    "pcm16": texttospeech.AudioEncoding.LINEAR16,
+    "opus": texttospeech.AudioEncoding.OGG_OPUS,
+}
+_ELEVENLABS_OUTPUT_FORMATS = {
+    "mp3": "mp3_44100_128",
+    "pcm16": f"pcm_{settings.tts_pcm_sample_rate}",
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Pool de threads des clients TTS synchrones (ElevenLabs)"""
+    global _executor
+    
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.tts_executor_workers,
+            thread_name_prefix="tts"
+        )
+    
+    return _executor
+
+
+def _get_slots() -> asyncio.Semaphore:
+    """Sémaphore bornant les synthèses simultanées du processus"""
+    global _slots
+    
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.tts_max_concurrency)
+    
+    return _slots
+
 
 class TTSService:
-    """Service de synthèse vocale texte vers audio"""
+    """
+    Service de synthèse vocale texte vers audio
+    
+    Aucun appel bloquant dans la boucle d'événements : Google passe par le
+    client gRPC asynchrone, ElevenLabs (SDK synchrone) par un pool de threads
+    dédié. Les deux sont bornés par un sémaphore commun au processus.
+    
+    Les audios sont mis en cache par texte et paramètres de voix : une phrase
+    déjà synthétisée ne rappelle pas le provider (ni ne prend de place dans
+    le sémaphore).
+    """
     
     def __init__(self):
         """Initialise le client TTS (Google ou ElevenLabs)"""
         self.provider = "google"
+        self.google_client = None
         
         if settings.google_application_credentials:
             try:
-                self.google_client = texttospeech.TextToSpeechClient()
+                self.google_client = texttospeech.TextToSpeechAsyncClient()
                 self.google_voice = texttospeech.VoiceSelectionParams(
                     language_code=settings.google_tts_language,
                     name=settings.google_tts_voice,
@@ -48,12 +106,20 @@ class TTSService:
                 logger.error(f"❌ Erreur init ElevenLabs: {e}")
                 self.elevenlabs_client = None
     
+    @property
+    def supported_formats(self) -> tuple:
+        """Formats de sortie produits par le provider actif"""
+        if self.provider == "elevenlabs":
+            return tuple(_ELEVENLABS_OUTPUT_FORMATS)
+        return tuple(_GOOGLE_ENCODINGS)
+    
     async def synthesize(
         self,
         text: str,
         voice_name: Optional[str] = None,
         speaking_rate: float = 1.0,
-        pitch: float = 0.0
+        pitch: float = 0.0,
+        audio_format: str = "mp3"
     ) -> bytes:
         """
         Convertit du texte en audio
@@ -63,42 +129,78 @@ class TTSService:
             voice_name: Nom de la voix (optionnel)
             speaking_rate: Vitesse de parole (0.25-4.0)
             pitch: Tonalité (-20.0 à 20.0)
+            audio_format: mp3, pcm16 (échantillons bruts, sans en-tête WAV) ou opus (Ogg)
             
         Returns:
-            bytes: Données audio MP3
+            bytes: Données audio dans le format demandé
         """
+        if audio_format not in self.supported_formats:
+            raise ValueError(f"Format audio non supporté par {self.provider}: {audio_format}")
+        
         if self.provider == "google" and self.google_client:
-            return await self._synthesize_google(text, speaking_rate, pitch)
-        elif self.provider == "elevenlabs" and hasattr(self, 'elevenlabs_client'):
-            return await self._synthesize_elevenlabs(text, voice_name)
+            voice = f"{settings.google_tts_language}/{settings.google_tts_voice}"
+            provider_call = partial(
+                self._synthesize_google,
+                text,
+                speaking_rate,
+                pitch,
+                audio_format
+            )
+        elif self.provider == "elevenlabs" and getattr(self, 'elevenlabs_client', None):
+            voice = voice_name or settings.elevenlabs_voice_id
+            provider_call = partial(self._synthesize_elevenlabs, text, voice, audio_format)
         else:
             raise RuntimeError("Aucun service TTS disponible")
+        
+        async def synthesize() -> bytes:
+            async with _get_slots():
+                tts_requests_total.labels(provider=self.provider).inc()
+                start = time.perf_counter()
+                
+                audio = await provider_call()
+                
+                tts_latency_seconds.observe(time.perf_counter() - start)
+                return audio
+        
+        if not settings.tts_cache_enabled:
+            return await synthesize()
+        
+        key = tts_cache_key(text, self.provider, voice, speaking_rate, pitch, audio_format)
+        return await get_tts_cache().get_or_synthesize(key, synthesize)
     
     async def _synthesize_google(
         self,
         text: str,
         speaking_rate: float = 1.0,
-        pitch: float = 0.0
+        pitch: float = 0.0,
+        audio_format: str = "mp3"
     ) -> bytes:
         """Synthèse avec Google Cloud TTS"""
         try:
             synthesis_input = texttospeech.SynthesisInput(text=text)
             
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
+                audio_encoding=_GOOGLE_ENCODINGS[audio_format],
+                sample_rate_hertz=settings.tts_pcm_sample_rate if audio_format == "pcm16" else None,
                 speaking_rate=speaking_rate,
                 pitch=pitch,
                 effects_profile_id=["small-bluetooth-speaker-class-device"]
             )
             
-            response = self.google_client.synthesize_speech(
+            response = await self.google_client.synthesize_speech(
                 input=synthesis_input,
                 voice=self.google_voice,
                 audio_config=audio_config
             )
             
-            logger.debug(f"✅ Synthèse Google réussie: {len(text)} chars -> {len(response.audio_content)} bytes")
-            return response.audio_content
+            audio = response.audio_content
+            if audio_format == "pcm16":
+                # LINEAR16 est renvoyé dans un conteneur WAV : le client reçoit
+                # des échantillons bruts
+                audio = strip_wav_header(audio)
+            
+            logger.debug(f"✅ Synthèse Google réussie: {len(text)} chars -> {len(audio)} bytes")
+            return audio
             
         except Exception as e:
             logger.error(f"❌ Erreur synthèse Google: {e}", exc_info=True)
@@ -107,19 +209,24 @@ class TTSService:
     async def _synthesize_elevenlabs(
         self,
         text: str,
-        voice_id: Optional[str] = None
+        voice_id: Optional[str] = None,
+        audio_format: str = "mp3"
     ) -> bytes:
-        """Synthèse avec ElevenLabs"""
+        """Synthèse avec ElevenLabs (SDK synchrone, exécuté dans le pool de threads)"""
         try:
             voice_id = voice_id or settings.elevenlabs_voice_id
             
-            audio = self.elevenlabs_client.generate(
-                text=text,
-                voice=voice_id,
-                model="eleven_multilingual_v2"
-            )
+            def generate() -> bytes:
+                audio = self.elevenlabs_client.generate(
+                    text=text,
+                    voice=voice_id,
+                    model="eleven_multilingual_v2",
+                    output_format=_ELEVENLABS_OUTPUT_FORMATS[audio_format]
+                )
+                return b"".join(audio)
             
-            audio_bytes = b"".join(audio)
+            loop = asyncio.get_running_loop()
+            audio_bytes = await loop.run_in_executor(_get_executor(), generate)
             logger.debug(f"✅ Synthèse ElevenLabs réussie: {len(text)} chars")
             return audio_bytes
             
@@ -143,15 +250,38 @@ class TTSService:
         try:
             synthesis_input = texttospeech.SynthesisInput(ssml=ssml)
             
-            response = self.google_client.synthesize_speech(
-                input=synthesis_input,
-                voice=self.google_voice,
-                audio_config=self.audio_config
-            )
+            async with _get_slots():
+                response = await self.google_client.synthesize_speech(
+                    input=synthesis_input,
+                    voice=self.google_voice,
+                    audio_config=self.audio_config
+                )
             
             return response.audio_content
             
         except Exception as e:
             logger.error(f"❌ Erreur synthèse SSML: {e}", exc_info=True)
             raise
+    
+    async def aclose(self):
+        """Ferme le canal gRPC Google et le pool de threads du processus"""
+        global _executor
+        
+        if self.google_client is not None:
+            await self.google_client.transport.close()
+        
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+        
+        logger.info("🔌 Service TTS fermé")
+
 
+def get_tts_service() -> TTSService:
+    """Retourne le service TTS partagé par le processus (canal gRPC unique)"""
+    global _tts_service
+    
+    if _tts_service is None:
+        _tts_service = TTSService()
+    
+    return _tts_service
@@ -0,0 +1,207 @@
+"""
+Détection d'activité vocale (VAD) côté serveur
+Filtre le silence avant Deepgram et détecte la fin d'utterance de façon
+déterministe, sur de l'audio PCM 16 bits mono
+"""
+
+import logging
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.core.metrics import vad_frames_total
+
+try:
+    import webrtcvad
+except ImportError:  # Dépendance optionnelle : repli sur le détecteur d'énergie
+    webrtcvad = None
+
+logger = logging.getLogger(__name__)
+
+_WEBRTC_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+_WEBRTC_FRAME_MS = (10, 20, 30)
+
+_speech_frames = vad_frames_total.labels(speech="true")
+_silence_frames = vad_frames_total.labels(speech="false")
+
+
+def parse_sample_rate(value: Any) -> int:
+    """
+    Valide la fréquence d'un flux PCM déclarée par le client
+    
+    Seules les fréquences de webrtcvad sont acceptées : elles couvrent les
+    captures navigateur (16/48 kHz) et téléphoniques (8 kHz).
+    
+    Args:
+        value: Fréquence reçue (query string ou message config), None = défaut
+    
+    Returns:
+        int: Fréquence en Hz
+    
+    Raises:
+        ValueError: Valeur non entière ou fréquence non supportée
+    """
+    if value is None or value == "":
+        return settings.stt_input_sample_rate
+    
+    try:
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError
+        sample_rate = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"input_sample_rate invalide: {value!r}") from None
+    
+    if sample_rate not in _WEBRTC_SAMPLE_RATES:
+        raise ValueError(
+            f"input_sample_rate non supporté: {sample_rate} Hz "
+            f"(acceptés: {', '.join(map(str, _WEBRTC_SAMPLE_RATES))})"
+        )
+    
+    return sample_rate
+
+
+@dataclass
+class VADResult:
+    """Résultat du traitement d'un chunk audio"""
+    audio: bytes
+    speech_started: bool = False
+    utterance_ended: bool = False
+
+
+class VoiceActivityDetector:
+    """
+    Détecteur parole / silence par trames
+    
+    Hors parole, les trames sont gardées dans un court tampon (pre-roll) et
+    ne sont pas transmises. La parole démarre après vad_min_speech_ms de
+    trames actives : le pre-roll est alors transmis pour ne pas couper
+    l'attaque du premier mot. Elle se termine après vad_hangover_ms de
+    silence, ce qui marque la fin d'utterance.
+    
+    Classification par webrtcvad s'il est installé (et que le débit s'y
+    prête), sinon par énergie avec plancher de bruit adaptatif.
+    """
+    
+    # Écart minimal (dB) au-dessus du plancher de bruit pour une trame de parole
+    NOISE_MARGIN_DB = 10.0
+    
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: Optional[int] = None,
+        aggressiveness: Optional[int] = None,
+        energy_threshold_db: Optional[float] = None
+    ):
+        """
+        Initialise le détecteur
+        
+        Args:
+            sample_rate: Fréquence d'échantillonnage de l'audio entrant
+            frame_ms: Durée d'une trame d'analyse (défaut: settings)
+            aggressiveness: Agressivité webrtcvad 0-3 (défaut: settings)
+            energy_threshold_db: Seuil absolu du détecteur d'énergie en dBFS
+                (défaut: settings)
+        
+        Raises:
+            ValueError: Trame d'analyse vide (fréquence ou durée trop faible)
+        """
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms or settings.vad_frame_ms
+        self.frame_bytes = sample_rate * self.frame_ms // 1000 * 2
+        if self.frame_bytes < 2:
+            # feed() ne consommerait jamais le tampon
+            raise ValueError(f"Trame VAD vide ({sample_rate} Hz, {self.frame_ms} ms)")
+        self.energy_threshold_db = (
+            energy_threshold_db
+            if energy_threshold_db is not None else settings.vad_energy_threshold_db
+        )
+        
+        self._min_speech_frames = max(1, settings.vad_min_speech_ms // self.frame_ms)
+        self._hangover_frames = max(1, settings.vad_hangover_ms // self.frame_ms)
+        self._pre_roll: deque = deque(maxlen=max(1, settings.vad_pre_roll_ms // self.frame_ms))
+        
+        self._webrtc = None
+        webrtc_compatible = (
+            sample_rate in _WEBRTC_SAMPLE_RATES and self.frame_ms in _WEBRTC_FRAME_MS
+        )
+        if webrtcvad is not None and webrtc_compatible:
+            self._webrtc = webrtcvad.Vad(
+                aggressiveness if aggressiveness is not None else settings.vad_aggressiveness
+            )
+        
+        self._buffer = b""
+        self._noise_floor_db = self.energy_threshold_db - self.NOISE_MARGIN_DB
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+    
+    def _is_speech(self, frame: bytes) -> bool:
+        """Classe une trame complète"""
+        if self._webrtc is not None:
+            return self._webrtc.is_speech(frame, self.sample_rate)
+        
+        samples = np.frombuffer(frame, dtype="<i2").astype(np.float32)
+        rms = math.sqrt(float(np.mean(samples * samples))) if len(samples) else 0.0
+        level_db = 20 * math.log10(max(rms, 1.0) / 32768)
+        
+        threshold_db = max(self.energy_threshold_db, self._noise_floor_db + self.NOISE_MARGIN_DB)
+        speech = level_db > threshold_db
+        if not speech:
+            # Le plancher suit lentement le bruit ambiant
+            self._noise_floor_db = 0.95 * self._noise_floor_db + 0.05 * level_db
+        return speech
+    
+    def feed(self, pcm: bytes) -> VADResult:
+        """
+        Traite un chunk PCM 16 bits (taille quelconque)
+        
+        Args:
+            pcm: Échantillons little-endian mono
+        
+        Returns:
+            VADResult: Audio à transmettre au STT et transitions détectées
+        """
+        self._buffer += pcm
+        out = []
+        result = VADResult(audio=b"")
+        
+        while len(self._buffer) >= self.frame_bytes:
+            frame = self._buffer[:self.frame_bytes]
+            self._buffer = self._buffer[self.frame_bytes:]
+            speech = self._is_speech(frame)
+            (_speech_frames if speech else _silence_frames).inc()
+            
+            if not self.in_speech:
+                self._pre_roll.append(frame)
+                self._speech_run = self._speech_run + 1 if speech else 0
+                
+                if self._speech_run >= self._min_speech_frames:
+                    self.in_speech = True
+                    self._silence_run = 0
+                    result.speech_started = True
+                    out.extend(self._pre_roll)
+                    self._pre_roll.clear()
+                continue
+            
+            out.append(frame)
+            self._silence_run = 0 if speech else self._silence_run + 1
+            
+            if self._silence_run >= self._hangover_frames:
+                self.in_speech = False
+                self._speech_run = 0
+                result.utterance_ended = True
+        
+        result.audio = b"".join(out)
+        return result
+    
+    def reset(self):
+        """Oublie l'état courant (fin d'utterance forcée par le client)"""
+        self._buffer = b""
+        self._pre_roll.clear()
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
@@ -0,0 +1,437 @@
+"""
+Index vectoriel pour le cache sémantique
+Recherche du plus proche voisin sans parcourir tout le keyspace Redis
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_embedding(embedding) -> Optional[np.ndarray]:
+    """
+    Convertit un embedding en vecteur float32 unitaire
+    
+    Args:
+        embedding: Vecteur (liste ou ndarray)
+    
+    Returns:
+        Optional[np.ndarray]: Vecteur normalisé, None si nul
+    """
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    
+    if norm == 0:
+        return None
+    
+    return vector / norm
+
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+
+def pack_embedding(embedding, dtype: str = "float32") -> bytes:
+    """
+    Sérialise un embedding normalisé en binaire compact
+    
+    Args:
+        embedding: Vecteur unitaire
+        dtype: "float32" (4 o/dim), "float16" (2 o/dim) ou "int8"
+            (1 o/dim + échelle float32 en tête)
+    
+    Returns:
+        bytes: Vecteur empaqueté
+    """
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    
+    if dtype == "float16":
+        return vector.astype(np.float16).tobytes()
+    
+    if dtype == "int8":
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        quantized = np.round(vector / scale).astype(np.int8)
+        return np.float32(scale).tobytes() + quantized.tobytes()
+    
+    return vector.tobytes()
+
+
+def unpack_embedding(data: bytes, dtype: str = "float32") -> np.ndarray:
+    """
+    Désérialise un embedding produit par pack_embedding
+    
+    Args:
+        data: Vecteur empaqueté
+        dtype: Schéma utilisé à l'écriture
+    
+    Returns:
+        np.ndarray: Vecteur float32
+    """
+    if dtype == "float16":
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32)
+    
+    if dtype == "int8":
+        scale = np.frombuffer(data[:4], dtype=np.float32)[0]
+        return np.frombuffer(data[4:], dtype=np.int8).astype(np.float32) * scale
+    
+    return np.frombuffer(data, dtype=np.float32)
+
+
+class FlatVectorIndex:
+    """
+    Index plat en mémoire (matrice NumPy contiguë)
+    
+    Les embeddings sont normalisés en float32 à l'insertion et rangés dans une
+    matrice pré-allouée : le scoring de toutes les entrées est un seul produit
+    matrice-vecteur (BLAS) et le top-k un seul argpartition.
+    """
+    
+    backend = "flat"
+    in_process = True
+    
+    def __init__(self, dim: Optional[int] = None, capacity: int = 1024):
+        """
+        Initialise un index vide
+        
+        Args:
+            dim: Dimension des embeddings (déduite du premier ajout si absente)
+            capacity: Nombre de lignes pré-allouées (doublé à saturation)
+        """
+        self._capacity = capacity
+        self._matrix: Optional[np.ndarray] = (
+            np.empty((capacity, dim), dtype=np.float32) if dim else None
+        )
+        self._count = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+    
+    def keys(self) -> set:
+        """Retourne l'ensemble des clés indexées"""
+        return set(self._rows)
+    
+    def _grow(self):
+        """Double la capacité de la matrice (amorti O(1) par ajout)"""
+        self._capacity *= 2
+        matrix = np.empty((self._capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:self._count] = self._matrix[:self._count]
+        self._matrix = matrix
+    
+    async def add(self, key: str, embedding: List[float], ttl: Optional[int] = None):
+        """
+        Ajoute (ou remplace) un embedding dans l'index
+        
+        Args:
+            key: Clé Redis de l'entrée de cache
+            embedding: Vecteur d'embedding
+            ttl: Ignoré (l'expiration est gérée par la synchronisation Redis)
+        """
+        vector = normalize_embedding(embedding)
+        
+        if vector is None:
+            return
+        
+        if self._matrix is None:
+            self._matrix = np.empty((self._capacity, vector.shape[0]), dtype=np.float32)
+        
+        row = self._rows.get(key)
+        
+        if row is None:
+            if self._count == self._capacity:
+                self._grow()
+            row = self._count
+            self._count += 1
+            self._rows[key] = row
+            self._ids.append(key)
+        
+        self._matrix[row] = vector
+    
+    async def remove(self, *keys: str):
+        """Retire des clés de l'index (la dernière ligne comble le trou)"""
+        for key in keys:
+            row = self._rows.pop(key, None)
+            if row is None:
+                continue
+            
+            last = self._count - 1
+            last_key = self._ids.pop()
+            
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = last_key
+                self._rows[last_key] = row
+            
+            self._count = last
+    
+    async def search(self, embedding: List[float], k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Cherche les k plus proches voisins (exact)
+        
+        Args:
+            embedding: Vecteur de la requête
+            k: Nombre de résultats
+        
+        Returns:
+            List[Tuple[str, float]]: (clé, similarité) triés par score décroissant
+        """
+        if self._count == 0:
+            return []
+        
+        query = normalize_embedding(embedding)
+        
+        if query is None:
+            return []
+        
+        scores = self._matrix[:self._count] @ query
+        
+        k = min(k, self._count)
+        if k < self._count:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(self._count)
+        top = top[np.argsort(scores[top])[::-1]]
+        
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+
+class HnswVectorIndex:
+    """
+    Index HNSW en mémoire (hnswlib)
+    
+    Recherche approximative en O(log N) : reste sous la milliseconde
+    au-delà de 100k entrées, là où l'index plat devient linéaire.
+    """
+    
+    backend = "hnsw"
+    in_process = True
+    
+    def __init__(
+        self,
+        dim: int,
+        max_elements: int = 256,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 128
+    ):
+        """
+        Initialise un index HNSW vide
+        
+        Args:
+            dim: Dimension des embeddings
+            max_elements: Capacité initiale, doublée à saturation (une partition
+                par rôle:organisation : un index vide reste léger)
+            m: Nombre de voisins par nœud du graphe
+            ef_construction: Largeur de recherche à la construction
+            ef_search: Largeur de recherche à la requête (rappel vs latence)
+        """
+        import hnswlib
+        
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        self._index.init_index(
+            max_elements=max_elements,
+            ef_construction=ef_construction,
+            M=m,
+            allow_replace_deleted=True
+        )
+        self._index.set_ef(ef_search)
+        self._ef_search = ef_search
+        
+        self._labels: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+        self._next_label = 0
+    
+    def __len__(self) -> int:
+        return len(self._labels)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._labels
+    
+    def keys(self) -> set:
+        """Retourne l'ensemble des clés indexées"""
+        return set(self._labels)
+    
+    async def add(self, key: str, embedding: List[float], ttl: Optional[int] = None):
+        """Ajoute (ou remplace) un embedding dans l'index"""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        
+        if not np.any(vector):
+            return
+        
+        await self.remove(key)
+        
+        capacity = self._index.get_max_elements()
+        if len(self._labels) >= capacity:
+            self._index.resize_index(capacity * 2)
+        
+        label = self._next_label
+        self._next_label += 1
+        
+        self._index.add_items(vector, [label], replace_deleted=True)
+        self._labels[key] = label
+        self._keys[label] = key
+    
+    async def remove(self, *keys: str):
+        """Retire des clés de l'index (slots réutilisés par les ajouts suivants)"""
+        for key in keys:
+            label = self._labels.pop(key, None)
+            if label is not None:
+                del self._keys[label]
+                self._index.mark_deleted(label)
+    
+    async def search(self, embedding: List[float], k: int = 1) -> List[Tuple[str, float]]:
+        """Cherche les k plus proches voisins (approximatif)"""
+        k = min(k, len(self._labels))
+        if k == 0:
+            return []
+        
+        query = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        if not np.any(query):
+            return []
+        
+        self._index.set_ef(max(self._ef_search, k))
+        labels, distances = self._index.knn_query(query, k=k)
+        
+        return [
+            (self._keys[int(label)], 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0])
+        ]
+
+
+class RediSearchVectorIndex:
+    """
+    Index vectoriel délégué à RediSearch (module Redis Stack)
+    
+    Les vecteurs (hashes float32 écrits par le cache sémantique) sont indexés
+    côté serveur (HNSW), ce qui partage l'index entre tous les pods.
+    """
+    
+    backend = "redisearch"
+    in_process = False
+    
+    def __init__(
+        self,
+        redis: Redis,
+        dim: int,
+        index_name: str = "idx:semantic_cache",
+        prefix: str = "semantic_cache:vec:"
+    ):
+        """
+        Initialise l'index RediSearch
+        
+        Args:
+            redis: Client Redis
+            dim: Dimension des embeddings
+            index_name: Nom de l'index FT
+            prefix: Préfixe des hashes vecteurs
+        """
+        self.redis = redis
+        self.dim = dim
+        self.index_name = index_name
+        self.prefix = prefix
+        self._created = False
+    
+    async def _ensure_index(self):
+        """Crée l'index FT s'il n'existe pas encore"""
+        if self._created:
+            return
+        
+        from redis.commands.search.field import TagField, VectorField
+        from redis.commands.search.indexDefinition import IndexDefinition, IndexType
+        
+        ft = self.redis.ft(self.index_name)
+        
+        try:
+            await ft.info()
+        except Exception:
+            await ft.create_index(
+                fields=[
+                    TagField("key"),
+                    VectorField(
+                        "embedding",
+                        "HNSW",
+                        {
+                            "TYPE": "FLOAT32",
+                            "DIM": self.dim,
+                            "DISTANCE_METRIC": "COSINE",
+                        }
+                    ),
+                ],
+                definition=IndexDefinition(prefix=[self.prefix], index_type=IndexType.HASH)
+            )
+            logger.info(f"✅ Index RediSearch créé: {self.index_name} (dim={self.dim})")
+        
+        self._created = True
+    
+    async def add(self, key: str, embedding: List[float], ttl: Optional[int] = None):
+        """
+        Prépare l'index FT
+        
+        Le hash vecteur est écrit par le cache sémantique sous le préfixe
+        indexé : RediSearch l'indexe automatiquement à l'écriture.
+        """
+        await self._ensure_index()
+    
+    async def remove(self, *keys: str):
+        """Sans effet : les documents disparaissent avec leur hash vecteur"""
+        return None
+    
+    async def search(self, embedding: List[float], k: int = 1) -> List[Tuple[str, float]]:
+        """Cherche les k plus proches voisins via FT.SEARCH KNN"""
+        from redis.commands.search.query import Query
+        
+        await self._ensure_index()
+        
+        query = (
+            Query(f"*=>[KNN {k} @embedding $vec AS distance]")
+            .sort_by("distance")
+            .return_fields("key", "distance")
+            .dialect(2)
+        )
+        
+        results = await self.redis.ft(self.index_name).search(
+            query,
+            query_params={"vec": np.asarray(embedding, dtype=np.float32).tobytes()}
+        )
+        
+        return [
+            (doc.key, 1.0 - float(doc.distance))
+            for doc in results.docs
+        ]
+
+
+def create_vector_index(
+    backend: str,
+    redis: Redis,
+    dim: int,
+    ef_search: int = 128,
+    name: str = "semantic_cache",
+    prefix: str = "semantic_cache:vec:"
+):
+    """
+    Instancie l'index vectoriel configuré
+    
+    Args:
+        backend: "hnsw" (hnswlib), "flat" (NumPy exact) ou "redisearch"
+        redis: Client Redis (utilisé par RediSearch)
+        dim: Dimension des embeddings
+        ef_search: Largeur de recherche HNSW
+        name: Nom de l'index (RediSearch)
+        prefix: Préfixe des hashes vecteurs indexés (RediSearch)
+    
+    Returns:
+        Index vectoriel
+    """
+    if backend == "redisearch":
+        return RediSearchVectorIndex(redis, dim, index_name=f"idx:{name}", prefix=prefix)
+    if backend == "flat":
+        return FlatVectorIndex(dim)
+    if backend != "hnsw":
+        logger.warning(f"⚠️ Backend d'index inconnu '{backend}', défaut=hnsw")
+    return HnswVectorIndex(dim, ef_search=ef_search)
@@ -0,0 +1 @@
+"""Benchmarks de performance iAsted"""
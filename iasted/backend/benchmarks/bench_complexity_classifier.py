@@ -0,0 +1,89 @@
+"""
+Benchmark du classifieur local de complexité : latence et accord
+
+Mesure la latence par requête du classifieur logistique et son accord avec
+un jeu de requêtes vocales étiquetées (simple / medium / complex).
+
+Usage:
+    python -m benchmarks.bench_complexity_classifier
+"""
+
+import argparse
+import statistics
+import time
+
+from app.services.complexity_classifier import ComplexityClassifier
+
+LABELED_QUERIES = [
+    ("Bonjour iAsted", "simple"),
+    ("Merci beaucoup, au revoir", "simple"),
+    ("Salut, tu m'entends ?", "simple"),
+    ("Quel est le statut de mon signalement ?", "simple"),
+    ("Combien de signalements ai-je déposés ?", "simple"),
+    ("Où se trouve le bureau de la DGSS à Libreville ?", "simple"),
+    ("Quelle heure est-il ?", "simple"),
+    ("Qui traite mon dossier ?", "simple"),
+    ("Est-ce que mon signalement a été reçu ?", "simple"),
+    ("Quand ma plainte sera-t-elle examinée ?", "simple"),
+    ("Comment déposer un signalement anonyme ?", "medium"),
+    ("Pourquoi mon dossier est-il toujours en attente ?", "medium"),
+    ("Explique-moi la procédure de protection d'un projet", "medium"),
+    ("Quelle est la différence entre un signalement et une plainte ?", "medium"),
+    ("Résume-moi les derniers signalements de ma région", "medium"),
+    ("Quels sont les avantages du dépôt de brevet via Ndjobi ?", "medium"),
+    ("Compare les délais de traitement entre l'Estuaire et le Haut-Ogooué", "medium"),
+    ("Comment fonctionne l'anonymisation des témoins ?", "medium"),
+    ("Donne-moi des conseils pour documenter un cas de corruption", "medium"),
+    ("Que signifie le statut en cours d'instruction ?", "medium"),
+    ("Analyse les tendances de corruption dans la province de l'Ogooué-Maritime "
+     "sur les trois dernières années et propose des recommandations", "complex"),
+    ("Rédige un rapport détaillé sur les signalements du ministère de la santé", "complex"),
+    ("Génère un plan d'action pour réduire les délais de traitement, étape par étape", "complex"),
+    ("Écris un script Python qui exporte les signalements en CSV", "complex"),
+    ("Élabore une stratégie de communication pour la campagne anti-corruption, "
+     "puis évalue son impact attendu", "complex"),
+    ("Fais une synthèse des corrélations entre les montants détournés et les secteurs", "complex"),
+    ("Analyse ce cas, identifie les acteurs, ensuite propose une procédure d'enquête", "complex"),
+    ("Écris une requête SQL pour compter les signalements par province", "complex"),
+    ("Fais un audit approfondi des dossiers classés sans suite en 2024", "complex"),
+    ("Prépare un tableau comparatif des provinces avec projection pour 2026", "complex"),
+]
+
+
+def run(rounds: int):
+    classifier = ComplexityClassifier()
+    
+    correct = 0
+    for query, expected in LABELED_QUERIES:
+        label, confidence = classifier.classify(query)
+        correct += label == expected
+        marker = "✅" if label == expected else "❌"
+        print(f"{marker} {expected:<8} → {label:<8} ({confidence:.2f})  {query[:70]}")
+    
+    samples = []
+    for _ in range(rounds):
+        for query, _ in LABELED_QUERIES:
+            start = time.perf_counter()
+            classifier.classify(query)
+            samples.append(time.perf_counter() - start)
+    
+    samples.sort()
+    p50 = statistics.median(samples) * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    
+    print(
+        f"\nAccord: {correct}/{len(LABELED_QUERIES)}  "
+        f"Latence: p50={p50:.1f} µs  p99={p99:.1f} µs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    
+    run(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
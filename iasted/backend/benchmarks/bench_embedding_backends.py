@@ -0,0 +1,135 @@
+"""
+Benchmark des backends d'embeddings : démarrage, mémoire et débit
+
+Chaque configuration est mesurée dans un sous-processus neuf, pour que le
+temps de chargement et la mémoire résidente (RSS) reflètent un démarrage à
+froid de pod.
+
+Usage:
+    python -m benchmarks.bench_embedding_backends
+    python -m benchmarks.bench_embedding_backends --configs \\
+        "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2|onnx|onnx/model_qint8_avx512_vnni.onnx"
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+_MPNET = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+_MINILM = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+_ONNX_QINT8 = "onnx/model_qint8_avx512_vnni.onnx"
+
+DEFAULT_CONFIGS = [
+    f"{_MPNET}|torch|",
+    f"{_MPNET}|onnx|{_ONNX_QINT8}",
+    f"{_MINILM}|torch|",
+    f"{_MINILM}|onnx|{_ONNX_QINT8}",
+]
+
+SAMPLE_TEXTS = [
+    "Quel est le statut de mon signalement ?",
+    "Comment déposer une plainte pour corruption ?",
+    "Je veux protéger mon projet avec un brevet",
+    "Quelles sont les statistiques de la province de l'Estuaire ?",
+    "Peux-tu m'expliquer la procédure d'enquête ?",
+    "Où en est le dossier transmis la semaine dernière ?",
+    "Bonjour, j'ai besoin d'aide pour mon compte",
+    "Quels documents dois-je fournir pour un signalement anonyme ?",
+]
+
+
+def _rss_mb() -> float:
+    """Pic de mémoire résidente du processus courant (Mo)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en Ko sous Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(model_name: str, backend: str, model_file: str, rounds: int) -> dict:
+    """Mesure une configuration (exécuté dans le sous-processus)"""
+    baseline_rss = _rss_mb()
+    
+    start = time.perf_counter()
+    from sentence_transformers import SentenceTransformer
+    
+    kwargs = {"backend": backend}
+    if model_file and backend != "torch":
+        kwargs["model_kwargs"] = {"file_name": model_file}
+    encoder = SentenceTransformer(model_name, **kwargs)
+    load_time = time.perf_counter() - start
+    
+    encoder.encode(SAMPLE_TEXTS[:1], normalize_embeddings=True)
+    
+    start = time.perf_counter()
+    for i in range(rounds):
+        encoder.encode([SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]], normalize_embeddings=True)
+    single = rounds / (time.perf_counter() - start)
+    
+    batch = (SAMPLE_TEXTS * 4)[:32]
+    start = time.perf_counter()
+    for _ in range(max(1, rounds // 8)):
+        encoder.encode(batch, batch_size=len(batch), normalize_embeddings=True)
+    batched = max(1, rounds // 8) * len(batch) / (time.perf_counter() - start)
+    
+    return {
+        "load_s": load_time,
+        "rss_mb": _rss_mb() - baseline_rss,
+        "dim": encoder.get_sentence_embedding_dimension(),
+        "single_per_s": single,
+        "batch32_per_s": batched,
+    }
+
+
+def run(configs: list, rounds: int):
+    print(f"{rounds} encodages unitaires, batches de 32 (un sous-processus par config)\n")
+    
+    for config in configs:
+        model_name, backend, model_file = (config.split("|") + ["", ""])[:3]
+        
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_embedding_backends",
+             "--child", config, "--rounds", str(rounds)],
+            capture_output=True,
+            text=True
+        )
+        
+        label = f"{model_name.split('/')[-1]} [{backend}{' ' + model_file if model_file else ''}]"
+        
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "?"
+            print(f"❌ {label}: {error}")
+            continue
+        
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(
+            f"{label}\n"
+            f"    démarrage={result['load_s']:6.2f}s  rss=+{result['rss_mb']:7.1f} Mo  "
+            f"dim={result['dim']}  "
+            f"unitaire={result['single_per_s']:7.1f}/s  batch32={result['batch32_per_s']:7.1f}/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS,
+                        help="modèle|backend|fichier_poids")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        model_name, backend, model_file = (args.child.split("|") + ["", ""])[:3]
+        print(json.dumps(measure(model_name, backend or "torch", model_file, args.rounds)))
+        return
+    
+    run(args.configs, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark du cache sémantique : latence de lookup vs nombre d'entrées
+
+Compare les index vectoriels en mémoire (plat exact et HNSW) à l'ancien
+parcours linéaire (décodage JSON + cosine Python par entrée).
+
+Usage:
+    python -m benchmarks.bench_semantic_cache --sizes 1000 10000 50000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import numpy as np
+
+from app.services.vector_index import FlatVectorIndex, HnswVectorIndex
+
+
+def _random_embeddings(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Génère n embeddings aléatoires"""
+    return rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def _legacy_lookup(query: list, blobs: list) -> float:
+    """Reproduit l'ancien chemin : json.loads + cosine NumPy par entrée"""
+    best = 0.0
+    for blob in blobs:
+        embedding = json.loads(blob)["embedding"]
+        vec1 = np.array(query)
+        vec2 = np.array(embedding)
+        score = float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
+        best = max(best, score)
+    return best
+
+
+def _percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50={p50 * 1000:7.2f} ms  p99={p99 * 1000:7.2f} ms"
+
+
+async def _bench_index(index, embeddings: np.ndarray, queries: np.ndarray) -> tuple:
+    """Construit l'index puis mesure la latence de lookup"""
+    start = time.perf_counter()
+    for i, embedding in enumerate(embeddings):
+        await index.add(f"cache:{i}", embedding)
+    build_time = time.perf_counter() - start
+    
+    # Premier lookup hors mesure (construction paresseuse éventuelle)
+    await index.search(queries[0])
+    
+    samples = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(await index.search(query, k=1))
+        samples.append(time.perf_counter() - start)
+    
+    return build_time, samples, results
+
+
+async def run(sizes: list, dim: int, queries: int, legacy_max: int):
+    rng = np.random.default_rng(42)
+    
+    print(f"dim={dim}, {queries} requêtes par taille (paraphrases d'entrées existantes)\n")
+    
+    for size in sizes:
+        embeddings = _random_embeddings(size, dim, rng)
+        
+        # Requêtes proches d'entrées cachées : simule un cache hit
+        targets = rng.integers(0, size, queries)
+        query_set = embeddings[targets] + 0.1 * _random_embeddings(queries, dim, rng)
+        
+        for name, index in (("flat", FlatVectorIndex()), ("hnsw", HnswVectorIndex(dim))):
+            build_time, samples, results = await _bench_index(index, embeddings, query_set)
+            recall = np.mean([
+                bool(found) and found[0][0] == f"cache:{target}"
+                for found, target in zip(results, targets)
+            ])
+            print(
+                f"[{name:<6}] n={size:>7}  build={build_time:6.2f}s  "
+                f"{_percentiles(samples)}  recall@1={recall:.3f}"
+            )
+        
+        if size <= legacy_max:
+            blobs = [json.dumps({"embedding": e.tolist()}) for e in embeddings]
+            samples = []
+            for query in query_set[:5]:
+                start = time.perf_counter()
+                _legacy_lookup(query.tolist(), blobs)
+                samples.append(time.perf_counter() - start)
+            print(f"[legacy] n={size:>7}  (hors round-trips Redis)  {_percentiles(samples)}")
+        
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000, 100000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.sizes, args.dim, args.queries, args.legacy_max))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark du coût d'ouverture d'une connexion vocale : services par connexion vs partagés
+
+Simule N connexions WebSocket simultanées et mesure, pour chacune, le temps
+d'obtention des services STT/TTS/LLM et la mémoire retenue tant que les
+connexions restent ouvertes :
+
+- per-connection : STTService(), TTSService(), LLMRouter() construits à
+  chaque connexion (ancien comportement : genai.configure, nouveaux clients
+  OpenAI/Anthropic et leurs pools HTTP, canal gRPC Google TTS)
+- shared : instances du processus (get_stt_service, get_tts_service,
+  get_llm_router), créées une fois au démarrage
+
+Aucun appel réseau : les clients sont construits avec les clés de l'environnement
+(des valeurs factices suffisent). Le client Google TTS n'est construit que si
+GOOGLE_APPLICATION_CREDENTIALS est défini.
+
+Usage:
+    python -m benchmarks.bench_service_setup --connections 200
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+from app.services.llm_router import LLMRouter, get_llm_router
+from app.services.stt_service import STTService, get_stt_service
+from app.services.tts_service import TTSService, get_tts_service
+
+
+def _per_connection():
+    return STTService(), TTSService(), LLMRouter()
+
+
+def _shared():
+    return get_stt_service(), get_tts_service(), get_llm_router()
+
+
+def _run_mode(mode: str, connections: int) -> tuple:
+    setup = _per_connection if mode == "per-connection" else _shared
+    
+    if mode == "shared":
+        # Démarrage de l'application (lifespan), hors mesure par connexion
+        setup()
+    
+    # Temps : sans tracemalloc (qui ralentit fortement les allocations)
+    durations = []
+    sessions = []
+    for _ in range(connections):
+        start = time.perf_counter()
+        sessions.append(setup())
+        durations.append(time.perf_counter() - start)
+    
+    sessions.clear()
+    gc.collect()
+    
+    # Mémoire : retenue tant que les connexions sont ouvertes
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    
+    sessions = [setup() for _ in range(connections)]
+    
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    sessions.clear()
+    
+    return durations, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--modes", nargs="+", default=["per-connection", "shared"])
+    args = parser.parse_args()
+    
+    print(f"{args.connections} connexions simultanées\n")
+    
+    for mode in args.modes:
+        durations, retained = _run_mode(mode, args.connections)
+        durations.sort()
+        p50 = statistics.median(durations) * 1000
+        p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000
+        print(
+            f"[{mode:<14}] setup par connexion p50={p50:8.3f} ms  p95={p95:8.3f} ms  "
+            f"mémoire retenue={retained / 1024:9.1f} Ko "
+            f"({retained / 1024 / args.connections:7.2f} Ko/connexion)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark de charge TTS : retard de la boucle d'événements
+
+Lance N synthèses simultanées et mesure le retard d'un ticker de 10 ms
+pendant ce temps. Les providers sont simulés (latence fixe) pour isoler
+l'effet du code appelant :
+
+- legacy : appel synchrone dans la coroutine (ancien _synthesize_google)
+- google : TTSService avec client asynchrone
+- elevenlabs : TTSService avec SDK synchrone déporté dans le pool de threads
+
+Le cache audio TTS reste sur le chemin mais en mémoire seulement : le
+second niveau Redis fausserait les mesures (aller-retours réseau, ou
+erreurs de connexion sans Redis local).
+
+Usage:
+    python -m benchmarks.bench_tts_event_loop --concurrency 100 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from app.config import settings
+from app.services.tts_service import TTSService
+
+
+class FakeGoogleAsyncClient:
+    """Client Google asynchrone simulé"""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    async def synthesize_speech(self, input, voice, audio_config):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(audio_content=b"\x00" * 4096)
+
+
+class FakeElevenLabs:
+    """SDK ElevenLabs simulé : générateur synchrone bloquant"""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    def generate(self, text, voice, model, output_format=None):
+        for _ in range(4):
+            time.sleep(self.latency / 4)
+            yield b"\x00" * 1024
+
+
+def _service(provider: str, latency: float) -> TTSService:
+    """TTSService câblé sur un provider simulé (sans identifiants)"""
+    service = TTSService.__new__(TTSService)
+    service.provider = provider
+    service.google_client = FakeGoogleAsyncClient(latency) if provider == "google" else None
+    service.google_voice = None
+    service.elevenlabs_client = FakeElevenLabs(latency) if provider == "elevenlabs" else None
+    return service
+
+
+async def _legacy_synthesize(text: str, latency: float) -> bytes:
+    """Ancien chemin : appel réseau synchrone depuis une coroutine"""
+    time.sleep(latency)
+    return b"\x00" * 4096
+
+
+async def _monitor_lag(stop: asyncio.Event, interval: float, samples: list):
+    """Mesure le retard de réveil d'un ticker périodique"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - start - interval)
+
+
+async def _run_mode(mode: str, concurrency: int, latency: float) -> tuple:
+    samples = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_lag(stop, 0.01, samples))
+    await asyncio.sleep(0.05)
+    
+    if mode == "legacy":
+        jobs = [_legacy_synthesize("Bonjour", latency) for _ in range(concurrency)]
+    else:
+        service = _service(mode, latency)
+        jobs = [service.synthesize(f"Phrase numéro {i}.") for i in range(concurrency)]
+    
+    start = time.perf_counter()
+    await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await monitor
+    
+    return elapsed, samples
+
+
+async def run(concurrency: int, latency_ms: float, modes: list):
+    latency = latency_ms / 1000
+    # Avant la création du cache audio partagé (premier appel à synthesize)
+    settings.tts_cache_redis_enabled = False
+    
+    print(
+        f"{concurrency} synthèses simultanées, "
+        f"latence provider={latency_ms:.0f} ms, ticker=10 ms\n"
+    )
+    
+    for mode in modes:
+        elapsed, samples = await _run_mode(mode, concurrency, latency)
+        samples.sort()
+        p50 = statistics.median(samples) * 1000
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+        print(
+            f"[{mode:<10}] durée={elapsed:6.2f}s  "
+            f"retard boucle p50={p50:7.2f} ms  p99={p99:7.2f} ms  max={samples[-1] * 1000:7.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--modes", nargs="+", default=["legacy", "google", "elevenlabs"])
+    args = parser.parse_args()
+    
+    asyncio.run(run(args.concurrency, args.latency_ms, args.modes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark des protocoles WebSocket : json vs msgpack
+
+Encode le trafic sortant d'un tour de parole typique (transcriptions
+intermédiaires et finale, segments audio pcm16 en trames, réponse LLM) pour
+N sessions et compare le temps CPU d'encodage et les octets émis :
+
+- json : événements en texte JSON (encodage de WebSocket.send_json), audio brut
+- msgpack : tout en trames [séquence, type, corps]
+
+Usage:
+    python -m benchmarks.bench_ws_protocol --sessions 1000
+"""
+
+import argparse
+import json
+import os
+import time
+
+from app.core.ws_protocol import FRAME_AUDIO, FRAME_EVENT, pack_frame
+
+# 100 ms de PCM 16 bits à 24 kHz + en-tête de trame
+_AUDIO_FRAME = os.urandom(4800 + 8)
+
+
+def _turn_messages() -> list:
+    """Messages sortants d'un tour : (événement | audio)"""
+    words = (
+        "je voudrais savoir combien de signalements ont été traités ce mois-ci à Libreville"
+    ).split()
+    messages = []
+    
+    for i in range(1, len(words) + 1):
+        messages.append({
+            "type": "transcript",
+            "transcript": " ".join(words[:i]),
+            "is_final": False,
+            "confidence": 0.87
+        })
+    messages.append({
+        "type": "transcript",
+        "transcript": " ".join(words),
+        "is_final": True,
+        "confidence": 0.94
+    })
+    
+    answer = (
+        "Ce mois-ci, 1 284 signalements ont été traités à Libreville, "
+        "dont 312 classés prioritaires."
+    )
+    for index in range(3):
+        messages.append({
+            "type": "audio_segment",
+            "index": index,
+            "text": answer[index * 30:(index + 1) * 30]
+        })
+        messages.extend([_AUDIO_FRAME] * 15)
+    
+    messages.append({
+        "type": "llm_response",
+        "text": answer,
+        "provider": "gpt-4o-mini",
+        "cached": False,
+        "latency_ms": 812
+    })
+    messages.append({"type": "audio_end", "frames": 45})
+    return messages
+
+
+def _encode_json(messages: list) -> int:
+    size = 0
+    for message in messages:
+        if isinstance(message, bytes):
+            size += len(message)
+        else:
+            text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+            size += len(text.encode("utf-8"))
+    return size
+
+
+def _encode_msgpack(messages: list) -> int:
+    size = 0
+    for sequence, message in enumerate(messages):
+        kind = FRAME_AUDIO if isinstance(message, bytes) else FRAME_EVENT
+        size += len(pack_frame(sequence, kind, message))
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sessions", type=int, default=1000)
+    args = parser.parse_args()
+    
+    messages = _turn_messages()
+    events = [m for m in messages if not isinstance(m, bytes)]
+    print(
+        f"{args.sessions} sessions, {len(messages)} messages par tour "
+        f"({len(events)} événements)\n"
+    )
+    
+    for name, encode in (("json", _encode_json), ("msgpack", _encode_msgpack)):
+        start = time.perf_counter()
+        for _ in range(args.sessions):
+            total = encode(messages)
+        elapsed = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(args.sessions):
+            event_bytes = encode(events)
+        events_elapsed = time.perf_counter() - start
+        
+        print(
+            f"[{name:<7}] tour: {total:7d} octets, "
+            f"{elapsed / args.sessions * 1e6:7.1f} µs  |  "
+            f"événements seuls: {event_bytes:5d} octets, "
+            f"{events_elapsed / args.sessions * 1e6:6.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
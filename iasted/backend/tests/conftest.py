@@ -0,0 +1,104 @@
+"""
+Configuration commune des tests
+Aucun service externe n'est contacté : identifiants factices, modèle
+d'embeddings simulé, Redis en mémoire (fakeredis)
+"""
+
+import hashlib
+import os
+import re
+import time
+
+import numpy as np
+import pytest
+
+for _name in (
+    "DATABASE_URL",
+    "DEEPGRAM_API_KEY",
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "GOOGLE_AI_API_KEY",
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "SUPABASE_SERVICE_ROLE_KEY",
+):
+    os.environ.setdefault(_name, "test")
+
+
+class FakeEncoder:
+    """
+    Encodeur déterministe : sac de mots haché sur DIM dimensions
+    
+    Deux textes partageant la plupart de leurs mots sont proches, deux textes
+    sans mot commun sont orthogonaux (ou presque).
+    """
+    
+    DIM = 64
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.DIM
+    
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, normalize_embeddings=True):
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.DIM] += 1.0
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+@pytest.fixture
+def fake_encoder():
+    return FakeEncoder()
+
+
+@pytest.fixture
+async def embedding_service(fake_encoder):
+    """Service d'embeddings sur l'encodeur simulé, sans cache Redis"""
+    from app.services.embedding_service import EmbeddingService
+    
+    service = EmbeddingService(encoder=fake_encoder, max_wait_ms=1, workers=1)
+    service._l2_enabled = False
+    yield service
+    await service.close()
+
+
+@pytest.fixture
+async def redis_clients():
+    """Clients Redis texte et binaire partageant le même serveur en mémoire"""
+    import fakeredis
+    
+    server = fakeredis.FakeServer()
+    text = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    binary = fakeredis.aioredis.FakeRedis(server=server)
+    yield text, binary
+    await text.aclose()
+    await binary.aclose()
+
+
+@pytest.fixture
+async def semantic_cache(monkeypatch, redis_clients, embedding_service):
+    """Cache sémantique sur fakeredis, index vectoriel en mémoire"""
+    from app.config import settings
+    from app.services.semantic_cache import SemanticCache
+    
+    monkeypatch.setattr(settings, "semantic_cache_index_backend", "flat")
+    
+    cache = SemanticCache()
+    cache.embeddings = embedding_service
+    cache.redis, cache.redis_binary = redis_clients
+    cache.enabled = True
+    cache.similarity_threshold = 0.9
+    # Synchronisation déclenchée explicitement par les tests
+    cache.sync_interval = 3600
+    cache._last_sync = time.monotonic()
+    yield cache
+    
+    if cache._sync_task is not None:
+        cache._sync_task.cancel()
@@ -0,0 +1,93 @@
+"""
+Tests des formats audio de sortie et du découpage en trames
+"""
+
+import struct
+
+from app.config import settings
+from app.services.audio_frames import (
+    AUDIO_FORMATS,
+    FLAG_SEGMENT_END,
+    FRAME_HEADER,
+    AudioFrameWriter,
+    negotiate_audio_format,
+    split_frames,
+    strip_wav_header
+)
+
+
+def _ogg_page(granule: int, payload: bytes) -> bytes:
+    """Page Ogg minimale (un seul segment de données)"""
+    header = b"OggS" + struct.pack("<BBqIII", 0, 0, granule, 1, 0, 0)
+    return header + bytes([1, len(payload)]) + payload
+
+
+def _wav(samples: bytes) -> bytes:
+    fmt = struct.pack("<HHIIHH", 1, 1, 24000, 48000, 2, 16)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    body += b"data" + struct.pack("<I", len(samples)) + samples
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def test_frame_header_layout():
+    header = FRAME_HEADER.pack(7, 2, FLAG_SEGMENT_END)
+    
+    assert len(header) == 8
+    assert header == b"\x00\x00\x00\x07\x00\x02\x01\x00"
+
+
+def test_pcm16_frames_are_sample_aligned():
+    pcm16 = AUDIO_FORMATS["pcm16"]
+    frame_bytes = pcm16.sample_rate * 2 * settings.tts_stream_frame_ms // 1000
+    audio = bytes(frame_bytes * 3 + 10)
+    
+    frames = split_frames(audio, pcm16)
+    
+    assert [len(frame) for frame in frames] == [frame_bytes] * 3 + [10]
+    assert all(len(frame) % 2 == 0 for frame in frames)
+
+
+def test_opus_header_pages_travel_with_first_audio_page():
+    head, tags = _ogg_page(0, b"OpusHead"), _ogg_page(0, b"OpusTags")
+    audio_pages = [_ogg_page(960 * (i + 1), b"audio%d" % i) for i in range(3)]
+    
+    frames = split_frames(head + tags + b"".join(audio_pages), AUDIO_FORMATS["opus"])
+    
+    assert frames == [head + tags + audio_pages[0], audio_pages[1], audio_pages[2]]
+
+
+def test_malformed_ogg_and_mp3_are_sent_whole():
+    assert split_frames(b"not ogg", AUDIO_FORMATS["opus"]) == [b"not ogg"]
+    assert split_frames(b"mp3 data", AUDIO_FORMATS["mp3"]) == [b"mp3 data"]
+    assert split_frames(b"", AUDIO_FORMATS["pcm16"]) == []
+
+
+def test_strip_wav_header():
+    assert strip_wav_header(_wav(b"\x01\x02\x03\x04")) == b"\x01\x02\x03\x04"
+    assert strip_wav_header(b"\x01\x02") == b"\x01\x02"
+
+
+def test_negotiate_audio_format(monkeypatch):
+    monkeypatch.setattr(settings, "tts_audio_format", "mp3")
+    
+    assert negotiate_audio_format("opus", ["mp3", "opus"]).name == "opus"
+    assert negotiate_audio_format("opus", ["mp3", "pcm16"]).name == "mp3"
+    assert negotiate_audio_format("flac", ["mp3"]).name == "mp3"
+
+
+async def test_writer_numbers_frames_and_flags_segment_ends(monkeypatch):
+    monkeypatch.setattr(settings, "tts_stream_frame_ms", 10)
+    pcm16 = AUDIO_FORMATS["pcm16"]
+    frame_bytes = pcm16.sample_rate * 2 * 10 // 1000
+    sent = []
+    
+    async def send_bytes(data):
+        sent.append(data)
+    
+    writer = AudioFrameWriter(pcm16, send_bytes)
+    assert await writer.write_segment(0, bytes(frame_bytes * 2)) == 2
+    assert await writer.write_segment(1, bytes(frame_bytes)) == 1
+    
+    headers = [FRAME_HEADER.unpack(frame[:FRAME_HEADER.size]) for frame in sent]
+    assert headers == [(0, 0, 0), (1, 0, FLAG_SEGMENT_END), (2, 1, FLAG_SEGMENT_END)]
+    assert writer.sequence == 3
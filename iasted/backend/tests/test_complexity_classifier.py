@@ -0,0 +1,85 @@
+"""
+Tests du classifieur local de complexité
+"""
+
+import json
+import math
+
+import pytest
+
+from app.services import complexity_classifier
+from app.services.complexity_classifier import (
+    DEFAULT_WEIGHTS,
+    FEATURES,
+    ComplexityClassifier,
+    extract_features
+)
+
+
+@pytest.fixture
+def classifier():
+    return ComplexityClassifier()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Bonjour", "simple"),
+    ("Combien de signalements à Libreville ?", "simple"),
+    ("Explique-moi la procédure de dépôt d'une plainte", "medium"),
+    (
+        "Rédige un rapport détaillé analysant les tendances des signalements "
+        "puis propose une stratégie",
+        "complex"
+    ),
+    ("Écris un script python", "complex"),
+])
+def test_classify(classifier, query, expected):
+    label, confidence = classifier.classify(query)
+    
+    assert label == expected
+    assert 1 / 3 < confidence <= 1.0
+
+
+def test_probabilities_sum_to_one(classifier):
+    probabilities = classifier.predict_proba("Quelle est la tendance des signalements ?")
+    
+    assert set(probabilities) == {"simple", "medium", "complex"}
+    assert math.isclose(sum(probabilities.values()), 1.0)
+
+
+def test_extract_features():
+    features = extract_features("Explique d'abord la procédure, puis les étapes ?")
+    
+    assert set(features) == set(FEATURES)
+    # "explique" + "procédure"
+    assert features["explain"] == 2.0
+    # "d abord" (expression) + "puis" + "étapes"
+    assert features["connectors"] == 3.0
+    assert features["questions"] == 1.0
+    assert features["factual"] == 0.0
+    assert extract_features("")["log_words"] == 0.0
+
+
+def test_missing_weights_are_rejected():
+    weights = {name: list(values) for name, values in DEFAULT_WEIGHTS.items() if name != "code"}
+    
+    with pytest.raises(ValueError, match="code"):
+        ComplexityClassifier(weights)
+
+
+def test_weights_file_and_fallback(tmp_path, monkeypatch):
+    weights = {name: [0.0, 0.0, 0.0] for name in FEATURES}
+    weights["bias"] = [0.0, 0.0, 5.0]
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps(weights), encoding="utf-8")
+    
+    assert ComplexityClassifier.from_file(str(path)).classify("Bonjour")[0] == "complex"
+    
+    monkeypatch.setattr(complexity_classifier, "_classifier", None)
+    monkeypatch.setattr(
+        complexity_classifier.settings,
+        "llm_router_classifier_weights_path",
+        str(tmp_path / "absent.json")
+    )
+    assert complexity_classifier.get_complexity_classifier().weights == {
+        name: tuple(values) for name, values in DEFAULT_WEIGHTS.items()
+    }
@@ -0,0 +1,42 @@
+"""Tests de la sérialisation binaire des embeddings"""
+
+import numpy as np
+import pytest
+
+from app.services.vector_index import EMBEDDING_DTYPES, pack_embedding, unpack_embedding
+
+
+@pytest.fixture
+def vector() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    vector = rng.standard_normal(384).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_float32_round_trip_is_exact(vector):
+    packed = pack_embedding(vector, "float32")
+    
+    assert len(packed) == 384 * 4
+    np.testing.assert_array_equal(unpack_embedding(packed, "float32"), vector)
+
+
+@pytest.mark.parametrize("dtype, size", [("float16", 384 * 2), ("int8", 384 + 4)])
+def test_compact_dtypes_preserve_cosine_similarity(vector, dtype, size):
+    packed = pack_embedding(vector, dtype)
+    restored = unpack_embedding(packed, dtype)
+    
+    assert len(packed) == size
+    assert restored.dtype == np.float32
+    cosine = float(restored @ vector) / float(np.linalg.norm(restored))
+    assert cosine > 0.999
+
+
+def test_int8_handles_null_vector():
+    restored = unpack_embedding(pack_embedding(np.zeros(8, dtype=np.float32), "int8"), "int8")
+    
+    np.testing.assert_array_equal(restored, np.zeros(8, dtype=np.float32))
+
+
+def test_default_dtype_is_float32(vector):
+    assert "float32" in EMBEDDING_DTYPES
+    assert pack_embedding(vector) == pack_embedding(vector, "float32")
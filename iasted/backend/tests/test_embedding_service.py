@@ -0,0 +1,70 @@
+"""
+Tests du service d'embeddings (mémoïsation, partage des encodages en cours)
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.services.embedding_service import EmbeddingService
+from tests.conftest import FakeEncoder
+
+
+class SlowEncoder(FakeEncoder):
+    """Encodeur qui occupe le thread de calcul le temps d'un vrai modèle"""
+    
+    def encode(self, texts, **kwargs):
+        time.sleep(0.1)
+        return super().encode(texts, **kwargs)
+
+
+@pytest.fixture
+async def slow_service():
+    service = EmbeddingService(encoder=SlowEncoder(), max_wait_ms=1, workers=1)
+    service._l2_enabled = False
+    yield service
+    await service.close()
+
+
+async def test_embed_is_memoized(embedding_service, fake_encoder):
+    first = await embedding_service.embed("Combien de signalements ?")
+    second = await embedding_service.embed("combien de signalements")
+    
+    assert np.array_equal(first, second)
+    assert fake_encoder.calls == 1
+
+
+async def test_concurrent_embeds_share_one_encoding(slow_service):
+    results = await asyncio.gather(*(slow_service.embed("signalements") for _ in range(5)))
+    
+    assert all(np.array_equal(results[0], result) for result in results)
+    assert slow_service.encoder.calls == 1
+
+
+async def test_waiter_survives_owner_cancellation(slow_service):
+    owner = asyncio.create_task(slow_service.embed("signalements"))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(slow_service.embed("signalements"))
+    await asyncio.sleep(0.01)
+    
+    owner.cancel()
+    
+    embedding = await asyncio.wait_for(waiter, timeout=2)
+    assert embedding.shape == (FakeEncoder.DIM,)
+    assert owner.cancelled()
+    assert not slow_service._inflight
+
+
+async def test_cancelled_waiter_does_not_cancel_owner(slow_service):
+    owner = asyncio.create_task(slow_service.embed("signalements"))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(slow_service.embed("signalements"))
+    await asyncio.sleep(0.01)
+    
+    waiter.cancel()
+    
+    embedding = await asyncio.wait_for(owner, timeout=2)
+    assert embedding.shape == (FakeEncoder.DIM,)
+    assert waiter.cancelled()
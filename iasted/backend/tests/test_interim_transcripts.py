@@ -0,0 +1,102 @@
+"""
+Tests de la limitation des transcriptions intermédiaires
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.interim_transcripts import InterimTranscriptThrottle, interim_mode
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+def _throttle(sent, interval_ms=50, mode="full"):
+    async def send(message):
+        sent.append(message)
+    return InterimTranscriptThrottle(send, interval_ms=interval_ms, mode=mode)
+
+
+def _apply_diffs(messages):
+    """Reconstruit le texte côté client à partir des diffs"""
+    text = ""
+    for message in messages:
+        text = text[:message["offset"]] + message["text"]
+    return text
+
+
+async def test_full_mode_sends_latest_once_per_interval(sent):
+    throttle = _throttle(sent)
+    
+    await throttle.push("je", 0.8)
+    await throttle.push("je voudrais", 0.8)
+    await throttle.push("je voudrais savoir", 0.9)
+    assert [message["transcript"] for message in sent] == ["je"]
+    
+    await asyncio.sleep(0.15)
+    assert [message["transcript"] for message in sent] == ["je", "je voudrais savoir"]
+    assert sent[-1] == {
+        "type": "transcript",
+        "is_final": False,
+        "confidence": 0.9,
+        "transcript": "je voudrais savoir"
+    }
+
+
+async def test_duplicates_are_not_resent(sent):
+    throttle = _throttle(sent, interval_ms=0)
+    
+    await throttle.push("bonjour", 0.9)
+    await throttle.push("bonjour", 0.95)
+    
+    assert len(sent) == 1
+
+
+async def test_diff_mode_sends_suffix_from_common_prefix(sent):
+    throttle = _throttle(sent, interval_ms=0, mode="diff")
+    
+    for text in ("je voudrais", "je voudrais savoir", "je voudrais savoir combien", "je voulais"):
+        await throttle.push(text, 0.9)
+    
+    assert [(message["offset"], message["text"]) for message in sent] == [
+        (0, "je voudrais"),
+        (11, " savoir"),
+        (18, " combien"),
+        (6, "lais"),
+    ]
+    assert _apply_diffs(sent) == "je voulais"
+    assert "transcript" not in sent[0]
+
+
+async def test_reset_cancels_pending_and_restarts_diff(sent):
+    throttle = _throttle(sent, mode="diff")
+    
+    await throttle.push("première phrase", 0.9)
+    await throttle.push("première phrase complète", 0.9)
+    throttle.reset()
+    await asyncio.sleep(0.15)
+    
+    # L'intermédiaire en attente est périmé par le résultat final
+    assert len(sent) == 1
+    
+    await throttle.push("seconde", 0.9)
+    assert sent[-1]["offset"] == 0 and sent[-1]["text"] == "seconde"
+
+
+def test_mode_negotiation(monkeypatch, sent):
+    monkeypatch.setattr(settings, "voice_interim_mode", "diff")
+    
+    assert interim_mode("full") == "full"
+    assert interim_mode("inconnu") == "diff"
+    
+    monkeypatch.setattr(settings, "voice_interim_mode", "inconnu")
+    assert interim_mode(None) == "full"
+    
+    throttle = _throttle(sent, interval_ms=120, mode="diff")
+    assert throttle.describe() == {"mode": "diff", "interval_ms": 120}
+    throttle.set_mode("full")
+    assert not throttle.diff
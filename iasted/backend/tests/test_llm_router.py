@@ -0,0 +1,217 @@
+"""
+Tests du LLM Router (cache des décisions de routage, streaming)
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.config import settings
+from app.core.lru import LRUCache
+from app.services.llm_router import LLMChunk, LLMProvider, LLMRouter
+
+DELTAS = ["Bonjour", "", " à vous"]
+
+
+def _counter(name):
+    return REGISTRY.get_sample_value(name) or 0.0
+
+
+@pytest.fixture
+def router():
+    router = LLMRouter()
+    router.routing_cache = LRUCache(3)
+    router.decisions = 0
+    
+    decide = router._decide_provider
+    
+    async def counting_decide(query):
+        router.decisions += 1
+        return await decide(query)
+    
+    router._decide_provider = counting_decide
+    return router
+
+
+async def test_equivalent_phrasings_hit_cache(router):
+    hits = _counter("routing_cache_hits_total")
+    misses = _counter("routing_cache_misses_total")
+    
+    first = await router._select_provider("Combien de signalements à Libreville ?", {})
+    second = await router._select_provider("  combien de SIGNALEMENTS à libreville", {})
+    
+    assert first == second
+    assert router.decisions == 1
+    assert len(router.routing_cache) == 1
+    assert _counter("routing_cache_hits_total") == hits + 1
+    assert _counter("routing_cache_misses_total") == misses + 1
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Bonjour", LLMProvider.GEMINI_FLASH),
+    ("Explique-moi la procédure de dépôt d'une plainte", LLMProvider.GPT_4O_MINI),
+    (
+        "Rédige un rapport détaillé analysant les tendances des signalements "
+        "puis propose une stratégie",
+        LLMProvider.CLAUDE_HAIKU
+    ),
+    ("Écris un script python", LLMProvider.CLAUDE_HAIKU),
+])
+async def test_cached_decision_matches_uncached(router, query, expected):
+    uncached = await router._select_provider(query, {})
+    cached = await router._select_provider(query.upper() + " ?", {})
+    
+    assert uncached == cached == expected
+    assert router.decisions == 1
+
+
+async def test_cache_stays_within_size_bound(router):
+    queries = [f"Signalements de la province numéro {i}" for i in range(10)]
+    
+    for query in queries:
+        await router._select_provider(query, {})
+    
+    assert len(router.routing_cache) == 3
+    
+    # Les plus anciennes ont été évincées : elles sont recalculées
+    decisions = router.decisions
+    await router._select_provider(queries[0], {})
+    assert router.decisions == decisions + 1
+    
+    await router._select_provider(queries[-1], {})
+    assert router.decisions == decisions + 1
+
+
+class NoTextChunk:
+    """Chunk Gemini dont .text lève ValueError (fin de génération)"""
+    
+    @property
+    def text(self):
+        raise ValueError("no text part")
+
+
+class FakeGeminiResponse:
+    """Réponse streamée Gemini : un chunk sans texte au milieu, usage absent"""
+    
+    usage_metadata = None
+    
+    def __init__(self, deltas):
+        self.deltas = deltas
+    
+    async def __aiter__(self):
+        for index, delta in enumerate(self.deltas):
+            if index == 1:
+                yield NoTextChunk()
+            yield SimpleNamespace(text=delta)
+
+
+class FakeOpenAIStream:
+    def __init__(self, deltas, error=None):
+        self.deltas = deltas
+        self.error = error
+        self.closed = False
+    
+    async def __aiter__(self):
+        for delta in self.deltas:
+            delta = SimpleNamespace(content=delta)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+            if self.error is not None:
+                raise self.error
+        
+        yield SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=7))
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeClaudeStream:
+    def __init__(self, deltas):
+        self.deltas = deltas
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    @property
+    async def text_stream(self):
+        for delta in self.deltas:
+            yield delta
+    
+    async def get_final_message(self):
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=3, output_tokens=4))
+
+
+def _stub_providers(router, deltas=DELTAS, openai_stream=None):
+    openai_stream = openai_stream or FakeOpenAIStream(deltas)
+    
+    async def generate_content_async(prompt, stream=False):
+        return FakeGeminiResponse(deltas)
+    
+    async def create(**kwargs):
+        return openai_stream
+    
+    router.gemini = SimpleNamespace(generate_content_async=generate_content_async)
+    router.openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    router.anthropic_client = SimpleNamespace(
+        messages=SimpleNamespace(stream=lambda **kwargs: FakeClaudeStream(deltas))
+    )
+    return openai_stream
+
+
+@pytest.mark.parametrize("provider, tokens, model", [
+    (LLMProvider.GEMINI_FLASH, 3 * 1.3, settings.gemini_model),
+    (LLMProvider.GPT_4O_MINI, 7, settings.openai_model),
+    (LLMProvider.CLAUDE_HAIKU, 7, settings.anthropic_model),
+])
+async def test_stream_chunk_shape(router, provider, tokens, model):
+    _stub_providers(router)
+    
+    chunks = [
+        chunk async for chunk in
+        router.route_and_stream("Bonjour", {}, force_provider=provider)
+    ]
+    
+    assert all(isinstance(chunk, LLMChunk) for chunk in chunks)
+    assert {chunk.provider for chunk in chunks} == {provider}
+    
+    # Deltas non vides, puis exactement un fragment final
+    assert [chunk.text for chunk in chunks] == ["Bonjour", " à vous", ""]
+    assert [chunk.done for chunk in chunks] == [False, False, True]
+    assert chunks[-1].metadata == pytest.approx({"tokens": tokens, "model": model})
+    assert all(chunk.metadata == {} for chunk in chunks[:-1])
+    
+    assert router.cost_tracker[provider] > 0
+
+
+async def test_stream_selects_provider_when_not_forced(router):
+    _stub_providers(router)
+    
+    chunks = [chunk async for chunk in router.route_and_stream("Bonjour", {})]
+    
+    assert {chunk.provider for chunk in chunks} == {LLMProvider.GEMINI_FLASH}
+    assert sum(chunk.done for chunk in chunks) == 1
+    assert router.decisions == 1
+
+
+async def test_stream_error_propagates_without_done_chunk(router):
+    stream = _stub_providers(
+        router,
+        openai_stream=FakeOpenAIStream(DELTAS, error=RuntimeError("coupure réseau"))
+    )
+    chunks = []
+    
+    with pytest.raises(RuntimeError, match="coupure réseau"):
+        async for chunk in router.route_and_stream(
+            "Bonjour", {}, force_provider=LLMProvider.GPT_4O_MINI
+        ):
+            chunks.append(chunk)
+    
+    assert [chunk.text for chunk in chunks] == ["Bonjour"]
+    assert not any(chunk.done for chunk in chunks)
+    assert stream.closed
+    assert router.cost_tracker[LLMProvider.GPT_4O_MINI] == 0.0
@@ -0,0 +1,236 @@
+"""
+Tests du cache sémantique (fakeredis, index vectoriel en mémoire)
+"""
+
+import asyncio
+import time
+
+from app.services.semantic_cache import SemanticCache
+
+ADMIN_GABON = {"role": "admin", "organization": "Ministère de l'Intérieur"}
+
+
+def test_partition_keeps_accented_organizations_apart(semantic_cache):
+    partition = semantic_cache._partition
+    
+    assert partition({"role": "admin", "organization": "Société"}) != partition(
+        {"role": "admin", "organization": "Societe"}
+    )
+    assert partition({"role": "admin", "organization": "Société"}) == "admin:société"
+    assert partition({"role": "admin", "organization": "SOCIÉTÉ"}) == "admin:société"
+
+
+def test_partition_normalizes_unicode_forms(semantic_cache):
+    composed = "Minist\u00e8re"
+    decomposed = "Ministe\u0300re"
+    
+    assert semantic_cache._partition({"organization": composed}) == semantic_cache._partition(
+        {"organization": decomposed}
+    )
+
+
+def test_partition_defaults(semantic_cache):
+    assert semantic_cache._partition(None) == "user:default"
+    assert semantic_cache._partition({"role": "inconnu"}) == "user:default"
+    assert semantic_cache._partition({"organization": "  / "}) == "user:default"
+    assert semantic_cache._partition(ADMIN_GABON) == "admin:ministère_de_l_intérieur"
+
+
+async def test_exact_and_semantic_hits(semantic_cache):
+    await semantic_cache.set("combien de signalements à Libreville", "42", ADMIN_GABON)
+    
+    exact = await semantic_cache.lookup("Combien de signalements à Libreville ?", ADMIN_GABON)
+    assert exact is not None and exact.tier == "exact" and exact.response == "42"
+    
+    semantic = await semantic_cache.lookup("à Libreville combien de signalements", ADMIN_GABON)
+    assert semantic is not None and semantic.tier == "semantic" and semantic.response == "42"
+    
+    assert await semantic_cache.lookup("météo demain à Port-Gentil", ADMIN_GABON) is None
+
+
+async def test_partitions_do_not_share_answers(semantic_cache):
+    societe = {"role": "admin", "organization": "Société"}
+    await semantic_cache.set("combien de signalements", "42", societe)
+    
+    assert await semantic_cache.lookup(
+        "combien de signalements", {"role": "admin", "organization": "Societe"}
+    ) is None
+    assert await semantic_cache.lookup(
+        "combien de signalements", {"role": "user", "organization": "Société"}
+    ) is None
+    assert (await semantic_cache.get("combien de signalements", societe))[0] == "42"
+
+
+async def test_lfu_new_entry_is_not_evicted_by_its_own_write(semantic_cache):
+    semantic_cache.eviction_policy = "lfu"
+    semantic_cache.partition_max_entries = 3
+    
+    for query in ("zzz premier", "yyy deuxième", "xxx troisième", "aaa quatrième"):
+        await semantic_cache.set(query, f"réponse {query}", ADMIN_GABON)
+    
+    newest = await semantic_cache.lookup("aaa quatrième", ADMIN_GABON)
+    assert newest is not None and newest.tier == "exact"
+    
+    stats = await semantic_cache.get_stats()
+    assert stats["total_entries"] == 3
+    assert stats["total_evictions"] == 1
+
+
+async def test_lfu_keeps_frequently_served_entries(semantic_cache):
+    semantic_cache.eviction_policy = "lfu"
+    semantic_cache.partition_max_entries = 2
+    
+    await semantic_cache.set("zzz populaire", "A", ADMIN_GABON)
+    for _ in range(3):
+        await semantic_cache.lookup("zzz populaire", ADMIN_GABON)
+    await semantic_cache.set("yyy rare", "B", ADMIN_GABON)
+    await semantic_cache.set("xxx nouvelle", "C", ADMIN_GABON)
+    
+    assert await semantic_cache.lookup("zzz populaire", ADMIN_GABON) is not None
+    assert await semantic_cache.lookup("xxx nouvelle", ADMIN_GABON) is not None
+    assert await semantic_cache.lookup("yyy rare", ADMIN_GABON) is None
+
+
+async def test_byte_budget_evicts_only_until_under_budget(semantic_cache):
+    semantic_cache.eviction_policy = "lru"
+    
+    for index in range(10):
+        await semantic_cache.set(f"question numéro {index}", "x" * 100, ADMIN_GABON)
+    
+    partition = semantic_cache._partition(ADMIN_GABON)
+    sizes = await semantic_cache.redis.hgetall(semantic_cache._sizes_key(partition))
+    entry_size = max(int(size) for size in sizes.values())
+    
+    # Budget : deux entrées de moins que l'occupation actuelle
+    budget = semantic_cache.partition_max_bytes = sum(map(int, sizes.values())) - 2 * entry_size
+    await semantic_cache.set("question numéro 10", "x" * 100, ADMIN_GABON)
+    
+    stats = await semantic_cache.get_stats()
+    assert budget - entry_size < stats["total_size_bytes"] <= budget
+    assert 3 <= stats["total_evictions"] <= 4
+    assert await semantic_cache.lookup("question numéro 10", ADMIN_GABON) is not None
+
+
+async def _expire(cache, query, user_context):
+    """Simule l'expiration TTL d'une entrée : hashes supprimés par Redis, références restantes"""
+    partition = cache._partition(user_context)
+    cache_key = cache._cache_key(partition, query)
+    await cache.redis.delete(cache_key, cache._vector_key(cache_key))
+    await cache.redis.zadd(cache._index_key(partition), {cache_key: 1})
+    return cache_key
+
+
+async def test_concurrent_writes_of_the_same_question_count_once(semantic_cache):
+    await asyncio.gather(*(
+        semantic_cache.set("combien de signalements", f"réponse {index}", ADMIN_GABON)
+        for index in range(5)
+    ))
+    
+    partition = semantic_cache._partition(ADMIN_GABON)
+    sizes = await semantic_cache.redis.hgetall(semantic_cache._sizes_key(partition))
+    stats = await semantic_cache.get_stats()
+    
+    assert stats["total_entries"] == 1
+    assert stats["total_size_bytes"] == sum(map(int, sizes.values()))
+
+
+async def test_stats_follow_concurrent_writes_and_pruning(semantic_cache):
+    queries = [f"question {index}" for index in range(3)]
+    await asyncio.gather(
+        *(semantic_cache.set(query, "réponse", ADMIN_GABON) for query in queries),
+        semantic_cache._sync_index()
+    )
+    assert (await semantic_cache.get_stats())["total_entries"] == 3
+    
+    await _expire(semantic_cache, queries[0], ADMIN_GABON)
+    await asyncio.gather(
+        semantic_cache.set("question 3", "réponse", ADMIN_GABON),
+        semantic_cache._sync_index()
+    )
+    
+    stats = await semantic_cache.get_stats()
+    assert stats["total_entries"] == 3
+    assert stats["partitions"]["admin:ministère_de_l_intérieur"]["index_entries"] == 3
+
+
+async def test_sync_prunes_partitions_not_loaded_on_this_pod(semantic_cache, embedding_service):
+    await semantic_cache.set("question ancienne", "réponse", ADMIN_GABON)
+    await _expire(semantic_cache, "question ancienne", ADMIN_GABON)
+    
+    other_pod = SemanticCache()
+    other_pod.embeddings = embedding_service
+    other_pod.redis, other_pod.redis_binary = semantic_cache.redis, semantic_cache.redis_binary
+    assert not other_pod.indexes
+    
+    await other_pod._sync_index()
+    
+    stats = await other_pod.get_stats()
+    assert stats["total_entries"] == 0
+    assert stats["total_size_bytes"] == 0
+
+
+async def test_pruning_keeps_an_entry_rewritten_since_listing(semantic_cache):
+    await semantic_cache.set("question", "réponse", ADMIN_GABON)
+    cache_key = semantic_cache._cache_key(semantic_cache._partition(ADMIN_GABON), "question")
+    
+    # Listée comme expirée juste avant d'être réécrite (nouvelle expiration)
+    assert await semantic_cache._delete_entries([cache_key], expired_before=time.time()) == 0
+    assert (await semantic_cache.get_stats())["total_entries"] == 1
+
+
+async def test_audio_is_counted_once_and_dropped_on_rewrite(semantic_cache):
+    await semantic_cache.set("question", "réponse", ADMIN_GABON)
+    hit = await semantic_cache.lookup("question", ADMIN_GABON)
+    before = (await semantic_cache.get_stats())["total_size_bytes"]
+    
+    await asyncio.gather(*(semantic_cache.set_audio(hit.key, b"x" * 1000) for _ in range(3)))
+    with_audio = (await semantic_cache.get_stats())["total_size_bytes"]
+    assert with_audio == before + len("audio") + 1000
+    
+    await semantic_cache.set("question", "nouvelle réponse", ADMIN_GABON)
+    hit = await semantic_cache.lookup("question", ADMIN_GABON, with_audio=True)
+    assert hit.response == "nouvelle réponse" and hit.audio is None
+    assert (await semantic_cache.get_stats())["total_size_bytes"] < with_audio
+
+
+def _user(user_id):
+    return dict(ADMIN_GABON, user_id=user_id)
+
+
+async def test_clear_user_cache_erases_only_that_user(semantic_cache):
+    await semantic_cache.set("question alpha", "A", _user("alice"))
+    await semantic_cache.set("question beta", "B", _user("alice"))
+    await semantic_cache.set("question gamma", "C", _user("bob"))
+    
+    assert (await semantic_cache.get_user_stats("alice"))["total_entries"] == 2
+    
+    await semantic_cache.clear_user_cache("alice")
+    
+    assert (await semantic_cache.get_user_stats("alice"))["total_entries"] == 0
+    assert await semantic_cache.lookup("question alpha", ADMIN_GABON) is None
+    assert await semantic_cache.lookup("question gamma", ADMIN_GABON) is not None
+    assert (await semantic_cache.get_user_stats("bob"))["total_entries"] == 1
+    assert (await semantic_cache.get_stats())["total_entries"] == 1
+
+
+async def test_erasing_a_shared_entry_leaves_no_dangling_reference(semantic_cache):
+    await semantic_cache.set("question partagée", "réponse", _user("alice"))
+    await semantic_cache.set("question partagée", "réponse", _user("bob"))
+    
+    await semantic_cache.clear_user_cache("bob")
+    
+    assert await semantic_cache.lookup("question partagée", ADMIN_GABON) is None
+    assert (await semantic_cache.get_user_stats("alice"))["total_entries"] == 0
+    assert (await semantic_cache.get_stats())["total_entries"] == 0
+
+
+async def test_zero_budgets_mean_unlimited(semantic_cache):
+    semantic_cache.partition_max_entries = 0
+    semantic_cache.partition_max_bytes = 0
+    
+    for index in range(3):
+        await semantic_cache.set(f"question {index}", "réponse", ADMIN_GABON)
+    
+    stats = await semantic_cache.get_stats()
+    assert stats["total_entries"] == 3
+    assert stats["total_evictions"] == 0
@@ -0,0 +1,76 @@
+"""
+Tests du découpage incrémental du texte streamé
+"""
+
+from app.services.sentence_segmenter import SentenceSegmenter
+
+
+def _stream(segmenter, text, step=3):
+    """Alimente le découpeur par petits deltas, comme un stream LLM"""
+    segments = []
+    for start in range(0, len(text), step):
+        segments.extend(segmenter.feed(text[start:start + step]))
+    last = segmenter.flush()
+    return segments + ([last] if last else [])
+
+
+def test_splits_on_sentence_boundaries():
+    text = (
+        "Le signalement a bien été enregistré. Il sera traité sous quarante-huit heures ! "
+        "Voulez-vous recevoir une notification ?"
+    )
+    segmenter = SentenceSegmenter(min_chars=10, first_min_chars=10)
+    
+    assert _stream(segmenter, text) == [
+        "Le signalement a bien été enregistré.",
+        "Il sera traité sous quarante-huit heures !",
+        "Voulez-vous recevoir une notification ?",
+    ]
+
+
+def test_first_segment_cuts_at_clause():
+    segmenter = SentenceSegmenter(min_chars=40, first_min_chars=10)
+    text = "D'après nos données, le nombre de signalements a augmenté, surtout à Libreville."
+    
+    segments = _stream(segmenter, text)
+    
+    assert segments[0] == "D'après nos données,"
+    # Les segments suivants attendent une fin de phrase
+    assert segments[1:] == ["le nombre de signalements a augmenté, surtout à Libreville."]
+
+
+def test_decimals_and_abbreviations_do_not_end_sentences():
+    segmenter = SentenceSegmenter(min_chars=5, first_min_chars=5)
+    text = "Le taux est de 3.5 pour cent selon M. Ndong, cf. le rapport. Fin de la réponse."
+    
+    segments = segmenter.feed(text) + [segmenter.flush()]
+    
+    assert segments == [
+        "Le taux est de 3.5 pour cent selon M. Ndong, cf. le rapport.",
+        "Fin de la réponse.",
+    ]
+
+
+def test_short_fragments_wait_for_min_chars():
+    segmenter = SentenceSegmenter(min_chars=30, first_min_chars=30)
+    
+    assert segmenter.feed("Oui. ") == []
+    assert segmenter.feed("C'est bien noté pour vous. ") == ["Oui. C'est bien noté pour vous."]
+
+
+def test_long_text_is_forced_at_max_chars():
+    segmenter = SentenceSegmenter(min_chars=10, max_chars=50)
+    text = "mot " * 40
+    
+    segments = _stream(segmenter, text)
+    
+    assert all(len(segment) <= 50 for segment in segments)
+    assert " ".join(segments).split() == text.split()
+
+
+def test_flush_returns_remainder_once():
+    segmenter = SentenceSegmenter()
+    segmenter.feed("Réponse sans ponctuation finale")
+    
+    assert segmenter.flush() == "Réponse sans ponctuation finale"
+    assert segmenter.flush() is None
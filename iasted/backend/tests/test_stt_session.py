@@ -0,0 +1,142 @@
+"""
+Tests de la connexion STT persistante (reprise après coupure)
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services.stt_service import STTSession
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+        self.fail = False
+        self.finished = False
+    
+    def on(self, event, handler):
+        pass
+    
+    async def start(self, options):
+        return True
+    
+    async def send(self, data):
+        if self.fail:
+            return False
+        self.sent.append(data)
+        return True
+    
+    async def finalize(self):
+        return not self.fail
+    
+    async def keep_alive(self):
+        return True
+    
+    async def finish(self):
+        self.finished = True
+
+
+class FakeDeepgram:
+    def __init__(self):
+        self.connections = []
+        self.listen = SimpleNamespace(asyncwebsocket=SimpleNamespace(v=self._connection))
+    
+    def _connection(self, version):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+
+@pytest.fixture
+async def open_session(monkeypatch):
+    monkeypatch.setattr(settings, "stt_keepalive_interval", 3600)
+    sessions = []
+    
+    async def open_session(encoding=None, sample_rate=None):
+        client = FakeDeepgram()
+        session = STTSession(client, "fr", "nova-3", encoding=encoding, sample_rate=sample_rate)
+        await session.start()
+        sessions.append(session)
+        return session, client
+    
+    yield open_session
+    
+    for session in sessions:
+        await session.close()
+
+
+async def _drain(session):
+    """Laisse la tâche d'envoi vider la file"""
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert session._audio.empty()
+
+
+def _events(session):
+    events = []
+    while not session._results.empty():
+        events.append(session._results.get_nowait()["event"])
+    return events
+
+
+async def test_pcm_stream_reconnects_mid_stream(open_session):
+    session, client = await open_session("linear16", 16000)
+    
+    session.send(b"chunk-1")
+    await _drain(session)
+    client.connections[0].fail = True
+    session.send(b"chunk-2")
+    await _drain(session)
+    
+    assert len(client.connections) == 2
+    assert client.connections[1].sent == [b"chunk-2"]
+    assert not session.lost
+    assert _events(session) == []
+
+
+async def test_container_stream_is_not_resumed_mid_stream(open_session):
+    session, client = await open_session()
+    
+    session.send(b"webm-header+cluster")
+    await _drain(session)
+    client.connections[0].fail = True
+    session.send(b"cluster-2")
+    await _drain(session)
+    
+    # Aucun cluster sans en-tête envoyé à une nouvelle connexion
+    assert len(client.connections) == 1
+    assert session.lost
+    assert _events(session) == ["stream_lost"]
+    
+    session.send(b"cluster-3")
+    await _drain(session)
+    assert client.connections[0].sent == [b"webm-header+cluster"]
+
+
+async def test_container_stream_dropped_by_deepgram(open_session):
+    session, client = await open_session()
+    
+    session.send(b"webm-header+cluster")
+    await _drain(session)
+    # Fermeture côté Deepgram (callback Close)
+    await session._on_close(client.connections[0], None)
+    session.send(b"cluster-2")
+    await _drain(session)
+    
+    assert len(client.connections) == 1
+    assert _events(session) == ["stream_lost"]
+
+
+async def test_container_reconnects_before_first_chunk(open_session):
+    session, client = await open_session()
+    
+    client.connections[0].fail = True
+    session.send(b"webm-header+cluster")
+    await _drain(session)
+    
+    assert len(client.connections) == 2
+    assert client.connections[1].sent == [b"webm-header+cluster"]
+    assert not session.lost
@@ -0,0 +1,126 @@
+"""
+Tests du cache audio TTS (mémoire + Redis)
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.tts_cache import TTSAudioCache, tts_cache_key
+
+
+class CountingSynth:
+    def __init__(self, audio=b"audio", delay=0.01):
+        self.audio = audio
+        self.delay = delay
+        self.calls = 0
+    
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.audio
+
+
+@pytest.fixture
+def tts_cache(redis_clients):
+    _, binary = redis_clients
+    cache = TTSAudioCache()
+    cache._redis = binary
+    cache._l2_enabled = True
+    cache._l2_max_bytes = 0
+    return cache
+
+
+def _key(text):
+    return tts_cache_key(text, "google", "fr-FR-Neural2-A", 1.0, 0.0, "mp3")
+
+
+async def test_concurrent_misses_share_one_synthesis(tts_cache):
+    synth = CountingSynth()
+    key = _key("Bienvenue sur Ndjobi")
+    
+    results = await asyncio.gather(*(
+        tts_cache.get_or_synthesize(key, synth) for _ in range(5)
+    ))
+    
+    assert results == [b"audio"] * 5
+    assert synth.calls == 1
+    assert tts_cache._inflight == {}
+    
+    # Servi ensuite depuis la mémoire
+    assert await tts_cache.get_or_synthesize(key, synth) == b"audio"
+    assert synth.calls == 1
+
+
+async def test_redis_tier_shared_between_workers(tts_cache, redis_clients):
+    _, binary = redis_clients
+    key = _key("Votre signalement a bien été enregistré")
+    
+    await tts_cache.get_or_synthesize(key, CountingSynth(b"x" * 10))
+    
+    other_worker = TTSAudioCache()
+    other_worker._redis = binary
+    other_worker._l2_enabled = True
+    synth = CountingSynth()
+    
+    assert await other_worker.get_or_synthesize(key, synth) == b"x" * 10
+    assert synth.calls == 0
+
+
+async def test_redis_byte_accounting(tts_cache, redis_clients):
+    _, binary = redis_clients
+    
+    for index, size in enumerate((10, 20, 30)):
+        await tts_cache.get_or_synthesize(_key(f"phrase {index}"), CountingSynth(b"x" * size))
+    
+    # Réécriture d'une clé existante : pas de double comptage
+    tts_cache._memory.clear()
+    await tts_cache._l2_set(_key("phrase 0"), b"x" * 10)
+    
+    assert int(await binary.get(TTSAudioCache.BYTES_KEY)) == 60
+    assert await binary.zcard(TTSAudioCache.LRU_KEY) == 3
+    sizes = await binary.hgetall(TTSAudioCache.SIZES_KEY)
+    assert sorted(int(size) for size in sizes.values()) == [10, 20, 30]
+
+
+async def test_evicts_least_recently_served_down_to_budget(tts_cache, redis_clients):
+    _, binary = redis_clients
+    tts_cache._l2_max_bytes = 60
+    tts_cache.EVICTION_BATCH = 1
+    keys = [_key(f"phrase {index}") for index in range(4)]
+    
+    for key in keys[:3]:
+        await tts_cache.get_or_synthesize(key, CountingSynth(b"x" * 20))
+        await asyncio.sleep(0.01)
+    
+    # La première phrase est resservie depuis Redis : elle devient la plus récente
+    tts_cache._memory.clear()
+    synth = CountingSynth()
+    await tts_cache.get_or_synthesize(keys[0], synth)
+    assert synth.calls == 0
+    await asyncio.sleep(0.01)
+    
+    # 90 octets pour un budget de 60 : les phrases 1 puis 2 sont évincées
+    await tts_cache.get_or_synthesize(keys[3], CountingSynth(b"x" * 30))
+    
+    total = int(await binary.get(TTSAudioCache.BYTES_KEY))
+    remaining = {
+        key.decode() for key in await binary.zrange(TTSAudioCache.LRU_KEY, 0, -1)
+    }
+    
+    assert total == 50
+    assert remaining == {keys[0], keys[3]}
+    for key in keys[1:3]:
+        assert await binary.get(f"{TTSAudioCache.AUDIO_PREFIX}{key}") is None
+    assert await binary.hlen(TTSAudioCache.SIZES_KEY) == len(remaining)
+
+
+async def test_oversized_audio_not_written_to_redis(tts_cache, redis_clients):
+    _, binary = redis_clients
+    tts_cache._l2_max_bytes = 10
+    key = _key("réponse trop longue")
+    
+    await tts_cache.get_or_synthesize(key, CountingSynth(b"x" * 11))
+    
+    assert await binary.get(f"{TTSAudioCache.AUDIO_PREFIX}{key}") is None
+    assert await binary.get(TTSAudioCache.BYTES_KEY) is None
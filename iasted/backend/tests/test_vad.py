@@ -0,0 +1,110 @@
+"""
+Tests du VAD serveur (détecteur d'énergie, sans webrtcvad)
+"""
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import vad
+from app.services.vad import VoiceActivityDetector, parse_sample_rate
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * 2
+
+
+def _tone(ms: int, amplitude: float) -> bytes:
+    """Sinusoïde 440 Hz en PCM 16 bits (amplitude 0 = silence numérique)"""
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    monkeypatch.setattr(vad, "webrtcvad", None)
+    monkeypatch.setattr(settings, "vad_min_speech_ms", 60)
+    monkeypatch.setattr(settings, "vad_pre_roll_ms", 200)
+    monkeypatch.setattr(settings, "vad_hangover_ms", 300)
+    return VoiceActivityDetector(SAMPLE_RATE, frame_ms=FRAME_MS, energy_threshold_db=-45.0)
+
+
+def test_energy_fallback_without_webrtcvad(detector):
+    assert detector._webrtc is None
+
+
+def test_silence_is_not_forwarded(detector):
+    result = detector.feed(_tone(500, 0))
+    
+    assert result.audio == b""
+    assert not result.speech_started and not detector.in_speech
+
+
+def test_quiet_noise_below_threshold_is_silence(detector):
+    # ~-56 dBFS : sous le seuil absolu de -45 dBFS
+    result = detector.feed(_tone(500, 50))
+    
+    assert result.audio == b"" and not result.speech_started
+
+
+def test_speech_start_forwards_pre_roll(detector):
+    detector.feed(_tone(400, 0))
+    result = detector.feed(_tone(100, 8000))
+    
+    assert result.speech_started and detector.in_speech
+    # Pre-roll (200 ms, silence compris) puis le reste de la parole
+    assert len(result.audio) == FRAME_BYTES * (200 // FRAME_MS) + FRAME_BYTES * 2
+    assert result.audio.endswith(_tone(100, 8000)[-FRAME_BYTES * 2:])
+
+
+def test_utterance_ends_after_hangover(detector):
+    detector.feed(_tone(200, 8000))
+    
+    assert not detector.feed(_tone(200, 0)).utterance_ended
+    result = detector.feed(_tone(200, 0))
+    
+    assert result.utterance_ended and not detector.in_speech
+    # Le silence de fin est transmis jusqu'à la fin du hangover
+    assert len(result.audio) == FRAME_BYTES * (300 // FRAME_MS - 200 // FRAME_MS)
+
+
+def test_chunks_of_any_size_are_framed(detector):
+    speech = _tone(200, 8000)
+    started = False
+    forwarded = b""
+    
+    for start in range(0, len(speech), 333):
+        result = detector.feed(speech[start:start + 333])
+        started |= result.speech_started
+        forwarded += result.audio
+    
+    assert started
+    assert len(forwarded) == len(speech) - len(speech) % FRAME_BYTES
+    
+    detector.reset()
+    assert not detector.in_speech and detector._buffer == b""
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 16000),
+    ("", 16000),
+    ("8000", 8000),
+    (48000, 48000),
+    (32000.0, 32000),
+])
+def test_parse_sample_rate(monkeypatch, value, expected):
+    monkeypatch.setattr(settings, "stt_input_sample_rate", 16000)
+    
+    assert parse_sample_rate(value) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "16k", [16000], 16000.5, 0, 40, "44100"])
+def test_parse_sample_rate_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_sample_rate(value)
+
+
+@pytest.mark.parametrize("sample_rate", [0, 40])
+def test_empty_frames_are_rejected(sample_rate):
+    with pytest.raises(ValueError):
+        VoiceActivityDetector(sample_rate, frame_ms=FRAME_MS)
@@ -0,0 +1,103 @@
+"""Tests des index vectoriels du cache sémantique"""
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.semantic_cache import SemanticCache
+from app.services.vector_index import FlatVectorIndex, create_vector_index
+
+
+def _unit(*values) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+async def test_flat_search_returns_top_k_by_similarity():
+    index = FlatVectorIndex(dim=3)
+    await index.add("a", _unit(1, 0, 0))
+    await index.add("b", _unit(0, 1, 0))
+    await index.add("c", _unit(1, 1, 0))
+    
+    results = await index.search(_unit(1, 0.1, 0), k=2)
+    
+    assert [key for key, _ in results] == ["a", "c"]
+    assert results[0][1] == pytest.approx(float(_unit(1, 0, 0) @ _unit(1, 0.1, 0)))
+
+
+async def test_flat_add_replaces_existing_key():
+    index = FlatVectorIndex(dim=2)
+    await index.add("a", _unit(1, 0))
+    await index.add("a", _unit(0, 1))
+    
+    assert len(index) == 1
+    assert (await index.search(_unit(0, 1), k=1))[0] == ("a", pytest.approx(1.0))
+
+
+async def test_flat_remove_moves_last_row_into_hole():
+    index = FlatVectorIndex(dim=2)
+    await index.add("a", _unit(1, 0))
+    await index.add("b", _unit(0, 1))
+    await index.add("c", _unit(1, 1))
+    
+    await index.remove("a", "missing")
+    
+    assert index.keys() == {"b", "c"}
+    assert (await index.search(_unit(1, 1), k=1))[0][0] == "c"
+    assert (await index.search(_unit(0, 1), k=1))[0][0] == "b"
+
+
+async def test_flat_grows_past_initial_capacity():
+    index = FlatVectorIndex(capacity=2)
+    for i in range(5):
+        await index.add(f"k{i}", _unit(1, i + 1))
+    
+    assert len(index) == 5
+    assert len(await index.search(_unit(1, 1), k=10)) == 5
+
+
+async def test_hnsw_starts_small_and_grows():
+    pytest.importorskip("hnswlib")
+    from app.services.vector_index import HnswVectorIndex
+    
+    index = HnswVectorIndex(dim=8)
+    assert index._index.get_max_elements() == 256
+    
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 8)).astype(np.float32)
+    for i, vector in enumerate(vectors):
+        await index.add(f"k{i}", vector / np.linalg.norm(vector))
+    
+    assert len(index) == 300
+    assert index._index.get_max_elements() == 512
+    assert (await index.search(vectors[299], k=1))[0][0] == "k299"
+
+
+async def test_flat_ignores_null_vectors():
+    index = FlatVectorIndex(dim=2)
+    await index.add("zero", [0.0, 0.0])
+    
+    assert len(index) == 0
+    assert await index.search([0.0, 0.0]) == []
+
+
+def test_create_vector_index_selects_backend():
+    assert create_vector_index("flat", None, 4).backend == "flat"
+    assert create_vector_index("redisearch", None, 4).backend == "redisearch"
+
+
+async def test_redisearch_index_is_scoped_by_model_fingerprint(monkeypatch, embedding_service):
+    monkeypatch.setattr(settings, "semantic_cache_index_backend", "redisearch")
+    cache = SemanticCache()
+    cache.embeddings = embedding_service
+    
+    index = await cache._get_index("user:default")
+    fingerprint = embedding_service.model_fingerprint
+    
+    assert fingerprint in index.index_name
+    assert index.prefix.startswith(f"{SemanticCache.VECTOR_PREFIX}{fingerprint}:")
+    # Les hashes vecteurs écrits par set() tombent sous le préfixe indexé
+    assert cache._vector_key("cache:user:default:abc").startswith(index.prefix)
+    
+    embedding_service.model_name = "autre-modele"
+    assert not cache._vector_key("cache:user:default:abc").startswith(index.prefix)
@@ -0,0 +1,405 @@
+"""
+Tests de la session vocale : entrée audio, barge-in et boucle de réception WebSocket
+"""
+
+import asyncio
+import json
+
+import msgpack
+import pytest
+
+from app.api.endpoints import voice
+from app.config import settings
+from app.core.ws_protocol import FRAME_EVENT, pack_frame, unpack_frame
+from app.services.audio_frames import AUDIO_FORMATS
+from app.services.llm_router import LLMChunk, LLMProvider
+
+
+class FakeSTTSession:
+    def __init__(self, encoding=None, sample_rate=None):
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        self.results = asyncio.Queue()
+        self.sent = []
+        self.finalized = 0
+        self.closed = False
+    
+    def send(self, audio):
+        self.sent.append(audio)
+    
+    def finalize(self):
+        self.finalized += 1
+    
+    async def transcripts(self):
+        while True:
+            result = await self.results.get()
+            if result is None:
+                return
+            yield result
+    
+    async def close(self):
+        self.closed = True
+        self.results.put_nowait(None)
+
+
+class FakeSTTService:
+    def __init__(self):
+        self.sessions = []
+    
+    async def open_session(self, encoding=None, sample_rate=None):
+        session = FakeSTTSession(encoding, sample_rate)
+        self.sessions.append(session)
+        return session
+
+
+class FakeTTSService:
+    supported_formats = ("mp3", "pcm16")
+
+
+class FakeRedis:
+    async def get(self, key):
+        return None
+    
+    async def setex(self, key, ttl, value):
+        pass
+
+
+class FakeWebSocket:
+    """Socket scripté : messages client dans l'ordre, puis déconnexion"""
+    
+    def __init__(self, messages, **query_params):
+        self.query_params = {"token": "token", **query_params}
+        self.incoming = list(messages) + [{"type": "websocket.disconnect"}]
+        self.sent = []
+    
+    async def accept(self):
+        pass
+    
+    async def receive(self):
+        # Laisse la tâche d'écriture vider la file avant le message suivant
+        await asyncio.sleep(0.01)
+        return self.incoming.pop(0)
+    
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+    
+    async def send_bytes(self, data):
+        self.sent.append(data)
+    
+    async def close(self, code=1000):
+        pass
+
+
+class RecordingManager(voice.ConnectionManager):
+    """Garde les files d'envoi pour attendre qu'elles soient vidées"""
+    
+    def __init__(self):
+        super().__init__()
+        self.all_senders = []
+    
+    async def connect(self, *args, **kwargs):
+        await super().connect(*args, **kwargs)
+        self.all_senders.extend(self.senders.values())
+
+
+def _text(message):
+    return {"type": "websocket.receive", "text": json.dumps(message)}
+
+
+@pytest.fixture
+def stt_service():
+    return FakeSTTService()
+
+
+@pytest.fixture
+def endpoint(monkeypatch, stt_service):
+    """Lance la vraie boucle de réception sur un FakeWebSocket"""
+    async def current_user(websocket):
+        return {"id": "user-1", "role": "user"}
+    
+    async def redis_client():
+        return FakeRedis()
+    
+    manager = RecordingManager()
+    monkeypatch.setattr(voice, "manager", manager)
+    monkeypatch.setattr(voice, "get_current_user_ws", current_user)
+    monkeypatch.setattr(voice, "get_stt_service", lambda: stt_service)
+    monkeypatch.setattr(voice, "get_tts_service", FakeTTSService)
+    monkeypatch.setattr(voice, "get_llm_router", lambda: None)
+    monkeypatch.setattr(voice, "get_semantic_cache", lambda: None)
+    monkeypatch.setattr(voice, "get_redis_client", redis_client)
+    
+    async def run(websocket):
+        await asyncio.wait_for(voice.voice_websocket_endpoint(websocket, "session"), timeout=5)
+        writers = [sender._writer for sender in manager.all_senders]
+        await asyncio.wait_for(asyncio.gather(*writers), timeout=1)
+        return websocket.sent
+    
+    return run
+
+
+def _voice_session(stt_service):
+    return voice.VoiceSession(
+        "session",
+        {"last_turns": []},
+        stt_service,
+        None,
+        FakeTTSService(),
+        FakeRedis(),
+        None,
+        AUDIO_FORMATS["mp3"]
+    )
+
+
+async def test_open_stt_validates_sample_rate(stt_service):
+    session = _voice_session(stt_service)
+    await session.open_stt("pcm16", "48000")
+    current = session.stt
+    
+    for value in ("40", "abc", [16000]):
+        with pytest.raises(ValueError):
+            await session.open_stt("pcm16", value)
+    
+    # La connexion en place n'est pas touchée
+    assert session.stt is current and not current.closed
+    assert session.describe_input()["sample_rate"] == 48000
+    assert [stt.sample_rate for stt in stt_service.sessions] == [48000]
+    
+    await session.close()
+
+
+async def test_invalid_query_sample_rate_falls_back_to_auto(endpoint, stt_service):
+    sent = await endpoint(FakeWebSocket(
+        [_text({"type": "ping"})],
+        input_format="pcm16",
+        input_sample_rate="40"
+    ))
+    
+    assert [message["type"] for message in sent] == ["error", "connected", "pong"]
+    assert sent[1]["input"] == {"format": "auto", "sample_rate": None, "vad": False}
+    assert [stt.encoding for stt in stt_service.sessions] == [None]
+
+
+@pytest.mark.parametrize("sample_rate", [40, "abc"])
+async def test_invalid_config_sample_rate_keeps_session_open(
+    endpoint,
+    stt_service,
+    sample_rate
+):
+    sent = await endpoint(FakeWebSocket([
+        _text({"type": "config", "input_format": "pcm16", "input_sample_rate": sample_rate}),
+        _text({"type": "ping"}),
+        _text({"type": "config", "input_format": "pcm16", "input_sample_rate": 8000}),
+    ]))
+    
+    assert [message["type"] for message in sent] == ["connected", "error", "pong", "config"]
+    assert sent[1] == {"type": "error", "error": "Message invalide"}
+    assert sent[3]["input"] == {"format": "pcm16", "sample_rate": 8000, "vad": True}
+    assert [stt.sample_rate for stt in stt_service.sessions] == [None, 8000]
+    assert all(stt.closed for stt in stt_service.sessions)
+
+
+def _bytes(data):
+    return {"type": "websocket.receive", "bytes": data}
+
+
+async def test_malformed_messages_keep_session_open(endpoint):
+    sent = await endpoint(FakeWebSocket([
+        {"type": "websocket.receive", "text": "{pas du json"},
+        {"type": "websocket.receive", "text": "[1, 2]"},
+        _text({"type": "ping"}),
+    ]))
+    
+    assert [message["type"] for message in sent] == ["connected", "error", "error", "pong"]
+    assert sent[1] == {"type": "error", "error": "Message invalide"}
+
+
+async def test_malformed_msgpack_frames_keep_session_open(endpoint):
+    sent = await endpoint(FakeWebSocket([
+        _bytes(b"\xc1"),
+        _bytes(msgpack.packb([0, FRAME_EVENT, [1, 2]])),
+        _bytes(pack_frame(0, FRAME_EVENT, {"type": "ping"})),
+    ], protocol="msgpack"))
+    
+    events = [unpack_frame(frame)[2]["type"] for frame in sent]
+    assert events == ["connected", "error", "error", "pong"]
+
+
+@pytest.mark.parametrize("config", [
+    {"audio_format": ["pcm16"]},
+    {"audio_format": "pcm16", "input_format": "pcm16", "input_sample_rate": "abc"},
+    {"input_format": "pcm16", "input_sample_rate": [16000]},
+    {"input_format": {"codec": "pcm16"}},
+    {"interim": 1},
+])
+async def test_invalid_config_is_rejected_without_side_effects(endpoint, stt_service, config):
+    sent = await endpoint(FakeWebSocket([
+        _text({"type": "config", **config}),
+        _text({"type": "config", "interim": "diff"}),
+    ]))
+    
+    assert [message["type"] for message in sent] == ["connected", "error", "config"]
+    
+    # Rien n'a été appliqué du message rejeté, la config suivante l'est
+    connected, _, reply = sent
+    assert len(stt_service.sessions) == 1
+    assert reply["audio_format"] == connected["audio_format"]
+    assert reply["input"] == connected["input"]
+    assert reply["interim"]["mode"] == "diff"
+
+
+class FakeManager:
+    def __init__(self):
+        self.messages = []
+    
+    async def send_json(self, session_id, data, **kwargs):
+        self.messages.append(data)
+    
+    async def send_bytes(self, session_id, data):
+        pass
+    
+    def discard_audio(self, session_id):
+        pass
+
+
+@pytest.fixture
+def fake_manager(monkeypatch):
+    manager = FakeManager()
+    monkeypatch.setattr(voice, "manager", manager)
+    return manager
+
+
+async def test_lost_container_stream_asks_client_to_restart(fake_manager, stt_service):
+    session = _voice_session(stt_service)
+    await session.open_stt()
+    
+    stt_service.sessions[0].results.put_nowait({"event": "stream_lost"})
+    await asyncio.sleep(0.01)
+    
+    assert fake_manager.messages == [{"type": "stt_restart"}]
+    
+    await session.restart_stt()
+    
+    assert len(stt_service.sessions) == 2
+    assert stt_service.sessions[0].closed
+    assert session.stt is stt_service.sessions[1]
+    
+    await session.close()
+
+
+async def test_client_restart_reopens_stt(endpoint, stt_service):
+    sent = await endpoint(FakeWebSocket(
+        [_text({"type": "stt_restart"}), _text({"type": "ping"})],
+        input_format="pcm16",
+        input_sample_rate="48000"
+    ))
+    
+    assert [message["type"] for message in sent] == ["connected", "pong"]
+    assert [stt.sample_rate for stt in stt_service.sessions] == [48000, 48000]
+    assert stt_service.sessions[0].closed
+
+
+class StalledRouter:
+    """Stream LLM qui s'arrête après une première phrase (réponse en cours)"""
+    
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.closed = False
+    
+    async def route_and_stream(self, query, context):
+        try:
+            yield LLMChunk("Il y a douze signalements. Ils ", LLMProvider.GPT_4O_MINI)
+            self.started.set()
+            await asyncio.Event().wait()
+        finally:
+            self.closed = True
+
+
+class StalledWebSocket(FakeWebSocket):
+    """Client qui ne lit plus : les messages restent dans la file d'envoi"""
+    
+    def __init__(self):
+        super().__init__([])
+        self.released = asyncio.Event()
+    
+    async def send_text(self, text):
+        await self.released.wait()
+        await super().send_text(text)
+    
+    async def send_bytes(self, data):
+        await self.released.wait()
+        await super().send_bytes(data)
+
+
+class AudioTTS:
+    async def synthesize(self, text, audio_format="mp3"):
+        return b"audio"
+
+
+def _result(transcript, is_final, speech_final=False):
+    return {
+        "event": "transcript",
+        "transcript": transcript,
+        "is_final": is_final,
+        "speech_final": speech_final,
+        "confidence": 0.9
+    }
+
+
+async def test_barge_in_cancels_turn_and_discards_audio(monkeypatch, stt_service):
+    monkeypatch.setattr(settings, "ws_send_timeout", 30.0)
+    manager = voice.ConnectionManager()
+    monkeypatch.setattr(voice, "manager", manager)
+    websocket = StalledWebSocket()
+    await manager.connect(websocket, "session", "user-1")
+    sender = manager.senders["session"]
+    
+    router = StalledRouter()
+    session = voice.VoiceSession(
+        "session",
+        {"last_turns": []},
+        stt_service,
+        router,
+        AudioTTS(),
+        FakeRedis(),
+        None,
+        AUDIO_FORMATS["mp3"]
+    )
+    await session.open_stt()
+    stt = stt_service.sessions[0]
+    
+    try:
+        # Fin d'utterance : un tour démarre et sa première phrase part en file
+        stt.results.put_nowait(
+            _result("combien de signalements", is_final=True, speech_final=True)
+        )
+        await asyncio.wait_for(router.started.wait(), timeout=1)
+        for _ in range(50):
+            if any(item.kind == "bytes" for item in sender._queue):
+                break
+            await asyncio.sleep(0.01)
+        turn = session._turn
+        assert turn is not None and not turn.done()
+        assert any(item.kind == "bytes" for item in sender._queue)
+        
+        # L'utilisateur reparle pendant la réponse
+        stt.results.put_nowait(_result("attends", is_final=False))
+        for _ in range(50):
+            if turn.done():
+                break
+            await asyncio.sleep(0.01)
+        
+        assert turn.cancelled()
+        assert router.closed
+        assert session._turn is None
+        assert not any(item.kind == "bytes" for item in sender._queue)
+        assert {"type": "interrupted"} in [item.payload for item in sender._queue]
+    
+    finally:
+        websocket.released.set()
+        await session.close()
+        manager.disconnect("session", "user-1")
+        await asyncio.wait_for(sender._writer, timeout=1)
+    
+    assert b"audio" not in websocket.sent
+    assert {"type": "interrupted"} in websocket.sent
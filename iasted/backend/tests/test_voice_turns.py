@@ -0,0 +1,131 @@
+"""
+Tests d'un tour de parole (handle_transcript) : mise en cache de la réponse
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.semantic_cache import CacheHit
+
+from app.api.endpoints import voice
+from app.services.llm_router import LLMChunk, LLMProvider
+
+
+class FakeRouter:
+    def __init__(self, deltas, done=True):
+        self.deltas = deltas
+        self.done = done
+    
+    async def route_and_stream(self, query, context):
+        for text in self.deltas:
+            yield LLMChunk(text, LLMProvider.GPT_4O_MINI)
+        if self.done:
+            yield LLMChunk("", LLMProvider.GPT_4O_MINI, done=True, metadata={"tokens": 12})
+
+
+class FakeTTS:
+    async def synthesize(self, text, audio_format="mp3"):
+        return b"audio"
+
+
+class FakeManager:
+    def __init__(self):
+        self.messages = []
+    
+    async def send_json(self, session_id, data, **kwargs):
+        self.messages.append(data)
+    
+    async def send_bytes(self, session_id, data):
+        pass
+
+
+class FakeRedis:
+    async def setex(self, key, ttl, value):
+        pass
+
+
+class RecordingCache:
+    def __init__(self, hit=None):
+        self.stored = []
+        self.lookups = 0
+        self.hit = hit
+    
+    async def lookup(self, query, user_context, **kwargs):
+        self.lookups += 1
+        return self.hit
+    
+    async def set(self, query, response, user_context, **kwargs):
+        self.stored.append((query, response))
+
+
+@pytest.fixture
+def fake_manager(monkeypatch):
+    manager = FakeManager()
+    monkeypatch.setattr(voice, "manager", manager)
+    return manager
+
+
+async def _turn(router, context, cache):
+    await voice.handle_transcript(
+        "combien de signalements ?",
+        "session",
+        context,
+        router,
+        FakeTTS(),
+        FakeRedis(),
+        semantic_cache=cache
+    )
+    await asyncio.gather(*voice._background_tasks)
+
+
+def _context(last_turns=None):
+    return {
+        "user_id": "u1",
+        "user_role": "admin",
+        "organization": "Société",
+        "last_turns": last_turns or []
+    }
+
+
+async def test_complete_answer_is_cached(fake_manager):
+    cache = RecordingCache()
+    await _turn(FakeRouter(["Il y a ", "42 signalements."]), _context(), cache)
+    
+    assert cache.stored == [("combien de signalements ?", "Il y a 42 signalements.")]
+
+
+async def test_answer_built_on_history_is_not_cached(fake_manager):
+    cache = RecordingCache()
+    history = [{"user": "à Libreville", "assistant": "D'accord."}]
+    await _turn(FakeRouter(["42 à Libreville."]), _context(history), cache)
+    
+    assert cache.stored == []
+    assert any(message["type"] == "llm_response" for message in fake_manager.messages)
+
+
+async def test_empty_or_interrupted_answer_is_not_cached(fake_manager):
+    cache = RecordingCache()
+    await _turn(FakeRouter(["  "]), _context(), cache)
+    await _turn(FakeRouter(["Il y a 42"], done=False), _context(), cache)
+    
+    assert cache.stored == []
+
+
+async def test_cached_answer_is_served_on_first_turn(fake_manager):
+    cache = RecordingCache(hit=CacheHit("key", "42 signalements.", 1.0, "exact", b"audio"))
+    context = _context()
+    await _turn(FakeRouter(["ne doit pas être appelé"]), context, cache)
+    
+    assert context["last_turns"][-1]["provider"] == "cache"
+    assert any(message.get("cached") for message in fake_manager.messages)
+
+
+async def test_follow_up_turn_bypasses_cache_lookup(fake_manager):
+    cache = RecordingCache(hit=CacheHit("key", "réponse hors contexte", 1.0, "exact", b"audio"))
+    history = [{"user": "combien de signalements à Libreville ?", "assistant": "42."}]
+    context = _context(history)
+    await _turn(FakeRouter(["Et 17 le mois dernier."]), context, cache)
+    
+    assert cache.lookups == 0
+    assert context["last_turns"][-1]["assistant"] == "Et 17 le mois dernier."
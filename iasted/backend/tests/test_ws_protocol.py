@@ -0,0 +1,68 @@
+"""
+Tests du protocole WebSocket MessagePack
+"""
+
+import asyncio
+
+import msgpack
+import pytest
+
+from app.core import ws_protocol
+from app.core.ws_protocol import (
+    FRAME_AUDIO,
+    FRAME_EVENT,
+    negotiate_protocol,
+    pack_frame,
+    unpack_frame
+)
+from app.core.ws_sender import SessionSender
+
+
+def test_negotiate_protocol(monkeypatch):
+    assert negotiate_protocol("msgpack") == "msgpack"
+    assert negotiate_protocol(None) == "json"
+    assert negotiate_protocol("cbor") == "json"
+    
+    monkeypatch.setattr(ws_protocol, "msgpack", None)
+    assert negotiate_protocol("msgpack") == "json"
+
+
+def test_frames_round_trip():
+    event = {"type": "transcript", "transcript": "Société générale", "is_final": True}
+    
+    assert unpack_frame(pack_frame(3, FRAME_EVENT, event)) == (3, FRAME_EVENT, event)
+    assert unpack_frame(pack_frame(4, FRAME_AUDIO, b"\x00\x01")) == (4, FRAME_AUDIO, b"\x00\x01")
+
+
+@pytest.mark.parametrize("data", [
+    b"\xc1",
+    b"\x93\x00",
+    b"",
+    msgpack.packb({"type": "ping"}),
+    msgpack.packb([0, FRAME_AUDIO, "pas des octets"]),
+    msgpack.packb([0, FRAME_EVENT, [1, 2]]),
+    msgpack.packb([0, FRAME_EVENT, {"type": "ping"}]) + b"\x00",
+])
+def test_malformed_frames_raise_value_error(data):
+    with pytest.raises(ValueError):
+        unpack_frame(data)
+
+
+async def test_sender_numbers_msgpack_frames():
+    frames = []
+    
+    class FakeWebSocket:
+        async def send_bytes(self, data):
+            frames.append(data)
+    
+    sender = SessionSender(FakeWebSocket(), "session", max_bytes=0, protocol="msgpack")
+    sender.start()
+    await sender.send_json({"type": "audio_segment", "index": 0})
+    await sender.send_bytes(b"audio")
+    sender.close()
+    await asyncio.wait_for(sender._writer, timeout=1)
+    
+    assert [unpack_frame(frame) for frame in frames] == [
+        (0, FRAME_EVENT, {"type": "audio_segment", "index": 0}),
+        (1, FRAME_AUDIO, b"audio"),
+    ]
@@ -0,0 +1,169 @@
+"""
+Tests de la file d'envoi WebSocket par session
+"""
+
+import asyncio
+import json
+
+from app.core.ws_sender import SessionSender
+
+
+class FakeWebSocket:
+    """Socket dont les envois restent bloqués tant que release n'est pas levé"""
+    
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+    
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(json.loads(text))
+    
+    async def send_bytes(self, data):
+        await self.release.wait()
+        self.sent.append(data)
+    
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def _sender(websocket, **kwargs):
+    kwargs.setdefault("max_messages", 10)
+    kwargs.setdefault("max_bytes", 0)
+    kwargs.setdefault("send_timeout", 1.0)
+    sender = SessionSender(websocket, "session", **kwargs)
+    sender.start()
+    return sender
+
+
+async def _drain(sender):
+    sender.close()
+    await asyncio.wait_for(sender._writer, timeout=1)
+
+
+def _interim(text):
+    return {"type": "transcript", "transcript": text, "is_final": False}
+
+
+async def test_messages_are_sent_in_order():
+    websocket = FakeWebSocket()
+    sender = _sender(websocket)
+    
+    await sender.send_json({"type": "a"})
+    await sender.send_bytes(b"audio")
+    await sender.send_json({"type": "b"})
+    await _drain(sender)
+    
+    assert websocket.sent == [{"type": "a"}, b"audio", {"type": "b"}]
+
+
+async def test_coalesce_keeps_only_latest_pending_interim():
+    websocket = FakeWebSocket(blocked=True)
+    sender = _sender(websocket, interim_policy="coalesce")
+    
+    await sender.send_json({"type": "first"})
+    await asyncio.sleep(0)
+    for text in ("je", "je voudrais", "je voudrais savoir"):
+        await sender.send_json(_interim(text), interim=True)
+    await sender.send_json({"type": "transcript", "transcript": "fin", "is_final": True})
+    await sender.send_json(_interim("suite"), interim=True)
+    
+    websocket.release.set()
+    await _drain(sender)
+    
+    assert [message.get("transcript", message["type"]) for message in websocket.sent] == [
+        "first", "je voudrais savoir", "fin", "suite"
+    ]
+
+
+async def test_drop_skips_interims_while_queue_is_busy():
+    websocket = FakeWebSocket(blocked=True)
+    sender = _sender(websocket, interim_policy="drop")
+    
+    await sender.send_json({"type": "first"})
+    await asyncio.sleep(0)
+    await sender.send_json({"type": "second"})
+    await sender.send_json(_interim("ignorée"), interim=True)
+    
+    websocket.release.set()
+    await _drain(sender)
+    await sender.send_json(_interim("après"), interim=True)
+    
+    assert websocket.sent == [{"type": "first"}, {"type": "second"}]
+
+
+async def test_full_queue_applies_backpressure_but_never_blocks_interims():
+    websocket = FakeWebSocket(blocked=True)
+    sender = _sender(websocket, max_messages=2, interim_policy="coalesce")
+    
+    await sender.send_bytes(b"1")
+    await asyncio.sleep(0)
+    await sender.send_bytes(b"2")
+    await sender.send_bytes(b"3")
+    
+    blocked = asyncio.create_task(sender.send_bytes(b"4"))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    
+    # File pleine : l'intermédiaire est ignoré plutôt que d'attendre
+    await asyncio.wait_for(sender.send_json(_interim("x"), interim=True), timeout=0.1)
+    
+    websocket.release.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await _drain(sender)
+    
+    assert websocket.sent == [b"1", b"2", b"3", b"4"]
+
+
+async def test_queue_policy_sends_every_interim():
+    websocket = FakeWebSocket(blocked=True)
+    sender = _sender(websocket, max_messages=2, interim_policy="queue")
+    
+    await sender.send_json({"type": "first"})
+    await asyncio.sleep(0)
+    producer = asyncio.gather(*(
+        sender.send_json(_interim(text), interim=True)
+        for text in ("je", "je voudrais", "je voudrais savoir")
+    ))
+    
+    websocket.release.set()
+    await asyncio.wait_for(producer, timeout=1)
+    await _drain(sender)
+    
+    assert [message.get("transcript") for message in websocket.sent[1:]] == [
+        "je", "je voudrais", "je voudrais savoir"
+    ]
+
+
+async def test_discard_audio_keeps_events():
+    websocket = FakeWebSocket(blocked=True)
+    sender = _sender(websocket)
+    
+    await sender.send_json({"type": "first"})
+    await asyncio.sleep(0)
+    await sender.send_bytes(b"audio")
+    await sender.send_json({"type": "barge_in"})
+    await sender.send_bytes(b"audio")
+    
+    assert sender.discard_audio() == 2
+    
+    websocket.release.set()
+    await _drain(sender)
+    
+    assert websocket.sent == [{"type": "first"}, {"type": "barge_in"}]
+
+
+async def test_slow_client_is_disconnected():
+    websocket = FakeWebSocket(blocked=True)
+    sender = _sender(websocket, send_timeout=0.05)
+    
+    await sender.send_json({"type": "first"})
+    await sender.send_json({"type": "second"})
+    await asyncio.wait_for(sender._writer, timeout=1)
+    
+    assert sender.closed
+    assert websocket.closed_with == 1013
+    assert len(sender) == 0
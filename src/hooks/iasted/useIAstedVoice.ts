@@ -98,6 +98,27 @@ export const useIAstedVoice = (token: string, options: UseIAstedVoiceOptions = {
     }
   }, []);
 
+  const handleSttRestart = useCallback(() => {
+    const recorder = mediaRecorderRef.current;
+
+    if (!recorder || recorder.state === 'inactive') {
+      wsRef.current?.restartStt();
+      return;
+    }
+
+    // La fin de l'ancien flux est ignorée par le serveur : ses derniers chunks ne partent pas
+    const onData = recorder.ondataavailable;
+    recorder.ondataavailable = null;
+    recorder.stop();
+
+    // Le nouvel enregistrement recommence par un en-tête webm complet
+    wsRef.current?.restartStt();
+    const next = new MediaRecorder(recorder.stream, { mimeType: 'audio/webm' });
+    next.ondataavailable = onData;
+    next.start(250);
+    mediaRecorderRef.current = next;
+  }, []);
+
   const handleError = useCallback((errorMsg: string) => {
     setError(errorMsg);
     setIsProcessing(false);
@@ -120,6 +141,7 @@ export const useIAstedVoice = (token: string, options: UseIAstedVoiceOptions = {
         onLLMResponse: handleLLMResponse,
         onAudioResponse: handleAudioResponse,
         onError: handleError,
+        onSttRestart: handleSttRestart,
         onConnect: () => setIsConnected(true),
         onDisconnect: () => setIsConnected(false),
       };
@@ -132,7 +154,7 @@ export const useIAstedVoice = (token: string, options: UseIAstedVoiceOptions = {
       handleError(errorMsg);
       throw err;
     }
-  }, [token, handleTranscript, handleLLMResponse, handleAudioResponse, handleError]);
+  }, [token, handleTranscript, handleLLMResponse, handleAudioResponse, handleError, handleSttRestart]);
 
   const stopSession = useCallback(async () => {
     if (wsRef.current) {
@@ -22,7 +22,12 @@ export interface ErrorMessage {
   error: string;
 }
 
-export type IAstedMessage = TranscriptMessage | LLMResponseMessage | ErrorMessage | { type: 'pong' };
+export type IAstedMessage =
+  | TranscriptMessage
+  | LLMResponseMessage
+  | ErrorMessage
+  | { type: 'pong' }
+  | { type: 'stt_restart' };
 
 export interface IAstedWebSocketConfig {
   sessionId: string;
@@ -32,6 +37,8 @@ export interface IAstedWebSocketConfig {
   onLLMResponse?: (message: LLMResponseMessage) => void;
   onAudioResponse?: (audioBlob: Blob) => void;
   onError?: (error: string) => void;
+  // Transcription coupée en cours de flux : relancer l'enregistreur puis appeler restartStt()
+  onSttRestart?: () => void;
   onConnect?: () => void;
   onDisconnect?: () => void;
 }
@@ -106,6 +113,13 @@ class IAstedWebSocket {
       case 'error':
         this.config.onError?.(message.error);
         break;
+      case 'stt_restart':
+        if (this.config.onSttRestart) {
+          this.config.onSttRestart();
+        } else {
+          this.restartStt();
+        }
+        break;
       case 'pong':
         break;
     }
@@ -125,6 +139,12 @@ class IAstedWebSocket {
     }
   }
 
+  restartStt() {
+    if (this.ws?.readyState === WebSocket.OPEN) {
+      this.ws.send(JSON.stringify({ type: 'stt_restart' }));
+    }
+  }
+
   private startPingInterval() {
     this.pingInterval = setInterval(() => {
       if (this.ws?.readyState === WebSocket.OPEN) {